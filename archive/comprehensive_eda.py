@@ -8,12 +8,10 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from sqlalchemy import func, distinct, case, and_, or_
+from sqlalchemy import func, distinct, case, or_, select, bindparam, text
+from sqlalchemy.orm import sessionmaker
 from src.database import db
-from src.db_models_new import (
-    Property, MainBuilding, AdditionalBuilding, Registration,
-    Municipality, Province, Road, Zip, City, Place, DaysOnMarket, Case, PriceChange
-)
+from src.db_models_new import Property, MainBuilding, AdditionalBuilding, Registration, Case
 import pandas as pd
 import json
 from datetime import datetime
@@ -25,8 +23,42 @@ print("="*80)
 print(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print()
 
-# Establish database connection
-session = db.get_session()
+# Establish database connection (read-only script: no autoflush, no expiry on commit)
+Session = sessionmaker(bind=db.engine, autoflush=False, expire_on_commit=False)
+session = Session()
+
+# Prefer the tdigest extension's streaming percentile sketch over the exact
+# percentile_cont sort when it is installed; otherwise use exact percentiles.
+# (Only detected here - this script never changes the database.)
+USE_TDIGEST = session.execute(
+    text("SELECT 1 FROM pg_extension WHERE extname = 'tdigest'")
+).first() is not None
+session.commit()
+
+# Run every query below in one read-only snapshot; extra work_mem keeps the
+# remaining percentile sorts in memory
+session.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"))
+session.execute(text("SET LOCAL work_mem = '256MB'"))
+
+PERCENTILE_NOTE = " [percentiles approx.]" if USE_TDIGEST else ""
+
+
+def percentile_sql(column, fractions):
+    """Build a percentile expression for the stats query.
+
+    Args:
+        column: Column name to aggregate
+        fractions: A single fraction, or a list of fractions returned as an array
+
+    Returns:
+        SQL expression string (tdigest_percentile or percentile_cont)
+    """
+    if isinstance(fractions, list):
+        fractions = f"ARRAY[{', '.join(str(f) for f in fractions)}]"
+    if USE_TDIGEST:
+        return f"tdigest_percentile({column}, 100, {fractions})"
+    return f"percentile_cont({fractions}) WITHIN GROUP (ORDER BY {column})"
+
 
 # ============================================================================
 # SECTION 1: OVERVIEW & COUNTS
@@ -35,25 +67,126 @@ print("\n" + "="*80)
 print("SECTION 1: DATABASE OVERVIEW & TABLE COUNTS")
 print("="*80)
 
+# All pure-scalar statistics in one statement returning a single wide row.
+# ORM queries are kept only for the GROUP BY distributions and top-N lists.
+STATS_SQL = text(f"""
+    SELECT *
+    FROM (
+        SELECT
+            COUNT(*) AS total_properties,
+            COUNT(living_area) AS properties_with_area,
+            MIN(living_area) AS area_min,
+            MAX(living_area) AS area_max,
+            AVG(living_area) AS area_avg,
+            {percentile_sql('living_area', [0.25, 0.5, 0.75])} AS area_p,
+            COUNT(latest_valuation) AS properties_with_valuation,
+            MIN(latest_valuation) AS valuation_min,
+            MAX(latest_valuation) AS valuation_max,
+            AVG(latest_valuation) AS valuation_avg,
+            {percentile_sql('latest_valuation', [0.25, 0.5, 0.75])} AS valuation_p,
+            COUNT(*) FILTER (WHERE is_on_market) AS on_market,
+            COUNT(*) FILTER (WHERE NOT is_on_market) AS off_market,
+            COUNT(*) FILTER (WHERE is_on_market IS NULL) AS null_market,
+            COUNT(*) FILTER (WHERE is_public) AS is_public,
+            COUNT(*) FILTER (WHERE NOT is_public) AS not_public,
+            COUNT(*) FILTER (WHERE is_public IS NULL) AS null_public,
+            COUNT(*) FILTER (WHERE latitude IS NOT NULL AND longitude IS NOT NULL) AS props_with_coords,
+            COUNT(DISTINCT zip_code) AS total_zip_codes,
+            COUNT(DISTINCT city_name) AS total_cities
+        FROM properties_new
+    ) p
+    CROSS JOIN (
+        SELECT
+            COUNT(*) AS total_main_buildings,
+            COUNT(DISTINCT property_id) AS props_with_main,
+            MIN(year_built) AS year_min,
+            MAX(year_built) AS year_max,
+            AVG(year_built) AS year_avg,
+            {percentile_sql('year_built', 0.5)} AS year_median,
+            MIN(number_of_rooms) AS rooms_min,
+            MAX(number_of_rooms) AS rooms_max,
+            AVG(number_of_rooms) AS rooms_avg,
+            {percentile_sql('number_of_rooms', 0.5)} AS rooms_median,
+            AVG(number_of_bathrooms) AS avg_bathrooms,
+            AVG(number_of_toilets) AS avg_toilets,
+            AVG(number_of_kitchens) AS avg_kitchens
+        FROM main_buildings
+    ) mb
+    CROSS JOIN (
+        SELECT
+            COUNT(*) AS total_additional,
+            COUNT(DISTINCT property_id) AS props_with_additional
+        FROM additional_buildings
+    ) ab
+    CROSS JOIN (
+        SELECT
+            COUNT(*) AS total_cases,
+            COUNT(DISTINCT property_id) AS props_with_cases,
+            MIN(current_price) AS price_min,
+            MAX(current_price) AS price_max,
+            AVG(current_price) AS price_avg,
+            {percentile_sql('current_price', [0.25, 0.5, 0.75])} AS price_p,
+            COUNT(*) FILTER (WHERE original_price IS NOT NULL AND current_price IS NOT NULL) AS cases_with_both_prices,
+            COUNT(*) FILTER (WHERE current_price < original_price) AS price_reductions,
+            COUNT(*) FILTER (WHERE current_price > original_price) AS price_increases
+        FROM cases
+    ) c
+    CROSS JOIN (
+        SELECT
+            COUNT(*) AS total_price_changes,
+            COUNT(DISTINCT case_id) AS cases_with_price_changes
+        FROM price_changes
+    ) pc
+    CROSS JOIN (
+        SELECT
+            COUNT(*) AS total_registrations,
+            COUNT(DISTINCT property_id) AS props_with_regs,
+            MIN(amount) AS sale_min,
+            MAX(amount) AS sale_max,
+            AVG(amount) AS sale_avg,
+            {percentile_sql('amount', 0.5)} AS sale_median,
+            MIN(per_area_price) AS per_sqm_min,
+            MAX(per_area_price) AS per_sqm_max,
+            AVG(per_area_price) AS per_sqm_avg,
+            {percentile_sql('per_area_price', 0.5)} AS per_sqm_median
+        FROM registrations
+    ) r
+    CROSS JOIN (
+        SELECT
+            COUNT(*) AS total_municipality_rows,
+            COUNT(DISTINCT municipality_code) AS total_municipalities
+        FROM municipalities
+    ) m
+    CROSS JOIN (
+        SELECT
+            (SELECT COUNT(*) FROM provinces) AS total_provinces,
+            (SELECT COUNT(*) FROM roads) AS total_roads,
+            (SELECT COUNT(*) FROM zip_codes) AS total_zip_rows,
+            (SELECT COUNT(*) FROM cities) AS total_city_rows,
+            (SELECT COUNT(*) FROM places) AS total_places,
+            (SELECT COUNT(*) FROM days_on_market) AS total_days_on_market
+    ) t
+""")
+stats = session.execute(STATS_SQL).mappings().one()
+
 tables_info = {
-    'Properties': Property,
-    'Main Buildings': MainBuilding,
-    'Additional Buildings': AdditionalBuilding,
-    'Registrations': Registration,
-    'Cases (Listings)': Case,
-    'Price Changes': PriceChange,
-    'Municipalities': Municipality,
-    'Provinces': Province,
-    'Roads': Road,
-    'Zip Codes': Zip,
-    'Cities': City,
-    'Places': Place,
-    'Days on Market': DaysOnMarket
+    'Properties': 'total_properties',
+    'Main Buildings': 'total_main_buildings',
+    'Additional Buildings': 'total_additional',
+    'Registrations': 'total_registrations',
+    'Cases (Listings)': 'total_cases',
+    'Price Changes': 'total_price_changes',
+    'Municipalities': 'total_municipality_rows',
+    'Provinces': 'total_provinces',
+    'Roads': 'total_roads',
+    'Zip Codes': 'total_zip_rows',
+    'Cities': 'total_city_rows',
+    'Places': 'total_places',
+    'Days on Market': 'total_days_on_market'
 }
 
-for name, model in tables_info.items():
-    count = session.query(model).count()
-    print(f"   {name:<25} {count:>10,}")
+for name, key in tables_info.items():
+    print(f"   {name:<25} {stats[key]:>10,}")
 
 # ============================================================================
 # SECTION 2: PROPERTIES - CORE STATISTICS
@@ -63,7 +196,7 @@ print("SECTION 2: PROPERTY CORE STATISTICS")
 print("="*80)
 
 # Basic counts
-total_properties = session.query(Property).count()
+total_properties = stats['total_properties']
 print(f"\n📊 Total Properties: {total_properties:,}")
 
 # Address types
@@ -77,15 +210,9 @@ for addr_type, count in sorted(address_types, key=lambda x: x[1], reverse=True):
     print(f"   {addr_type or 'NULL':<30} {count:>8,} ({pct:>5.2f}%)")
 
 # Living area statistics
-print("\n📏 Living Area Statistics (sqm):")
-area_stats = session.query(
-    func.min(Property.living_area),
-    func.max(Property.living_area),
-    func.avg(Property.living_area),
-    func.percentile_cont(0.5).within_group(Property.living_area),
-    func.percentile_cont(0.25).within_group(Property.living_area),
-    func.percentile_cont(0.75).within_group(Property.living_area)
-).filter(Property.living_area.isnot(None)).first()
+print(f"\n📏 Living Area Statistics (sqm){PERCENTILE_NOTE}:")
+area_p25, area_median, area_p75 = stats['area_p'] or (None, None, None)
+area_stats = (stats['area_min'], stats['area_max'], stats['area_avg'], area_median, area_p25, area_p75)
 
 if area_stats[0]:
     print(f"   Minimum:    {area_stats[0]:>10,.1f} sqm")
@@ -96,21 +223,15 @@ if area_stats[0]:
     print(f"   Maximum:    {area_stats[1]:>10,.1f} sqm")
 
 # Count properties with/without living area
-properties_with_area = session.query(Property).filter(Property.living_area.isnot(None)).count()
+properties_with_area = stats['properties_with_area']
 properties_without_area = total_properties - properties_with_area
 print(f"   With area:  {properties_with_area:>10,} ({(properties_with_area/total_properties)*100:.1f}%)")
 print(f"   Without:    {properties_without_area:>10,} ({(properties_without_area/total_properties)*100:.1f}%)")
 
 # Valuation statistics
-print("\n💰 Latest Valuation Statistics (DKK):")
-valuation_stats = session.query(
-    func.min(Property.latest_valuation),
-    func.max(Property.latest_valuation),
-    func.avg(Property.latest_valuation),
-    func.percentile_cont(0.5).within_group(Property.latest_valuation),
-    func.percentile_cont(0.25).within_group(Property.latest_valuation),
-    func.percentile_cont(0.75).within_group(Property.latest_valuation)
-).filter(Property.latest_valuation.isnot(None)).first()
+print(f"\n💰 Latest Valuation Statistics (DKK){PERCENTILE_NOTE}:")
+valuation_p25, valuation_median, valuation_p75 = stats['valuation_p'] or (None, None, None)
+valuation_stats = (stats['valuation_min'], stats['valuation_max'], stats['valuation_avg'], valuation_median, valuation_p25, valuation_p75)
 
 if valuation_stats[0]:
     print(f"   Minimum:    {valuation_stats[0]:>15,.0f} kr")
@@ -120,25 +241,25 @@ if valuation_stats[0]:
     print(f"   75th %ile:  {valuation_stats[5]:>15,.0f} kr")
     print(f"   Maximum:    {valuation_stats[1]:>15,.0f} kr")
 
-properties_with_valuation = session.query(Property).filter(Property.latest_valuation.isnot(None)).count()
+properties_with_valuation = stats['properties_with_valuation']
 properties_without_valuation = total_properties - properties_with_valuation
 print(f"   With valuation:  {properties_with_valuation:>10,} ({(properties_with_valuation/total_properties)*100:.1f}%)")
 print(f"   Without:         {properties_without_valuation:>10,} ({(properties_without_valuation/total_properties)*100:.1f}%)")
 
 # Market status
 print("\n🏪 Market Status:")
-on_market = session.query(Property).filter(Property.is_on_market == True).count()
-off_market = session.query(Property).filter(Property.is_on_market == False).count()
-null_market = session.query(Property).filter(Property.is_on_market.is_(None)).count()
+on_market = stats['on_market']
+off_market = stats['off_market']
+null_market = stats['null_market']
 print(f"   On Market:   {on_market:>10,} ({(on_market/total_properties)*100:.2f}%)")
 print(f"   Off Market:  {off_market:>10,} ({(off_market/total_properties)*100:.2f}%)")
 print(f"   NULL:        {null_market:>10,} ({(null_market/total_properties)*100:.2f}%)")
 
 # Public status
 print("\n🔓 Public Listing Status:")
-is_public = session.query(Property).filter(Property.is_public == True).count()
-not_public = session.query(Property).filter(Property.is_public == False).count()
-null_public = session.query(Property).filter(Property.is_public.is_(None)).count()
+is_public = stats['is_public']
+not_public = stats['not_public']
+null_public = stats['null_public']
 print(f"   Public:      {is_public:>10,} ({(is_public/total_properties)*100:.2f}%)")
 print(f"   Not Public:  {not_public:>10,} ({(not_public/total_properties)*100:.2f}%)")
 print(f"   NULL:        {null_public:>10,} ({(null_public/total_properties)*100:.2f}%)")
@@ -162,11 +283,11 @@ print("SECTION 3: BUILDINGS ANALYSIS")
 print("="*80)
 
 # Main buildings
-total_main_buildings = session.query(MainBuilding).count()
+total_main_buildings = stats['total_main_buildings']
 print(f"\n🏠 Main Buildings: {total_main_buildings:,}")
 
 # Properties with/without main building
-props_with_main = session.query(Property).filter(Property.main_building.has()).count()
+props_with_main = stats['props_with_main']
 props_without_main = total_properties - props_with_main
 print(f"   Properties with main building:    {props_with_main:>10,} ({(props_with_main/total_properties)*100:.1f}%)")
 print(f"   Properties without main building: {props_without_main:>10,} ({(props_without_main/total_properties)*100:.1f}%)")
@@ -183,13 +304,8 @@ for name, count in building_names[:10]:
     print(f"   {(name or 'NULL')[:50]:<52} {count:>8,} ({pct:>5.2f}%)")
 
 # Year built statistics
-print("\n📅 Year Built Statistics:")
-year_stats = session.query(
-    func.min(MainBuilding.year_built),
-    func.max(MainBuilding.year_built),
-    func.avg(MainBuilding.year_built),
-    func.percentile_cont(0.5).within_group(MainBuilding.year_built)
-).filter(MainBuilding.year_built.isnot(None)).first()
+print(f"\n📅 Year Built Statistics{PERCENTILE_NOTE}:")
+year_stats = (stats['year_min'], stats['year_max'], stats['year_avg'], stats['year_median'])
 
 if year_stats[0]:
     print(f"   Oldest:     {int(year_stats[0])} (Age: {2025 - int(year_stats[0])} years)")
@@ -209,21 +325,20 @@ age_ranges = [
     ("151+ years (pre-1875)", 0, 1874)
 ]
 
+# Compile once with bound bounds so PostgreSQL can reuse the plan across ranges
+age_range_count = select(func.count(MainBuilding.id)).where(
+    MainBuilding.year_built.between(bindparam('min_year'), bindparam('max_year'))
+)
 for label, min_year, max_year in age_ranges:
-    count = session.query(MainBuilding).filter(
-        MainBuilding.year_built.between(min_year, max_year)
-    ).count()
+    count = session.execute(
+        age_range_count, {'min_year': min_year, 'max_year': max_year}
+    ).scalar()
     pct = (count / total_main_buildings) * 100
     print(f"   {label:<30} {count:>8,} ({pct:>5.2f}%)")
 
 # Room statistics
-print("\n🚪 Room Statistics:")
-room_stats = session.query(
-    func.min(MainBuilding.number_of_rooms),
-    func.max(MainBuilding.number_of_rooms),
-    func.avg(MainBuilding.number_of_rooms),
-    func.percentile_cont(0.5).within_group(MainBuilding.number_of_rooms)
-).filter(MainBuilding.number_of_rooms.isnot(None)).first()
+print(f"\n🚪 Room Statistics{PERCENTILE_NOTE}:")
+room_stats = (stats['rooms_min'], stats['rooms_max'], stats['rooms_avg'], stats['rooms_median'])
 
 if room_stats[0]:
     print(f"   Minimum:    {int(room_stats[0]):>5} rooms")
@@ -233,11 +348,7 @@ if room_stats[0]:
 
 # Bathroom/toilet statistics
 print("\n🚿 Bathrooms & Toilets:")
-bath_stats = session.query(
-    func.avg(MainBuilding.number_of_bathrooms),
-    func.avg(MainBuilding.number_of_toilets),
-    func.avg(MainBuilding.number_of_kitchens)
-).first()
+bath_stats = (stats['avg_bathrooms'], stats['avg_toilets'], stats['avg_kitchens'])
 
 if bath_stats[0]:
     print(f"   Average Bathrooms: {bath_stats[0]:>5.2f}")
@@ -247,13 +358,11 @@ if bath_stats[2]:
     print(f"   Average Kitchens:  {bath_stats[2]:>5.2f}")
 
 # Additional buildings
-total_additional = session.query(AdditionalBuilding).count()
+total_additional = stats['total_additional']
 print(f"\n🏚️ Additional Buildings: {total_additional:,}")
 
 # Properties with additional buildings
-props_with_additional = session.query(Property).filter(
-    Property.additional_buildings.any()
-).count()
+props_with_additional = stats['props_with_additional']
 print(f"   Properties with additional buildings: {props_with_additional:>10,} ({(props_with_additional/total_properties)*100:.1f}%)")
 
 # Additional building types
@@ -274,11 +383,11 @@ print("\n" + "="*80)
 print("SECTION 4: CASES & LISTINGS ANALYSIS")
 print("="*80)
 
-total_cases = session.query(Case).count()
+total_cases = stats['total_cases']
 print(f"\n📋 Total Cases (Listings): {total_cases:,}")
 
 # Properties with cases
-props_with_cases = session.query(Property).filter(Property.cases.any()).count()
+props_with_cases = stats['props_with_cases']
 print(f"   Properties with cases:    {props_with_cases:>10,} ({(props_with_cases/total_properties)*100:.2f}%)")
 print(f"   Properties without cases: {total_properties - props_with_cases:>10,} ({((total_properties - props_with_cases)/total_properties)*100:.2f}%)")
 
@@ -294,15 +403,9 @@ for status, count in case_statuses:
     print(f"   {str(status or 'NULL'):<20} {count:>8,} ({pct:>5.2f}%)")
 
 # Current price statistics
-print("\n💵 Current Price Statistics (from Cases):")
-price_stats = session.query(
-    func.min(Case.current_price),
-    func.max(Case.current_price),
-    func.avg(Case.current_price),
-    func.percentile_cont(0.5).within_group(Case.current_price),
-    func.percentile_cont(0.25).within_group(Case.current_price),
-    func.percentile_cont(0.75).within_group(Case.current_price)
-).filter(Case.current_price.isnot(None)).first()
+print(f"\n💵 Current Price Statistics (from Cases){PERCENTILE_NOTE}:")
+price_p25, price_median, price_p75 = stats['price_p'] or (None, None, None)
+price_stats = (stats['price_min'], stats['price_max'], stats['price_avg'], price_median, price_p25, price_p75)
 
 if price_stats[0]:
     print(f"   Minimum:    {price_stats[0]:>15,.0f} kr")
@@ -314,39 +417,25 @@ if price_stats[0]:
 
 # Original vs current price analysis
 print("\n📉 Price Changes Analysis:")
-cases_with_both_prices = session.query(Case).filter(
-    and_(Case.original_price.isnot(None), Case.current_price.isnot(None))
-).count()
+cases_with_both_prices = stats['cases_with_both_prices']
 print(f"   Cases with both original & current price: {cases_with_both_prices:,}")
 
 # Price reductions
-price_reductions = session.query(Case).filter(
-    and_(
-        Case.original_price.isnot(None),
-        Case.current_price.isnot(None),
-        Case.current_price < Case.original_price
-    )
-).count()
+price_reductions = stats['price_reductions']
 pct_reduced = (price_reductions / cases_with_both_prices * 100) if cases_with_both_prices > 0 else 0
 print(f"   Cases with price reductions:              {price_reductions:>8,} ({pct_reduced:.2f}%)")
 
 # Price increases (unusual but possible)
-price_increases = session.query(Case).filter(
-    and_(
-        Case.original_price.isnot(None),
-        Case.current_price.isnot(None),
-        Case.current_price > Case.original_price
-    )
-).count()
+price_increases = stats['price_increases']
 pct_increased = (price_increases / cases_with_both_prices * 100) if cases_with_both_prices > 0 else 0
 print(f"   Cases with price increases:               {price_increases:>8,} ({pct_increased:.2f}%)")
 
 # Price changes table
-total_price_changes = session.query(PriceChange).count()
+total_price_changes = stats['total_price_changes']
 print(f"\n💱 Price Change Records: {total_price_changes:,}")
 
 # Cases with price changes
-cases_with_price_changes = session.query(Case).filter(Case.price_changes.any()).count()
+cases_with_price_changes = stats['cases_with_price_changes']
 print(f"   Cases with price change history: {cases_with_price_changes:>8,}")
 
 # ============================================================================
@@ -356,11 +445,11 @@ print("\n" + "="*80)
 print("SECTION 5: REGISTRATIONS & SALE HISTORY")
 print("="*80)
 
-total_registrations = session.query(Registration).count()
+total_registrations = stats['total_registrations']
 print(f"\n📜 Total Registration Records: {total_registrations:,}")
 
 # Properties with registrations
-props_with_regs = session.query(Property).filter(Property.registrations.any()).count()
+props_with_regs = stats['props_with_regs']
 print(f"   Properties with sale history:    {props_with_regs:>10,} ({(props_with_regs/total_properties)*100:.1f}%)")
 print(f"   Properties without sale history: {total_properties - props_with_regs:>10,} ({((total_properties - props_with_regs)/total_properties)*100:.1f}%)")
 
@@ -380,13 +469,8 @@ for trans_type, count in transaction_types:
     print(f"   {str(trans_type or 'NULL'):<20} {count:>10,} ({pct:>5.2f}%)")
 
 # Sale price statistics
-print("\n💰 Sale Price Statistics (from Registrations):")
-sale_price_stats = session.query(
-    func.min(Registration.amount),
-    func.max(Registration.amount),
-    func.avg(Registration.amount),
-    func.percentile_cont(0.5).within_group(Registration.amount)
-).filter(Registration.amount.isnot(None)).first()
+print(f"\n💰 Sale Price Statistics (from Registrations){PERCENTILE_NOTE}:")
+sale_price_stats = (stats['sale_min'], stats['sale_max'], stats['sale_avg'], stats['sale_median'])
 
 if sale_price_stats[0]:
     print(f"   Minimum:    {sale_price_stats[0]:>15,.0f} kr")
@@ -395,13 +479,8 @@ if sale_price_stats[0]:
     print(f"   Mean:       {sale_price_stats[2]:>15,.0f} kr")
 
 # Price per sqm statistics
-print("\n💵 Price Per Square Meter (from Registrations):")
-per_sqm_stats = session.query(
-    func.min(Registration.per_area_price),
-    func.max(Registration.per_area_price),
-    func.avg(Registration.per_area_price),
-    func.percentile_cont(0.5).within_group(Registration.per_area_price)
-).filter(Registration.per_area_price.isnot(None)).first()
+print(f"\n💵 Price Per Square Meter (from Registrations){PERCENTILE_NOTE}:")
+per_sqm_stats = (stats['per_sqm_min'], stats['per_sqm_max'], stats['per_sqm_avg'], stats['per_sqm_median'])
 
 if per_sqm_stats[0]:
     print(f"   Minimum:    {per_sqm_stats[0]:>10,.0f} kr/sqm")
@@ -417,56 +496,52 @@ print("SECTION 6: GEOGRAPHIC DISTRIBUTION")
 print("="*80)
 
 # Municipalities
-total_municipalities = session.query(func.count(func.distinct(Municipality.municipality_code))).scalar()
+total_municipalities = stats['total_municipalities']
 print(f"\n🗺️ Unique Municipalities: {total_municipalities}")
 
-print("\n📊 Top 20 Municipalities by Property Count:")
-muni_counts = session.query(
-    Municipality.name,
-    func.count(Property.id)
-).join(Property, Property.id == Municipality.property_id
-).group_by(Municipality.name
-).order_by(func.count(Property.id).desc()
-).limit(20).all()
+# Fetch the three top-N lists in a single round trip, partitioned by kind below
+TOP_LOCATIONS_SQL = text("""
+    WITH muni AS (
+        SELECT 'muni' AS kind, m.name AS key, COUNT(p.id) AS cnt
+        FROM municipalities m JOIN properties_new p ON p.id = m.property_id
+        GROUP BY m.name ORDER BY cnt DESC LIMIT 20
+    ), zips AS (
+        SELECT 'zip' AS kind, CAST(zip_code AS TEXT) AS key, COUNT(id) AS cnt
+        FROM properties_new WHERE zip_code IS NOT NULL
+        GROUP BY zip_code ORDER BY cnt DESC LIMIT 15
+    ), cits AS (
+        SELECT 'city' AS kind, city_name AS key, COUNT(id) AS cnt
+        FROM properties_new WHERE city_name IS NOT NULL
+        GROUP BY city_name ORDER BY cnt DESC LIMIT 15
+    )
+    SELECT * FROM muni UNION ALL SELECT * FROM zips UNION ALL SELECT * FROM cits
+""")
+top_locations = {'muni': [], 'zip': [], 'city': []}
+for kind, key, cnt in session.execute(TOP_LOCATIONS_SQL):
+    top_locations[kind].append((key, cnt))
+muni_counts = top_locations['muni']
+zip_counts = top_locations['zip']
+city_counts = top_locations['city']
 
+print("\n📊 Top 20 Municipalities by Property Count:")
 for name, count in muni_counts:
     pct = (count / total_properties) * 100
     print(f"   {(name or 'NULL'):<30} {count:>8,} ({pct:>5.2f}%)")
 
 # Zip codes
-total_zip_codes = session.query(func.count(func.distinct(Property.zip_code))).filter(
-    Property.zip_code.isnot(None)
-).scalar()
+total_zip_codes = stats['total_zip_codes']
 print(f"\n📮 Unique Zip Codes: {total_zip_codes}")
 
 print("\n📊 Top 15 Zip Codes by Property Count:")
-zip_counts = session.query(
-    Property.zip_code,
-    func.count(Property.id)
-).filter(Property.zip_code.isnot(None)
-).group_by(Property.zip_code
-).order_by(func.count(Property.id).desc()
-).limit(15).all()
-
 for zip_code, count in zip_counts:
     pct = (count / total_properties) * 100
     print(f"   {zip_code}  {count:>10,} ({pct:>5.2f}%)")
 
 # Cities
-total_cities = session.query(func.count(func.distinct(Property.city_name))).filter(
-    Property.city_name.isnot(None)
-).scalar()
+total_cities = stats['total_cities']
 print(f"\n🏙️ Unique Cities: {total_cities}")
 
 print("\n📊 Top 15 Cities by Property Count:")
-city_counts = session.query(
-    Property.city_name,
-    func.count(Property.id)
-).filter(Property.city_name.isnot(None)
-).group_by(Property.city_name
-).order_by(func.count(Property.id).desc()
-).limit(15).all()
-
 for city, count in city_counts:
     pct = (count / total_properties) * 100
     print(f"   {(city or 'NULL'):<30} {count:>8,} ({pct:>5.2f}%)")
@@ -480,73 +555,102 @@ print("="*80)
 
 print("\n⚠️ OUTLIERS & ANOMALIES:")
 
+# All outlier groups in one core-SQL statement; `kind` discriminates the group and
+# `value` carries the ranking metric (area, year built, rooms or valuation)
+OUTLIERS_SQL = text("""
+    WITH large AS (
+        SELECT 'large' AS kind, ROW_NUMBER() OVER (ORDER BY p.living_area DESC) AS rn,
+               p.living_area AS value, p.living_area, p.city_name, p.address_type, m.name AS muni
+        FROM properties_new p LEFT JOIN municipalities m ON m.property_id = p.id
+        WHERE p.living_area > 1000
+        ORDER BY rn LIMIT 10
+    ), small AS (
+        SELECT 'small' AS kind, ROW_NUMBER() OVER (ORDER BY p.living_area) AS rn,
+               p.living_area AS value, p.living_area, p.city_name, p.address_type, m.name AS muni
+        FROM properties_new p LEFT JOIN municipalities m ON m.property_id = p.id
+        WHERE p.living_area IS NOT NULL AND p.living_area < 50
+        ORDER BY rn LIMIT 10
+    ), old AS (
+        SELECT 'old' AS kind, ROW_NUMBER() OVER (ORDER BY b.year_built) AS rn,
+               b.year_built AS value, p.living_area, p.city_name, p.address_type, m.name AS muni
+        FROM properties_new p JOIN main_buildings b ON b.property_id = p.id
+        LEFT JOIN municipalities m ON m.property_id = p.id
+        WHERE b.year_built < 1850
+        ORDER BY rn LIMIT 10
+    ), new AS (
+        SELECT 'new' AS kind, ROW_NUMBER() OVER (ORDER BY b.year_built DESC) AS rn,
+               b.year_built AS value, p.living_area, p.city_name, p.address_type, m.name AS muni
+        FROM properties_new p JOIN main_buildings b ON b.property_id = p.id
+        LEFT JOIN municipalities m ON m.property_id = p.id
+        WHERE b.year_built >= 2020
+        ORDER BY rn LIMIT 10
+    ), expensive AS (
+        SELECT 'expensive' AS kind, ROW_NUMBER() OVER (ORDER BY p.latest_valuation DESC) AS rn,
+               p.latest_valuation AS value, p.living_area, p.city_name, p.address_type, m.name AS muni
+        FROM properties_new p LEFT JOIN municipalities m ON m.property_id = p.id
+        WHERE p.latest_valuation IS NOT NULL
+        ORDER BY rn LIMIT 10
+    ), cheap AS (
+        SELECT 'cheap' AS kind, ROW_NUMBER() OVER (ORDER BY p.latest_valuation) AS rn,
+               p.latest_valuation AS value, p.living_area, p.city_name, p.address_type, m.name AS muni
+        FROM properties_new p LEFT JOIN municipalities m ON m.property_id = p.id
+        WHERE p.latest_valuation IS NOT NULL AND p.latest_valuation > 0
+        ORDER BY rn LIMIT 10
+    ), many_rooms AS (
+        SELECT 'many_rooms' AS kind, ROW_NUMBER() OVER (ORDER BY b.number_of_rooms DESC) AS rn,
+               b.number_of_rooms AS value, p.living_area, p.city_name, p.address_type, m.name AS muni
+        FROM properties_new p JOIN main_buildings b ON b.property_id = p.id
+        LEFT JOIN municipalities m ON m.property_id = p.id
+        WHERE b.number_of_rooms > 15
+        ORDER BY rn LIMIT 10
+    )
+    SELECT * FROM large UNION ALL SELECT * FROM small UNION ALL SELECT * FROM old
+    UNION ALL SELECT * FROM new UNION ALL SELECT * FROM expensive UNION ALL SELECT * FROM cheap
+    UNION ALL SELECT * FROM many_rooms
+    ORDER BY kind, rn
+""")
+outliers = {kind: [] for kind in ('large', 'small', 'old', 'new', 'expensive', 'cheap', 'many_rooms')}
+for kind, _rn, value, living_area, city_name, address_type, muni in session.execute(OUTLIERS_SQL):
+    outliers[kind].append((value, living_area, city_name, address_type, muni))
+
 # Extremely large properties
 print("\n🏰 Extremely Large Properties (>1000 sqm):")
-large_props = session.query(Property).filter(Property.living_area > 1000).order_by(Property.living_area.desc()).limit(10).all()
-for prop in large_props:
-    muni = session.query(Municipality.name).filter(Municipality.property_id == prop.id).scalar()
-    print(f"   {prop.living_area:>6.0f} sqm | {prop.city_name or 'Unknown':<20} | {muni or 'Unknown':<20} | {prop.address_type or 'Unknown'}")
+for living_area, _, city_name, address_type, muni in outliers['large']:
+    print(f"   {living_area:>6.0f} sqm | {city_name or 'Unknown':<20} | {muni or 'Unknown':<20} | {address_type or 'Unknown'}")
 
 # Extremely small properties
 print("\n🏠 Extremely Small Properties (<50 sqm):")
-small_props = session.query(Property).filter(
-    and_(Property.living_area.isnot(None), Property.living_area < 50)
-).order_by(Property.living_area).limit(10).all()
-for prop in small_props:
-    muni = session.query(Municipality.name).filter(Municipality.property_id == prop.id).scalar()
-    print(f"   {prop.living_area:>6.1f} sqm | {prop.city_name or 'Unknown':<20} | {muni or 'Unknown':<20} | {prop.address_type or 'Unknown'}")
+for living_area, _, city_name, address_type, muni in outliers['small']:
+    print(f"   {living_area:>6.1f} sqm | {city_name or 'Unknown':<20} | {muni or 'Unknown':<20} | {address_type or 'Unknown'}")
 
 # Very old buildings
 print("\n🏛️ Oldest Buildings (pre-1850):")
-old_buildings = session.query(Property, MainBuilding).join(
-    MainBuilding, Property.id == MainBuilding.property_id
-).filter(MainBuilding.year_built < 1850).order_by(MainBuilding.year_built).limit(10).all()
-
-for prop, building in old_buildings:
-    age = 2025 - building.year_built
-    muni = session.query(Municipality.name).filter(Municipality.property_id == prop.id).scalar()
-    print(f"   {building.year_built} ({age} yrs) | {prop.city_name or 'Unknown':<20} | {muni or 'Unknown':<20}")
+for year_built, _, city_name, _, muni in outliers['old']:
+    year_built = int(year_built)
+    age = 2025 - year_built
+    print(f"   {year_built} ({age} yrs) | {city_name or 'Unknown':<20} | {muni or 'Unknown':<20}")
 
 # Very new buildings
 print("\n🆕 Newest Buildings (2020+):")
-new_buildings = session.query(Property, MainBuilding).join(
-    MainBuilding, Property.id == MainBuilding.property_id
-).filter(MainBuilding.year_built >= 2020).order_by(MainBuilding.year_built.desc()).limit(10).all()
-
-for prop, building in new_buildings:
-    age = 2025 - building.year_built
-    muni = session.query(Municipality.name).filter(Municipality.property_id == prop.id).scalar()
-    print(f"   {building.year_built} ({age} yrs) | {prop.city_name or 'Unknown':<20} | {muni or 'Unknown':<20}")
+for year_built, _, city_name, _, muni in outliers['new']:
+    year_built = int(year_built)
+    age = 2025 - year_built
+    print(f"   {year_built} ({age} yrs) | {city_name or 'Unknown':<20} | {muni or 'Unknown':<20}")
 
 # Extremely expensive properties
 print("\n💎 Most Expensive Properties (Valuation):")
-expensive_props = session.query(Property).filter(
-    Property.latest_valuation.isnot(None)
-).order_by(Property.latest_valuation.desc()).limit(10).all()
-
-for prop in expensive_props:
-    muni = session.query(Municipality.name).filter(Municipality.property_id == prop.id).scalar()
-    print(f"   {prop.latest_valuation:>15,.0f} kr | {prop.living_area or 0:>6.0f} sqm | {prop.city_name or 'Unknown':<15} | {muni or 'Unknown':<15}")
+for valuation, living_area, city_name, _, muni in outliers['expensive']:
+    print(f"   {valuation:>15,.0f} kr | {living_area or 0:>6.0f} sqm | {city_name or 'Unknown':<15} | {muni or 'Unknown':<15}")
 
 # Extremely cheap properties
 print("\n💵 Least Expensive Properties (Valuation):")
-cheap_props = session.query(Property).filter(
-    and_(Property.latest_valuation.isnot(None), Property.latest_valuation > 0)
-).order_by(Property.latest_valuation).limit(10).all()
-
-for prop in cheap_props:
-    muni = session.query(Municipality.name).filter(Municipality.property_id == prop.id).scalar()
-    print(f"   {prop.latest_valuation:>15,.0f} kr | {prop.living_area or 0:>6.0f} sqm | {prop.city_name or 'Unknown':<15} | {muni or 'Unknown':<15}")
+for valuation, living_area, city_name, _, muni in outliers['cheap']:
+    print(f"   {valuation:>15,.0f} kr | {living_area or 0:>6.0f} sqm | {city_name or 'Unknown':<15} | {muni or 'Unknown':<15}")
 
 # Many rooms
 print("\n🚪 Properties with Many Rooms (>15):")
-many_rooms = session.query(Property, MainBuilding).join(
-    MainBuilding, Property.id == MainBuilding.property_id
-).filter(MainBuilding.number_of_rooms > 15).order_by(MainBuilding.number_of_rooms.desc()).limit(10).all()
-
-for prop, building in many_rooms:
-    muni = session.query(Municipality.name).filter(Municipality.property_id == prop.id).scalar()
-    print(f"   {building.number_of_rooms:>2} rooms | {prop.living_area or 0:>6.0f} sqm | {prop.city_name or 'Unknown':<15} | {muni or 'Unknown':<15}")
+for rooms, living_area, city_name, _, muni in outliers['many_rooms']:
+    print(f"   {int(rooms):>2} rooms | {living_area or 0:>6.0f} sqm | {city_name or 'Unknown':<15} | {muni or 'Unknown':<15}")
 
 # Missing critical data
 print("\n❌ MISSING DATA SUMMARY:")
@@ -580,9 +684,7 @@ print("SECTION 8: COORDINATE & LOCATION DATA QUALITY")
 print("="*80)
 
 # Coordinate availability
-props_with_coords = session.query(Property).filter(
-    and_(Property.latitude.isnot(None), Property.longitude.isnot(None))
-).count()
+props_with_coords = stats['props_with_coords']
 props_without_coords = total_properties - props_with_coords
 
 print(f"\n📍 Coordinate Data:")
@@ -7,10 +7,12 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from sqlalchemy import func, inspect
+from sqlalchemy import func, inspect, text
 from src.database import db
 from src.db_models_new import Property, Case
 import json
+from itertools import groupby
+from sqlalchemy.orm import selectinload
 
 print("="*80)
 print("INVESTIGATING CASES TABLE STRUCTURE")
@@ -18,10 +20,19 @@ print("="*80)
 
 session = db.get_session()
 
-# Get total counts
-total_cases = session.query(Case).count()
-total_properties = session.query(Property).count()
-props_with_cases = session.query(Property).filter(Property.cases.any()).count()
+# Get total counts - one scan per table, conditional counts via FILTER
+case_counts = session.execute(text("""
+    SELECT
+        COUNT(*) AS total_cases,
+        COUNT(DISTINCT property_id) AS props_with_cases,
+        COUNT(*) FILTER (WHERE current_price IS NOT NULL) AS cases_with_current_price,
+        COUNT(*) FILTER (WHERE original_price IS NOT NULL) AS cases_with_original_price
+    FROM cases
+""")).mappings().one()
+total_properties = session.execute(text("SELECT COUNT(*) FROM properties_new")).scalar()
+
+total_cases = case_counts['total_cases']
+props_with_cases = case_counts['props_with_cases']
 
 print(f"\n📊 Overview:")
 print(f"   Total Cases: {total_cases:,}")
@@ -42,7 +53,14 @@ print("\n" + "="*80)
 print("SAMPLE CASE RECORDS (First 10)")
 print("="*80)
 
-sample_cases = session.query(Case).limit(10).all()
+# Select only the printed columns - plain Row tuples, no entity hydration
+sample_cases = session.query(
+    Case.id, Case.case_id, Case.property_id, Case.status,
+    Case.current_price, Case.original_price,
+    Case.created_date, Case.modified_date,
+    Case.days_on_market_current, Case.days_on_market_total,
+    Case.realtors_info
+).limit(10).all()
 
 for i, case in enumerate(sample_cases, 1):
     print(f"\n🔍 Case #{i}:")
@@ -74,14 +92,21 @@ multi_case_props = session.query(
 ).order_by(func.count(Case.id).desc()
 ).limit(10).all()
 
+# Fetch the cases for all listed properties in one query instead of one per property
+multi_case_ids = [prop_id for prop_id, _, _ in multi_case_props]
+all_multi_cases = session.query(Case).filter(
+    Case.property_id.in_(multi_case_ids)
+).order_by(Case.property_id, Case.created_date).all()
+cases_by_property = {
+    prop_id: list(cases) for prop_id, cases in groupby(all_multi_cases, key=lambda c: c.property_id)
+}
+
 print(f"\nFound {len(multi_case_props)} properties with multiple cases:")
 for prop_id, address, count in multi_case_props:
     print(f"\n   Property: {address}")
     print(f"   Cases: {count}")
     
-    # Get all cases for this property
-    cases = session.query(Case).filter(Case.property_id == prop_id).order_by(Case.created_date).all()
-    for j, case in enumerate(cases, 1):
+    for j, case in enumerate(cases_by_property.get(prop_id, []), 1):
         print(f"      Case {j}: Status={case.status}, Original={case.original_price}, Current={case.current_price}, Created={case.created_date}")
 
 # Check if there are any cases with price data
@@ -89,8 +114,8 @@ print("\n" + "="*80)
 print("CHECKING FOR PRICE DATA")
 print("="*80)
 
-cases_with_current_price = session.query(Case).filter(Case.current_price.isnot(None)).count()
-cases_with_original_price = session.query(Case).filter(Case.original_price.isnot(None)).count()
+cases_with_current_price = case_counts['cases_with_current_price']
+cases_with_original_price = case_counts['cases_with_original_price']
 
 print(f"\n💰 Price Data Availability:")
 print(f"   Cases with Current Price: {cases_with_current_price:,} ({(cases_with_current_price/total_cases)*100:.2f}%)")
@@ -98,9 +123,12 @@ print(f"   Cases with Original Price: {cases_with_original_price:,} ({(cases_wit
 
 if cases_with_current_price > 0:
     print("\n✅ PRICE DATA EXISTS! Sampling cases with prices:")
-    cases_with_prices = session.query(Case).filter(Case.current_price.isnot(None)).limit(10).all()
-    for case in cases_with_prices:
-        print(f"   Case {case.case_id[:8]}... - Current: {case.current_price:,.0f} kr, Original: {case.original_price:,.0f if case.original_price else 'N/A'} kr")
+    cases_with_prices = session.query(
+        Case.case_id, Case.current_price, Case.original_price
+    ).filter(Case.current_price.isnot(None)).limit(10).all()
+    for case_id, current_price, original_price in cases_with_prices:
+        original = f"{original_price:,.0f}" if original_price else 'N/A'
+        print(f"   Case {case_id[:8]}... - Current: {current_price:,.0f} kr, Original: {original} kr")
 else:
     print("\n❌ NO PRICE DATA FOUND in current_price or original_price fields")
 
@@ -110,13 +138,16 @@ print("EXAMINING RAW PROPERTY DATA STRUCTURE")
 print("="*80)
 
 # Get a property with a case
-prop_with_case = session.query(Property).filter(Property.cases.any()).first()
+prop_with_case = session.query(Property).options(
+    selectinload(Property.cases)
+).filter(Property.cases.any()).first()
 
 if prop_with_case:
     print(f"\n📦 Property: {prop_with_case.address}")
     print(f"   Property ID: {prop_with_case.id}")
     print(f"   Is On Market: {prop_with_case.is_on_market}")
-    print(f"   Latest Valuation: {prop_with_case.latest_valuation:,.0f if prop_with_case.latest_valuation else 'N/A'} kr")
+    valuation = f"{prop_with_case.latest_valuation:,.0f}" if prop_with_case.latest_valuation else 'N/A'
+    print(f"   Latest Valuation: {valuation} kr")
     
     print(f"\n   Cases for this property ({len(prop_with_case.cases)}):")
     for case in prop_with_case.cases:
@@ -10,10 +10,12 @@ Requirements:
     - Run backup_database.py first to create the files
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, make_response
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -34,6 +36,32 @@ except Exception as e:
     print("📋 Make sure to run: python backup_database.py --export")
     sys.exit(1)
 
+# Data is read-only for the lifetime of the process, so derived stats are computed
+# once and clients may cache the stats responses (ETag changes with each export)
+STATS_CACHE_SECONDS = 300
+
+# Text-search pages ending within this many rows use a partial sort (argpartition)
+PARTIAL_SORT_MAX_ROWS = 500
+
+@lru_cache(maxsize=1)
+def get_cached_municipalities():
+    """Municipality list for dropdowns, computed once per process"""
+    return file_db.get_municipalities()
+
+@lru_cache(maxsize=1)
+def get_cached_stats():
+    """Property and municipality counts, computed once per process"""
+    return {
+        'total_properties': file_db.row_counts['properties_new'],
+        'municipalities': len(get_cached_municipalities())
+    }
+
+def cacheable(response):
+    """Add Cache-Control/ETag headers and answer If-None-Match with 304"""
+    response.headers['Cache-Control'] = f'public, max-age={STATS_CACHE_SECONDS}'
+    response.set_etag(file_db.manifest['export_date'])
+    return response.make_conditional(request)
+
 @app.route('/')
 def index():
     """Landing page"""
@@ -43,14 +71,14 @@ def index():
 def search_page():
     """Search page with filters"""
     # Get municipalities for filter dropdown
-    municipalities = file_db.get_municipalities()
+    municipalities = get_cached_municipalities()
     return render_template('index.html', municipalities=municipalities)
 
 @app.route('/score-calculator')
 def score_calculator():
     """Score calculator page for ranking properties"""
     # Get municipalities for filter dropdown
-    municipalities = file_db.get_municipalities()
+    municipalities = get_cached_municipalities()
     return render_template('score_calculator.html', municipalities=municipalities)
 
 @app.route('/api/search')
@@ -134,14 +162,23 @@ def text_search():
         
         # Sort by price descending
         price_column = 'current_price_case' if 'current_price_case' in search_results.columns else 'latest_valuation'
-        search_results = search_results.sort_values(price_column, ascending=False, na_position='last')
-        
         total = len(search_results)
         
         # Apply pagination
         start_idx = (page - 1) * per_page
         end_idx = start_idx + per_page
-        page_results = search_results.iloc[start_idx:end_idx]
+        
+        if end_idx < total and end_idx <= PARTIAL_SORT_MAX_ROWS:
+            # Early pages only need the top end_idx rows ordered: O(n) partition
+            # plus a sort of end_idx rows instead of sorting every match
+            prices = search_results[price_column].to_numpy(dtype=float)
+            keys = -np.where(np.isnan(prices), -np.inf, prices)
+            top = np.argpartition(keys, end_idx - 1)[:end_idx]
+            top = top[np.argsort(keys[top], kind='stable')]
+            page_results = search_results.iloc[top[start_idx:end_idx]]
+        else:
+            search_results = search_results.sort_values(price_column, ascending=False, na_position='last')
+            page_results = search_results.iloc[start_idx:end_idx]
         
         # Format results
         formatted_results = file_db._format_properties(page_results)
@@ -196,23 +233,18 @@ def get_stats():
     """Get database statistics"""
     try:
         stats = {
-            'total_properties': len(file_db.get_table('properties_new')),
-            'municipalities': len(file_db.get_municipalities()),
+            **get_cached_stats(),
             'export_date': file_db.manifest['export_date'],
             'tables_loaded': len(file_db.tables)
         }
         
-        # Add table counts
-        table_counts = {}
-        for table_name, df in file_db.tables.items():
-            table_counts[table_name] = len(df)
+        # Add table counts (from the export manifest)
+        stats['table_counts'] = {table_name: file_db.row_counts[table_name] for table_name in file_db.tables}
         
-        stats['table_counts'] = table_counts
-        
-        return jsonify({
+        return cacheable(jsonify({
             'success': True,
             'stats': stats
-        })
+        }))
         
     except Exception as e:
         return jsonify({
@@ -225,8 +257,7 @@ def data_info():
     """Data information page"""
     try:
         stats = {
-            'total_properties': len(file_db.get_table('properties_new')),
-            'municipalities': len(file_db.get_municipalities()),
+            **get_cached_stats(),
             'export_date': file_db.manifest['export_date'],
             'tables_loaded': len(file_db.tables),
             'export_dir': str(file_db.export_dir),
@@ -235,14 +266,14 @@ def data_info():
         
         # Table information
         table_info = []
-        for table_name, df in file_db.tables.items():
+        for table_name in file_db.tables:
             table_info.append({
                 'name': table_name,
-                'rows': len(df),
-                'columns': len(df.columns)
+                'rows': file_db.row_counts[table_name],
+                'columns': len(file_db.table_columns(table_name))
             })
         
-        return render_template('data_info.html', stats=stats, tables=table_info)
+        return cacheable(make_response(render_template('data_info.html', stats=stats, tables=table_info)))
         
     except Exception as e:
         return render_template('error.html', error=str(e))
@@ -250,8 +281,8 @@ def data_info():
 if __name__ == '__main__':
     print("\n🚀 Starting Portable Danish Housing Search")
     print("=" * 50)
-    print(f"📊 Properties: {len(file_db.get_table('properties_new')):,}")
-    print(f"🏘️  Municipalities: {len(file_db.get_municipalities())}")
+    print(f"📊 Properties: {get_cached_stats()['total_properties']:,}")
+    print(f"🏘️  Municipalities: {get_cached_stats()['municipalities']}")
     print(f"📁 Data from: {file_db.export_dir}")
     print(f"📅 Export date: {file_db.manifest['export_date']}")
     print("=" * 50)
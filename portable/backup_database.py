@@ -12,7 +12,11 @@ Usage:
 import os
 import sys
 import argparse
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, func, Integer, Float, Boolean, DateTime, JSON
 from datetime import datetime
 from pathlib import Path
 
@@ -32,8 +36,6 @@ except ImportError:
 
 def get_table_info():
     """Get information about all tables and their row counts"""
-    session = db.get_session()
-    
     tables = {
         'properties_new': Property,
         'main_buildings': MainBuilding,
@@ -57,77 +59,174 @@ def get_table_info():
     print("\n📊 Database Table Statistics:")
     print("=" * 50)
     
-    for table_name, model_class in tables.items():
-        try:
-            count = session.query(model_class).count()
-            info[table_name] = count
-            total_rows += count
-            print(f"{table_name:20} {count:>10,} rows")
-        except Exception as e:
-            print(f"{table_name:20} {'ERROR':>10} - {str(e)}")
-            info[table_name] = 0
+    # Core COUNT(*) per table on one connection - no ORM query/session machinery
+    with db.engine.connect() as conn:
+        for table_name, model_class in tables.items():
+            try:
+                count = conn.execute(select(func.count()).select_from(model_class.__table__)).scalar()
+                info[table_name] = count
+                total_rows += count
+                print(f"{table_name:20} {count:>10,} rows")
+            except Exception as e:
+                conn.rollback()
+                print(f"{table_name:20} {'ERROR':>10} - {str(e)}")
+                info[table_name] = 0
     
     print("=" * 50)
     print(f"{'TOTAL':20} {total_rows:>10,} rows")
     
-    session.close()
     return info
 
+# Rows fetched per server-side cursor round trip / written per Parquet batch
+EXPORT_BATCH_SIZE = 50_000
+
+# Parquet encoding: ZSTD beats the default snappy on size and cold-read time, and
+# dictionary pages suit the many low-cardinality strings (municipality, city, status)
+PARQUET_COMPRESSION = 'zstd'
+PARQUET_COMPRESSION_LEVEL = 7
+# Streamed batches are regrouped so every row group but the last has exactly this many rows
+PARQUET_ROW_GROUP_SIZE = 64_000
+PARQUET_DATA_PAGE_SIZE = 1_048_576
+
+# All tables in logical order
+EXPORT_TABLES = [
+    ('properties_new', Property),
+    ('municipalities', Municipality),
+    ('provinces', Province),
+    ('cities', City),
+    ('zip_codes', Zip),
+    ('roads', Road),
+    ('places', Place),
+    ('main_buildings', MainBuilding),
+    ('additional_buildings', AdditionalBuilding),
+    ('registrations', Registration),
+    ('cases', Case),
+    ('case_images', CaseImage),
+    ('price_changes', PriceChange),
+    ('days_on_market', DaysOnMarket)
+]
+EXPORT_TABLE_MODELS = dict(EXPORT_TABLES)
+
+# Cluster rows on the common filter columns so each row group covers a narrow
+# value band and readers can prune row groups using Parquet min/max statistics
+EXPORT_SORT_COLUMNS = {
+    'properties_new': ['zip_code', 'latest_valuation'],
+    'municipalities': ['name'],
+    'cases': ['current_price'],
+}
+
+def get_arrow_schema(model_class):
+    """Build a fixed Arrow schema from the model's column types.
+    
+    A fixed schema keeps every streamed batch compatible with the Parquet
+    writer, even when a batch has an all-NULL column.
+    """
+    fields = []
+    for column in model_class.__table__.columns:
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp('us')
+        else:  # String, Text and JSON (serialized) columns
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+def rows_to_record_batch(rows, schema, json_positions):
+    """Convert a batch of result rows into an Arrow RecordBatch (column-wise)
+    
+    json_positions holds the precomputed indexes of JSON columns, so no column
+    metadata is looked up per batch or per row.
+    """
+    columns = list(zip(*rows))
+    for i in json_positions:
+        columns[i] = [json.dumps(v) if v is not None else None for v in columns[i]]
+    arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
 def export_table_to_parquet(table_name, model_class, output_dir, limit=None):
     """Export a single table to Parquet format"""
-    session = db.get_session()
-    
     try:
-        # Build query
-        query = session.query(model_class)
+        # Build query (Core select - rows go straight into Arrow record batches, no ORM objects)
+        table = model_class.__table__
+        query = select(table)
+        sort_columns = EXPORT_SORT_COLUMNS.get(table_name)
+        if sort_columns:
+            query = query.order_by(*(table.c[name] for name in sort_columns))
         if limit:
             query = query.limit(limit)
         
-        # Get total count
-        total_count = session.query(model_class).count()
-        export_count = min(total_count, limit) if limit else total_count
-        
-        print(f"📦 Exporting {table_name}: {export_count:,} rows", end="")
-        if limit and limit < total_count:
-            print(f" (limited from {total_count:,})")
+        # Only a limited export needs the table total (for the "limited from" note);
+        # a full export reports the streamed row count instead of scanning twice
+        if limit:
+            with db.engine.connect() as conn:
+                total_count = conn.execute(select(func.count()).select_from(table)).scalar()
+            print(f"📦 Exporting {table_name}: {min(total_count, limit):,} rows", end="")
+            print(f" (limited from {total_count:,})" if limit < total_count else "")
         else:
-            print()
+            print(f"📦 Exporting {table_name}")
+        
+        # Stream rows through a server-side cursor into a Parquet writer so memory
+        # stays bounded by one batch instead of the whole table
+        parquet_file = output_dir / f"{table_name}.parquet"
+        schema = get_arrow_schema(model_class)
+        json_columns = {c.name for c in model_class.__table__.columns if isinstance(c.type, JSON)}
+        json_positions = [i for i, f in enumerate(schema) if f.name in json_columns]
+        dictionary_columns = [f.name for f in schema if f.type == pa.string() and f.name not in json_columns]
+        rows_written = 0
+        writer = None
+        pending = []
+        pending_rows = 0
         
-        # Execute query and get all results
-        results = query.all()
+        with db.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=EXPORT_BATCH_SIZE
+            ).execute(query)
+            try:
+                for rows in result.partitions():
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            parquet_file, schema,
+                            compression=PARQUET_COMPRESSION,
+                            compression_level=PARQUET_COMPRESSION_LEVEL,
+                            use_dictionary=dictionary_columns,
+                            data_page_size=PARQUET_DATA_PAGE_SIZE
+                        )
+                    pending.append(rows_to_record_batch(rows, schema, json_positions))
+                    pending_rows += len(rows)
+                    rows_written += len(rows)
+                    
+                    # Write whole row groups; the remainder waits for the next batch
+                    if pending_rows >= PARQUET_ROW_GROUP_SIZE:
+                        buffered = pa.Table.from_batches(pending, schema=schema)
+                        full_rows = pending_rows - pending_rows % PARQUET_ROW_GROUP_SIZE
+                        writer.write_table(buffered.slice(0, full_rows), row_group_size=PARQUET_ROW_GROUP_SIZE)
+                        pending = buffered.slice(full_rows).to_batches()
+                        pending_rows -= full_rows
+                
+                if pending_rows:
+                    writer.write_table(pa.Table.from_batches(pending, schema=schema), row_group_size=PARQUET_ROW_GROUP_SIZE)
+            finally:
+                if writer is not None:
+                    writer.close()
         
-        if not results:
+        if rows_written == 0:
             print(f"   ⚠️  No data in {table_name}")
             return None
         
-        # Convert to list of dictionaries
-        data = []
-        for row in results:
-            row_dict = {}
-            for column in row.__table__.columns:
-                value = getattr(row, column.name)
-                # Handle special data types
-                if hasattr(value, 'isoformat'):  # datetime objects
-                    value = value.isoformat()
-                row_dict[column.name] = value
-            data.append(row_dict)
-        
-        # Create DataFrame
-        df = pd.DataFrame(data)
-        
-        # Export to Parquet
-        parquet_file = output_dir / f"{table_name}.parquet"
-        df.to_parquet(parquet_file, index=False, engine='pyarrow')
-        
         # Get file size
         file_size = parquet_file.stat().st_size
         file_size_mb = file_size / (1024 * 1024)
         
-        print(f"   ✅ Saved: {parquet_file.name} ({file_size_mb:.1f} MB)")
+        print(f"   ✅ Saved: {parquet_file.name} ({rows_written:,} rows, {file_size_mb:.1f} MB)")
         
         return {
             'table': table_name,
-            'rows': len(data),
+            'rows': rows_written,
             'file_size_mb': file_size_mb,
             'file_path': str(parquet_file)
         }
@@ -135,46 +234,50 @@ def export_table_to_parquet(table_name, model_class, output_dir, limit=None):
     except Exception as e:
         print(f"   ❌ Error exporting {table_name}: {str(e)}")
         return None
-    finally:
-        session.close()
 
-def export_all_tables(output_dir, limit=None):
+def export_table_worker(table_name, output_dir, limit=None):
+    """Process-pool entry point: export one table using this process's own connections"""
+    # Never reuse pooled connections inherited from the parent over fork
+    db.engine.dispose(close=False)
+    return export_table_to_parquet(table_name, EXPORT_TABLE_MODELS[table_name], output_dir, limit)
+
+def export_all_tables(output_dir, limit=None, max_workers=None):
     """Export all tables to Parquet format"""
     
     # Create output directory
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Define all tables in logical order
-    tables = [
-        ('properties_new', Property),
-        ('municipalities', Municipality),
-        ('provinces', Province),
-        ('cities', City),
-        ('zip_codes', Zip),
-        ('roads', Road),
-        ('places', Place),
-        ('main_buildings', MainBuilding),
-        ('additional_buildings', AdditionalBuilding),
-        ('registrations', Registration),
-        ('cases', Case),
-        ('case_images', CaseImage),
-        ('price_changes', PriceChange),
-        ('days_on_market', DaysOnMarket)
-    ]
+    tables = EXPORT_TABLES
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, len(tables))
     
     print(f"\n🚀 Starting export to: {output_dir.absolute()}")
     if limit:
         print(f"📊 Limit: {limit:,} rows per table (test mode)")
+    print(f"⚙️  Workers: {max_workers}")
     
     start_time = datetime.now()
-    export_results = []
+    results_by_table = {}
+    
+    # Tables are independent and Parquet encoding is CPU-bound, so export in parallel
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(export_table_worker, table_name, output_dir, limit): table_name
+            for table_name, _ in tables
+        }
+        for future in as_completed(futures):
+            table_name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"   ❌ Worker failed for {table_name}: {str(e)}")
+                continue
+            if result:
+                results_by_table[table_name] = result
     
-    # Export each table
-    for table_name, model_class in tables:
-        result = export_table_to_parquet(table_name, model_class, output_dir, limit)
-        if result:
-            export_results.append(result)
+    # Keep manifest entries in logical table order
+    export_results = [results_by_table[name] for name, _ in tables if name in results_by_table]
     
     # Summary
     end_time = datetime.now()
@@ -200,7 +303,6 @@ def export_all_tables(output_dir, limit=None):
     }
     
     manifest_file = output_dir / 'export_manifest.json'
-    import json
     with open(manifest_file, 'w') as f:
         json.dump(manifest, f, indent=2)
     
@@ -220,6 +322,8 @@ def main():
                        help='Output directory for Parquet files (default: data/backups)')
     parser.add_argument('--limit', type=int,
                        help='Limit rows per table (for testing)')
+    parser.add_argument('--workers', type=int,
+                       help='Parallel export processes (default: one per table, up to CPU count)')
     
     args = parser.parse_args()
     
@@ -239,7 +343,7 @@ def main():
             output_dir = Path(args.output) / f"full_export_{timestamp}"
         
         try:
-            manifest = export_all_tables(output_dir, limit)
+            manifest = export_all_tables(output_dir, limit, max_workers=args.workers)
             
             if not limit:  # Full export
                 print(f"\n🎉 Full database exported successfully!")
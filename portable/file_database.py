@@ -5,11 +5,88 @@ Replaces SQLAlchemy/PostgreSQL with Pandas/Parquet for portable deployment.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from pathlib import Path
 import json
 from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Mapping
+import threading
 import os
 
+def _float_or_none(val):
+    return None if val != val else float(val)
+
+# Converters for the scalar types found in loaded tables, picked with one dict lookup
+# on type(val) instead of a chain of isna/isinstance checks per value
+_JSON_CONVERTERS = {
+    str: lambda val: val,
+    type(None): lambda val: None,
+    bool: bool,
+    np.bool_: bool,
+    int: int,
+    float: _float_or_none,
+    np.float64: _float_or_none,
+    np.float32: _float_or_none,
+    **{t: int for t in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64)},
+}
+
+def safe_value(val):
+    """Convert NaN/NA to None and NumPy scalars to Python scalars for JSON serialization"""
+    converter = _JSON_CONVERTERS.get(type(val))
+    if converter is not None:
+        return converter(val)
+    if pd.isna(val):
+        return None
+    return val
+
+class LazyTables(Mapping):
+    """
+    Table name -> DataFrame. Tables preloaded at startup are returned directly;
+    the rest are read from Parquet on first access (thread-safe) and kept.
+    """
+    
+    def __init__(self, loader, table_names: List[str]):
+        self._loader = loader
+        self._names = list(table_names)
+        self._frames = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, table_name: str) -> pd.DataFrame:
+        if table_name not in self._frames:
+            if table_name not in self._names:
+                raise KeyError(table_name)
+            with self._lock:
+                if table_name not in self._frames:
+                    try:
+                        self._frames[table_name] = self._loader(table_name)
+                    except KeyError:
+                        # Unreadable file: stop advertising the table
+                        self._names.remove(table_name)
+                        raise
+        return self._frames[table_name]
+    
+    def __setitem__(self, table_name: str, df: pd.DataFrame):
+        if table_name not in self._names:
+            self._names.append(table_name)
+        self._frames[table_name] = df
+    
+    def __contains__(self, table_name) -> bool:
+        # Membership must not trigger a load
+        return table_name in self._names
+    
+    def __iter__(self):
+        return iter(self._names)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def is_loaded(self, table_name: str) -> bool:
+        return table_name in self._frames
+
 class FileBasedDatabase:
     """
     Drop-in replacement for the database layer using Parquet files.
@@ -22,6 +99,17 @@ class FileBasedDatabase:
         self.manifest = None
         self._load_manifest()
         self._load_tables()
+        self._build_lookup_indexes()
+        self._build_area_averages()
+        self._build_best_images()
+        self._build_search_blob()
+        
+        # Data is immutable after load, so search results can be cached per instance
+        # (a new instance - e.g. after a fresh export - starts with an empty cache)
+        self._cached_search = lru_cache(maxsize=self.SEARCH_CACHE_SIZE)(self._search_impl)
+    
+    # Distinct (filters, sort, page) combinations kept in the search result cache
+    SEARCH_CACHE_SIZE = 256
     
     def _load_manifest(self):
         """Load export manifest to understand data structure"""
@@ -36,67 +124,340 @@ class FileBasedDatabase:
         with open(latest_manifest) as f:
             self.manifest = json.load(f)
         
+        # Row counts recorded at export time - O(1) lookups for stats pages
+        self.row_counts = {t['table']: t['rows'] for t in self.manifest['tables']}
+        
         print(f"📁 Loading data from: {self.export_dir}")
         print(f"📊 Export date: {self.manifest['export_date']}")
         print(f"📋 Tables: {len(self.manifest['tables'])}")
     
+    # Threads used to read and convert Parquet files at startup
+    LOAD_MAX_WORKERS = 8
+    
+    def _load_table(self, table_name: str):
+        """Load one Parquet file; returns (table_name, DataFrame or None, status line)"""
+        file_path = self.export_dir / f"{table_name}.parquet"
+        if not file_path.exists():
+            return table_name, None, f"   ⚠️  Missing: {file_path}"
+        
+        try:
+            # Memory-map the file (no read-buffer copy) and release Arrow
+            # buffers column by column while converting to pandas
+            arrow_table = self._cast_legacy_timestamps(pq.read_table(
+                file_path, memory_map=True,
+                read_dictionary=self._category_columns(table_name, file_path)
+            ))
+            df = arrow_table.to_pandas(split_blocks=True, self_destruct=True)
+            del arrow_table
+            df = self._downcast_numerics(df)
+            return table_name, df, f"   ✅ {table_name}: {len(df):,} rows"
+        except Exception as e:
+            return table_name, None, f"   ❌ Error loading {table_name}: {e}"
+    
+    # Tables the search/listing endpoints read - loaded at startup. The others
+    # (registrations, roads, price history, ...) load on first use
+    HOT_TABLES = {'properties_new', 'municipalities', 'main_buildings', 'cases', 'case_images'}
+    
+    def _load_cold_table(self, table_name: str) -> pd.DataFrame:
+        """LazyTables loader for tables deferred at startup"""
+        _, df, message = self._load_table(table_name)
+        print(message)
+        if df is None:
+            raise KeyError(f"Table '{table_name}' could not be loaded")
+        return df
+    
     def _load_tables(self):
-        """Load all Parquet files into memory as DataFrames"""
+        """Load the hot Parquet files into memory as DataFrames; defer the rest"""
         print("🔄 Loading tables into memory...")
         
+        table_names = []
         for table_info in self.manifest['tables']:
-            table_name = table_info['table']
-            file_path = self.export_dir / f"{table_name}.parquet"
-            
+            file_path = self.export_dir / f"{table_info['table']}.parquet"
             if file_path.exists():
-                try:
-                    df = pd.read_parquet(file_path)
-                    self.tables[table_name] = df
-                    print(f"   ✅ {table_name}: {len(df):,} rows")
-                except Exception as e:
-                    print(f"   ❌ Error loading {table_name}: {e}")
+                table_names.append(table_info['table'])
             else:
                 print(f"   ⚠️  Missing: {file_path}")
         
-        print(f"✅ Loaded {len(self.tables)} tables")
+        hot_tables = [name for name in table_names if name in self.HOT_TABLES]
+        
+        # Parquet decoding releases the GIL, so tables load in parallel threads;
+        # results are reported in manifest order
+        max_workers = max(1, min(self.LOAD_MAX_WORKERS, len(hot_tables)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = list(executor.map(self._load_table, hot_tables))
+        
+        # Hot tables that failed to load are dropped; the rest load on first use
+        for table_name, df, message in loaded:
+            if df is None:
+                table_names.remove(table_name)
+            print(message)
+        self.tables = LazyTables(self._load_cold_table, table_names)
+        for table_name, df, _ in loaded:
+            if df is not None:
+                self.tables[table_name] = df
+        
+        deferred = [name for name in table_names if not self.tables.is_loaded(name)]
+        print(f"✅ Loaded {len(table_names) - len(deferred)} tables ({len(deferred)} more on first use)")
+        
+        # Latest case per property (most recent by created_date), computed once
+        self.latest_cases = None
+        if 'cases' in self.tables:
+            cases = self.tables['cases'][self.JOIN_CASE_COLUMNS]
+            self.latest_cases = cases.sort_values('created_date').groupby('property_id').last()
+        
+        # The data is read-only, so join properties with their related tables once
+        # here instead of on every search/lookup request
+        self.properties_full = None
+        if 'properties_new' in self.tables:
+            self.properties_full = self._join_property_data(self.tables['properties_new'])
+            
+            # Price per sqm is both a sort key and an output field - derive it once
+            full = self.properties_full
+            price_column = 'current_price_case' if 'current_price_case' in full.columns else 'latest_valuation'
+            with np.errstate(divide='ignore', invalid='ignore'):
+                full['price_per_sqm'] = np.divide(
+                    full[price_column].to_numpy(dtype=float), full['living_area'].to_numpy(dtype=float)
+                )
+            print(f"✅ Joined property data: {len(self.properties_full):,} rows")
+    
+    # Low-cardinality string columns (municipality, city, status, energy label, ...)
+    # loaded as categoricals: far less memory, and equality filters compare integer
+    # codes. The export writes them dictionary-encoded, so Arrow hands pandas the
+    # codes directly instead of every column being scanned at startup
+    CATEGORY_COLUMNS = {
+        'properties_new': ['address_type', 'road_name', 'house_number', 'city_name',
+                           'place_name', 'coordinate_type', 'energy_label'],
+        'municipalities': ['name', 'slug'],
+        'provinces': ['name', 'province_code', 'slug'],
+        'cities': ['name', 'slug'],
+        'zip_codes': ['name', 'slug'],
+        'roads': ['name', 'slug'],
+        'places': ['name', 'slug', 'coordinate_type'],
+        'main_buildings': ['building_name', 'building_number', 'bathroom_condition', 'kitchen_condition',
+                           'toilet_condition', 'external_wall_material', 'supplementary_external_wall_material',
+                           'roofing_material', 'supplementary_roofing_material', 'heating_installation',
+                           'supplementary_heating', 'asbestos_containing_material'],
+        'additional_buildings': ['building_name', 'building_number', 'external_wall_material',
+                                 'supplementary_external_wall_material', 'roofing_material',
+                                 'supplementary_roofing_material', 'heating_installation'],
+        'registrations': ['type'],
+        'cases': ['status', 'distinction'],
+    }
+    
+    def _category_columns(self, table_name: str, file_path: Path) -> List[str]:
+        """CATEGORY_COLUMNS of table_name that this file stores as strings"""
+        schema = pq.read_schema(file_path)
+        return [
+            name for name in self.CATEGORY_COLUMNS.get(table_name, [])
+            if name in schema.names and pa.types.is_string(schema.field(name).type)
+        ]
+    
+    def _downcast_numerics(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shrink numeric columns to the narrowest dtype that holds them exactly:
+        integers to int8/16/32, floats to float32 only when every value round-trips
+        (rooms, years, most prices), so results and JSON output are unchanged.
+        """
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_bool_dtype(series.dtype):
+                continue
+            if pd.api.types.is_integer_dtype(series.dtype):
+                df[column] = pd.to_numeric(series, downcast='integer')
+            elif pd.api.types.is_float_dtype(series.dtype) and series.dtype != np.float32:
+                values = series.to_numpy()
+                narrowed = values.astype(np.float32)
+                if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                    df[column] = narrowed
+        return df
+    
+    @staticmethod
+    def _is_timestamp_column(name: str) -> bool:
+        return name == 'date' or name.endswith('_date') or name.endswith('_at')
+    
+    def _cast_legacy_timestamps(self, arrow_table: pa.Table) -> pa.Table:
+        """
+        Older exports stored datetimes as ISO-8601 strings (or untyped all-NULL
+        columns); cast those to native timestamps so every export loads with
+        datetime64 dtypes.
+        """
+        for i, field in enumerate(arrow_table.schema):
+            if (pa.types.is_string(field.type) or pa.types.is_null(field.type)) and self._is_timestamp_column(field.name):
+                try:
+                    column = pc.cast(arrow_table.column(i), pa.timestamp('us'))
+                except pa.ArrowInvalid:
+                    continue  # Not ISO timestamps - keep the strings
+                arrow_table = arrow_table.set_column(i, field.name, column)
+        return arrow_table
+    
+    # Separates fields in the search blob so a query cannot match across two fields
+    SEARCH_BLOB_SEPARATOR = '\x1f'
+    
+    def _build_search_blob(self):
+        """
+        Build one lowercased "road | city | municipality | zip" string per row of
+        properties_full, so text_search runs a single vectorized substring match
+        instead of lowercasing four columns per query.
+        """
+        self.search_blob = None
+        if self.properties_full is None:
+            return
+        
+        properties = self.properties_full
+        parts = []
+        for column in ('road_name', 'city_name', 'name_muni', 'zip_code'):
+            if column in properties.columns:
+                parts.append(properties[column].astype(object).fillna('').astype(str).str.lower())
+        
+        if parts:
+            blob = parts[0]
+            for part in parts[1:]:
+                blob = blob + self.SEARCH_BLOB_SEPARATOR + part
+            self.search_blob = blob
+            self._build_trigram_index()
+    
+    def _build_trigram_index(self):
+        """
+        Map every trigram of the distinct search blobs to the sorted ids of the blobs
+        containing it (the pg_trgm idea). Many properties share a road/city blob, so
+        the index is built over distinct blobs and mapped back to rows via blob codes.
+        """
+        codes, uniques = pd.factorize(self.search_blob)
+        postings = {}
+        for blob_id, blob in enumerate(uniques):
+            for trigram in {blob[i:i + 3] for i in range(len(blob) - 2)}:
+                postings.setdefault(trigram, []).append(blob_id)
+        
+        self.search_blob_codes = codes
+        self.search_blob_uniques = pa.array(list(uniques), type=pa.string())
+        self.trigram_index = {
+            trigram: np.array(blob_ids, dtype=np.int32) for trigram, blob_ids in postings.items()
+        }
+    
+    def _trigram_candidates(self, terms: List[str]) -> Optional[np.ndarray]:
+        """Distinct-blob ids that contain every trigram of the terms (None = terms too short)"""
+        trigrams = {term[i:i + 3] for term in terms for i in range(len(term) - 2)}
+        if not trigrams:
+            return None
+        
+        # Intersect the rarest posting lists first to keep intermediate sets small
+        postings = [self.trigram_index.get(trigram) for trigram in trigrams]
+        if any(p is None for p in postings):
+            return np.array([], dtype=np.int32)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for p in postings[1:]:
+            candidates = np.intersect1d(candidates, p, assume_unique=True)
+            if len(candidates) == 0:
+                break
+        return candidates
+    
+    # (table, column) pairs looked up by a single value on request paths
+    LOOKUP_COLUMNS = [
+        ('properties_new', 'id'),
+        ('registrations', 'property_id'),
+        ('cases', 'property_id'),
+        ('case_images', 'case_id'),
+    ]
+    
+    def _build_lookup_indexes(self):
+        """
+        Hash indexes (value -> row positions) for the ID lookups used by the property
+        detail and image endpoints, so each lookup is a dict hit plus iloc instead of a
+        full-column comparison.
+        """
+        self.lookup_indexes = {}
+        for table_name, column in self.LOOKUP_COLUMNS:
+            # Indexes on deferred tables are built by _lookup on first use
+            if self.tables.is_loaded(table_name):
+                self.lookup_indexes[(table_name, column)] = self._build_index(self.tables[table_name][column])
+        if self.properties_full is not None:
+            self.properties_full_index = self._build_index(self.properties_full['id'])
+            self.municipality_partitions = self._build_index(self.properties_full['name_muni'])
+    
+    @staticmethod
+    def _build_index(values: pd.Series):
+        """
+        Index a column as (distinct values, row positions grouped by value, group
+        offsets): one factorize + argsort rather than one array per distinct value.
+        """
+        codes, uniques = pd.factorize(values)
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        offsets = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+        return pd.Index(uniques), order, offsets
+    
+    @staticmethod
+    def _index_positions(index, value) -> np.ndarray:
+        """Row positions holding value (ascending), or an empty array"""
+        uniques, order, offsets = index
+        code = uniques.get_indexer([value])[0]
+        if code < 0:
+            return order[:0]
+        return order[offsets[code]:offsets[code + 1]]
+    
+    def _lookup(self, table_name: str, column: str, value) -> pd.DataFrame:
+        """Rows of table_name where column == value, via the prebuilt hash index"""
+        key = (table_name, column)
+        if key not in self.lookup_indexes:
+            self.lookup_indexes[key] = self._build_index(self.tables[table_name][column])
+        positions = self._index_positions(self.lookup_indexes[key], value)
+        return self.tables[table_name].iloc[positions]
     
     def get_table(self, table_name: str) -> pd.DataFrame:
-        """Get a table as a pandas DataFrame"""
+        """Get a table as a pandas DataFrame
+        
+        Returns the loaded frame itself (no per-call copy); callers that need to
+        modify it must take their own .copy() first.
+        """
         if table_name not in self.tables:
             raise KeyError(f"Table '{table_name}' not found")
-        return self.tables[table_name].copy()
+        return self.tables[table_name]
+    
+    def table_columns(self, table_name: str) -> List[str]:
+        """Column names of a table, read from the Parquet schema if it is not loaded yet"""
+        if self.tables.is_loaded(table_name):
+            return list(self.tables[table_name].columns)
+        return pq.read_schema(self.export_dir / f"{table_name}.parquet").names
     
     def search_properties(self, filters: Dict[str, Any], sort_by: str = 'latest_valuation', 
                          page: int = 1, per_page: int = 50) -> Dict[str, Any]:
         """
         Search properties with filters - main function for webapp
-        Returns dict with properties, total count, and pagination info
+        Returns dict with properties, total count, and pagination info.
+        Results are cached; treat the returned dict as read-only.
         """
+        frozen_filters = tuple(sorted(filters.items()))
+        return self._cached_search(frozen_filters, sort_by, page, per_page)
+    
+    def _search_impl(self, frozen_filters: tuple, sort_by: str, page: int, per_page: int) -> Dict[str, Any]:
+        """Uncached search body behind search_properties"""
+        filters = dict(frozen_filters)
         
-        # Start with properties table
-        properties = self.get_table('properties_new')
-        
-        # Join with related tables for complete data
-        properties = self._join_property_data(properties)
+        # Municipality filters touch only that municipality's rows (in-memory partition)
+        properties = self.properties_full
+        municipality = filters.get('municipality')
+        if municipality and municipality != 'all':
+            properties = properties.iloc[self._index_positions(self.municipality_partitions, municipality)]
         
-        # Apply filters
+        # Filter the prejoined properties table
         properties = self._apply_filters(properties, filters)
         
         # Get total count before pagination
         total = len(properties)
         
-        # Apply sorting
-        properties = self._apply_sorting(properties, sort_by)
-        
-        # Apply pagination
+        # Sort only the key column, then gather just the requested page of rows
         start_idx = (page - 1) * per_page
         end_idx = start_idx + per_page
-        page_properties = properties.iloc[start_idx:end_idx]
+        order = self._sort_order(properties, sort_by)
+        page_properties = properties.iloc[order[start_idx:end_idx]]
         
-        # Calculate area average price per sqm if municipality filter applied
-        area_avg_price_per_sqm = self._calculate_area_average(
-            properties, filters.get('municipality')
-        )
+        # Calculate area average price per sqm if municipality filter applied; with no
+        # other filter active it is the precomputed per-municipality value
+        if set(filters) <= {'municipality'}:
+            area_avg_price_per_sqm = self.area_averages.get(municipality, {})
+        else:
+            area_avg_price_per_sqm = self._calculate_area_average(properties, municipality)
         
         # Format results
         results = self._format_properties(page_properties)
@@ -110,106 +471,124 @@ class FileBasedDatabase:
             'area_avg_price_per_sqm': area_avg_price_per_sqm
         }
     
+    # Related-table columns carried into the joined property data - only what the
+    # filters, sorting, text search and result formatting read
+    JOIN_MUNI_COLUMNS = ['property_id', 'name']
+    JOIN_BUILDING_COLUMNS = ['property_id', 'number_of_rooms', 'year_built']
+    JOIN_CASE_COLUMNS = ['property_id', 'created_date', 'current_price', 'days_on_market_current', 'status']
+    
     def _join_property_data(self, properties: pd.DataFrame) -> pd.DataFrame:
         """Join properties with related tables to get complete data"""
         
-        # Join with municipalities
+        # Join with municipalities (index join on property_id)
         if 'municipalities' in self.tables:
-            municipalities = self.get_table('municipalities')
-            properties = properties.merge(
-                municipalities.add_suffix('_muni'), 
-                left_on='id', right_on='property_id_muni', 
-                how='left'
-            )
+            municipalities = self.tables['municipalities'][self.JOIN_MUNI_COLUMNS].set_index('property_id')
+            properties = properties.join(municipalities.add_suffix('_muni'), on='id')
         
-        # Join with main buildings
+        # Join with main buildings (index join on property_id)
         if 'main_buildings' in self.tables:
-            buildings = self.get_table('main_buildings')
-            properties = properties.merge(
-                buildings.add_suffix('_building'), 
-                left_on='id', right_on='property_id_building',
-                how='left'
-            )
+            buildings = self.tables['main_buildings'][self.JOIN_BUILDING_COLUMNS].set_index('property_id')
+            properties = properties.join(buildings.add_suffix('_building'), on='id')
         
-        # Join with cases for price information
-        if 'cases' in self.tables:
-            cases = self.get_table('cases')
-            # Get latest case per property (most recent by created_date)
-            latest_cases = cases.sort_values('created_date').groupby('property_id').last().reset_index()
-            properties = properties.merge(
-                latest_cases.add_suffix('_case'),
-                left_on='id', right_on='property_id_case',
-                how='left'
-            )
+        # Join with the precomputed latest case per property for price information
+        if self.latest_cases is not None:
+            properties = properties.join(self.latest_cases.add_suffix('_case'), on='id')
         
         return properties
     
     def _apply_filters(self, df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
-        """Apply search filters to the dataframe"""
+        """Apply search filters to the dataframe
+        
+        All conditions are AND-ed in place into one NumPy boolean mask, so the wide
+        joined frame is only copied once, instead of once per active filter.
+        """
         
         # Determine price column
         price_column = 'current_price_case' if 'current_price_case' in df.columns else 'latest_valuation'
         
         # ALWAYS filter out properties with no price (N/A)
-        df = df[df[price_column].notna()]
+        mask = df[price_column].notna().to_numpy(copy=True)
         
         # Municipality filter
         if filters.get('municipality') and filters['municipality'] != 'all':
-            df = df[df['name_muni'] == filters['municipality']]
+            mask &= (df['name_muni'] == filters['municipality']).to_numpy()
         
         # Price filters (use case price if available, otherwise latest_valuation)
         if filters.get('min_price'):
-            df = df[df[price_column] >= filters['min_price']]
+            mask &= (df[price_column] >= filters['min_price']).to_numpy()
         if filters.get('max_price'):
-            df = df[df[price_column] <= filters['max_price']]
+            mask &= (df[price_column] <= filters['max_price']).to_numpy()
         
         # Area filters
         if filters.get('min_area'):
-            df = df[df['living_area'] >= filters['min_area']]
+            mask &= (df['living_area'] >= filters['min_area']).to_numpy()
         if filters.get('max_area'):
-            df = df[df['living_area'] <= filters['max_area']]
+            mask &= (df['living_area'] <= filters['max_area']).to_numpy()
         
         # Room filters (from buildings table)
         if filters.get('min_rooms'):
-            df = df[df['number_of_rooms_building'] >= filters['min_rooms']]
+            mask &= (df['number_of_rooms_building'] >= filters['min_rooms']).to_numpy()
         if filters.get('max_rooms'):
-            df = df[df['number_of_rooms_building'] <= filters['max_rooms']]
+            mask &= (df['number_of_rooms_building'] <= filters['max_rooms']).to_numpy()
         
         # Year built filters
         if filters.get('min_year'):
-            df = df[df['year_built_building'] >= filters['min_year']]
+            mask &= (df['year_built_building'] >= filters['min_year']).to_numpy()
         if filters.get('max_year'):
-            df = df[df['year_built_building'] <= filters['max_year']]
+            mask &= (df['year_built_building'] <= filters['max_year']).to_numpy()
         
         # On market filter
         if filters.get('on_market') is not None:
             on_market_bool = filters['on_market'].lower() == 'true' if isinstance(filters['on_market'], str) else filters['on_market']
-            df = df[df['is_on_market'] == on_market_bool]
+            mask &= (df['is_on_market'] == on_market_bool).to_numpy()
         
-        return df
+        return df[mask]
     
-    def _apply_sorting(self, df: pd.DataFrame, sort_by: str) -> pd.DataFrame:
-        """Apply sorting to the dataframe"""
+    def _sort_order(self, df: pd.DataFrame, sort_by: str) -> np.ndarray:
+        """Row positions of df in the requested sort order (sorts the key column only)"""
         
         # Determine price column
         price_column = 'current_price_case' if 'current_price_case' in df.columns else 'latest_valuation'
         
         if sort_by == 'price_asc':
-            df = df.sort_values(price_column, ascending=True, na_position='last')
+            key, ascending = df[price_column], True
         elif sort_by == 'price_desc':
-            df = df.sort_values(price_column, ascending=False, na_position='last')
+            key, ascending = df[price_column], False
         elif sort_by == 'size_desc':
-            df = df.sort_values('living_area', ascending=False, na_position='last')
+            key, ascending = df['living_area'], False
         elif sort_by == 'year_desc':
-            df = df.sort_values('year_built_building', ascending=False, na_position='last')
+            key, ascending = df['year_built_building'], False
         elif sort_by == 'price_per_sqm_asc':
-            # Calculate price per sqm
-            df['price_per_sqm'] = df[price_column] / df['living_area']
-            df = df.sort_values('price_per_sqm', ascending=True, na_position='last')
+            key, ascending = df['price_per_sqm'], True
         else:  # default to price_desc
-            df = df.sort_values(price_column, ascending=False, na_position='last')
+            key, ascending = df[price_column], False
         
-        return df
+        key = key.reset_index(drop=True)
+        return key.sort_values(ascending=ascending, na_position='last').index.to_numpy()
+    
+    def _build_area_averages(self):
+        """Average on-market price per sqm for every municipality, computed once
+        
+        One filter and one groupby over properties_full (the search result cache
+        already absorbs repeated municipality-only searches).
+        """
+        self.area_averages = {}
+        if self.properties_full is None:
+            return
+        
+        df = self.properties_full
+        price_column = 'current_price_case' if 'current_price_case' in df.columns else 'latest_valuation'
+        mask = (
+            (df['is_on_market'] == True) &
+            (df[price_column].notna()) &
+            (df['living_area'].notna()) &
+            (df['living_area'] > 0)
+        )
+        averages = df.loc[mask].groupby('name_muni', observed=True)['price_per_sqm'].mean().round(2)
+        self.area_averages = {
+            municipality: {municipality: avg}
+            for municipality, avg in averages.items() if municipality != 'all'
+        }
     
     def _calculate_area_average(self, df: pd.DataFrame, municipality: str) -> Dict[str, float]:
         """Calculate average price per sqm for a municipality"""
@@ -219,79 +598,111 @@ class FileBasedDatabase:
             # Filter for on-market properties in the municipality
             price_column = 'current_price_case' if 'current_price_case' in df.columns else 'latest_valuation'
             
-            filtered = df[
+            mask = (
                 (df['name_muni'] == municipality) &
                 (df['is_on_market'] == True) &
                 (df[price_column].notna()) &
                 (df['living_area'].notna()) &
                 (df['living_area'] > 0)
-            ]
+            )
             
-            if len(filtered) > 0:
-                avg_price_per_sqm = (filtered[price_column] / filtered['living_area']).mean()
+            if mask.any():
+                avg_price_per_sqm = df.loc[mask, 'price_per_sqm'].mean()
                 area_avg[municipality] = round(avg_price_per_sqm, 2)
         
         return area_avg
     
     def _format_properties(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Format property data for JSON response"""
-        import numpy as np
-        results = []
+        """Format property data for JSON response
+        
+        Builds the output column by column and converts NaN to None once for the
+        whole frame, instead of boxing every row with iterrows().
+        """
+        if df.empty:
+            return []
         
         # Determine price column
         price_column = 'current_price_case' if 'current_price_case' in df.columns else 'latest_valuation'
         
-        for _, row in df.iterrows():
-            # Calculate price per sqm
-            price_per_sqm = None
-            if pd.notna(row[price_column]) and pd.notna(row['living_area']) and row['living_area'] > 0:
-                price_per_sqm = round(row[price_column] / row['living_area'], 2)
-            
-            # Helper function to convert NaN to None for JSON serialization
-            def safe_value(val):
-                if pd.isna(val) or (isinstance(val, float) and np.isnan(val)):
-                    return None
-                if isinstance(val, (np.integer, np.floating)):
-                    return float(val) if isinstance(val, np.floating) else int(val)
-                if isinstance(val, (np.bool_, bool)):
-                    return bool(val)
-                return val
-            
-            # Format property data
-            prop_id = safe_value(row.get('id'))
-            prop_data = {
-                'id': prop_id,
-                'address': f"{safe_value(row.get('road_name', '')) or ''} {safe_value(row.get('house_number', '')) or ''}".strip(),
-                'city': safe_value(row.get('city_name')) or 'N/A',
-                'zip_code': safe_value(row.get('zip_code')) or 'N/A',
-                'municipality': safe_value(row.get('name_muni')) or 'N/A',
-                'price': safe_value(row.get(price_column)),
-                'living_area': safe_value(row.get('living_area')),
-                'price_per_sqm': price_per_sqm,
-                'rooms': safe_value(row.get('number_of_rooms_building')),
-                'year_built': safe_value(row.get('year_built_building')),
-                'energy_label': safe_value(row.get('energy_label')),
-                'is_on_market': safe_value(row.get('is_on_market', False)),
-                'latitude': safe_value(row.get('latitude')),
-                'longitude': safe_value(row.get('longitude')),
-                'days_on_market': safe_value(row.get('days_on_market_current_case')),
-                'realtor_names': [],  # Simplified for now
-                'image_url': None  # Will be populated with first image if available
-            }
-            
-            # Get first image for this property
-            if prop_id:
-                images = self.get_property_images(prop_id)
-                if images:
-                    # Get the image with the best resolution (largest)
-                    best_image = max(images, key=lambda x: x['width'] * x['height']) if images else None
-                    if best_image:
-                        prop_data['image_url'] = best_image['url']
-            
-            results.append(prop_data)
+        def column(name):
+            if name in df.columns:
+                return df[name].astype(object)
+            return pd.Series(None, index=df.index, dtype=object)
+        
+        def text(name):
+            return column(name).fillna('').astype(str)
+        
+        def or_na(values):
+            # Mirrors `value or 'N/A'` for missing, empty and zero values
+            return values.where(values.notna() & (values != '') & (values != 0), 'N/A')
+        
+        # Calculate price per sqm
+        price = df[price_column].astype(float)
+        living_area = df['living_area'].astype(float)
+        price_per_sqm = df['price_per_sqm'] if 'price_per_sqm' in df.columns else price / living_area
+        price_per_sqm = price_per_sqm.where(price.notna() & living_area.notna() & (living_area > 0)).round(2)
+        
+        formatted = pd.DataFrame({
+            'id': column('id'),
+            'address': (text('road_name') + ' ' + text('house_number')).str.strip(),
+            'city': or_na(column('city_name')),
+            'zip_code': or_na(column('zip_code')),
+            'municipality': or_na(column('name_muni')),
+            'price': price,
+            'living_area': living_area,
+            'price_per_sqm': price_per_sqm,
+            'rooms': column('number_of_rooms_building'),
+            'year_built': column('year_built_building'),
+            'energy_label': column('energy_label'),
+            'is_on_market': df['is_on_market'].astype(object) if 'is_on_market' in df.columns else False,
+            'latitude': column('latitude'),
+            'longitude': column('longitude'),
+            'days_on_market': column('days_on_market_current_case'),
+        }, index=df.index)
+        
+        # Convert NaN to None for JSON serialization (object dtype keeps Python scalars)
+        formatted = formatted.astype(object)
+        formatted = formatted.where(formatted.notna(), None)
+        results = formatted.to_dict(orient='records')
+        
+        for prop_data in results:
+            prop_data['realtor_names'] = []  # Simplified for now
+            # Best resolution image of the property's case, if any
+            prop_data['image_url'] = self.best_image_urls.get(prop_data['id'])
         
         return results
     
+    def _build_best_images(self):
+        """
+        Largest image of each property's case (the one get_property_images reads),
+        resolved for the whole catalog with one sort instead of per result row.
+        """
+        self.best_image_urls = {}
+        if 'case_images' not in self.tables or 'cases' not in self.tables:
+            return
+        
+        first_cases = self.tables['cases'].drop_duplicates('property_id')
+        images = self.tables['case_images']
+        width = images['width'].fillna(0).astype(np.int64).to_numpy()
+        height = images['height'].fillna(0).astype(np.int64).to_numpy()
+        ranked = pd.DataFrame({
+            'case_id': images['case_id'].to_numpy(),
+            'url': images['image_url'].astype(object).to_numpy(),
+            'area': width * height,
+            'width': width,
+            'height': height,
+        })
+        
+        # Same pick as max(area) over the (width, height)-sorted image list: largest
+        # area, then smallest (width, height), then original order
+        ranked = ranked.sort_values(['case_id', 'area', 'width', 'height'],
+                                    ascending=[True, False, True, True], kind='stable')
+        best_by_case = ranked.drop_duplicates('case_id').set_index('case_id')['url']
+        urls = first_cases['id'].map(best_by_case)
+        self.best_image_urls = {
+            property_id: url for property_id, url in zip(first_cases['property_id'], urls) if pd.notna(url)
+        }
+    
     def get_municipalities(self) -> List[str]:
         """Get list of all municipalities for dropdown"""
         if 'municipalities' in self.tables:
@@ -301,14 +712,8 @@ class FileBasedDatabase:
     
     def get_property_by_id(self, property_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed property information by ID"""
-        properties = self.get_table('properties_new')
-        prop = properties[properties['id'] == property_id]
-        
-        if prop.empty:
-            return None
-        
-        # Join with related data
-        prop_with_data = self._join_property_data(prop)
+        positions = self._index_positions(self.properties_full_index, property_id)
+        prop_with_data = self.properties_full.iloc[positions]
         
         if prop_with_data.empty:
             return None
@@ -320,8 +725,7 @@ class FileBasedDatabase:
     def get_detailed_property_by_id(self, property_id: str) -> Optional[Dict[str, Any]]:
         """Get comprehensive detailed property information including all related data"""
         try:
-            properties = self.get_table('properties_new')
-            prop = properties[properties['id'] == property_id]
+            prop = self._lookup('properties_new', 'id', property_id)
             
             if prop.empty:
                 return None
@@ -330,15 +734,6 @@ class FileBasedDatabase:
             row = prop.iloc[0]
             price_column = 'current_price_case' if 'current_price_case' in prop.columns else 'latest_valuation'
             
-            def safe_value(val):
-                if pd.isna(val) or (isinstance(val, float) and np.isnan(val)):
-                    return None
-                if isinstance(val, (np.integer, np.floating)):
-                    return float(val) if isinstance(val, np.floating) else int(val)
-                if isinstance(val, (np.bool_, bool)):
-                    return bool(val)
-                return val
-            
             # Basic property info
             detailed_data = {
                 'id': safe_value(row.get('id')),
@@ -395,7 +790,7 @@ class FileBasedDatabase:
             registrations = []
             try:
                 if 'registrations' in self.tables:
-                    reg_data = self.tables['registrations'][self.tables['registrations']['property_id'] == safe_value(row.get('id'))]
+                    reg_data = self._lookup('registrations', 'property_id', safe_value(row.get('id')))
                     if not reg_data.empty:
                         # Sort by available date column (try multiple names)
                         date_col = None
@@ -406,21 +801,22 @@ class FileBasedDatabase:
                         
                         if date_col:
                             reg_data = reg_data.sort_values(date_col, ascending=False).head(10)
-                            for _, reg_row in reg_data.iterrows():
+                            # Plain dict records - no per-row Series construction
+                            for reg_row in reg_data.to_dict(orient='records'):
                                 amount_col = None
                                 for col in ['amount', 'price', 'value']:
-                                    if col in reg_row.index and pd.notna(reg_row.get(col)):
+                                    if col in reg_row and pd.notna(reg_row.get(col)):
                                         amount_col = col
                                         break
                                 
                                 type_col = None
                                 for col in ['type_transaction', 'transaction_type', 'type']:
-                                    if col in reg_row.index and pd.notna(reg_row.get(col)):
+                                    if col in reg_row and pd.notna(reg_row.get(col)):
                                         type_col = col
                                         break
                                 
                                 registrations.append({
-                                    'date': str(safe_value(reg_row.get(date_col)))[:10] if reg_row.get(date_col) else 'N/A',
+                                    'date': str(safe_value(reg_row.get(date_col)))[:10] if pd.notna(reg_row.get(date_col)) else 'N/A',
                                     'amount': safe_value(reg_row.get(amount_col)) if amount_col else None,
                                     'type': safe_value(reg_row.get(type_col)) if type_col else 'Transaction',
                                 })
@@ -448,13 +844,13 @@ class FileBasedDatabase:
             # Case/listing information
             try:
                 if 'cases' in self.tables:
-                    case_data = self.tables['cases'][self.tables['cases']['property_id'] == safe_value(row.get('id'))]
+                    case_data = self._lookup('cases', 'property_id', safe_value(row.get('id')))
                     if not case_data.empty:
                         # Get most recent case
                         case_data = case_data.sort_values('created_date', ascending=False)
                         c_row = case_data.iloc[0]
                         detailed_data['case_info'] = {
-                            'listing_date': str(safe_value(c_row.get('created_date')))[:10] if c_row.get('created_date') else 'N/A',
+                            'listing_date': str(safe_value(c_row.get('created_date')))[:10] if pd.notna(c_row.get('created_date')) else 'N/A',
                             'current_price': safe_value(c_row.get('current_price')),
                             'previous_price': safe_value(c_row.get('previous_price')),
                             'status': safe_value(c_row.get('status')),
@@ -484,8 +880,7 @@ class FileBasedDatabase:
                 return []
             
             # First, find the case_id for this property
-            cases = self.get_table('cases')
-            case = cases[cases['property_id'] == property_id]
+            case = self._lookup('cases', 'property_id', property_id)
             
             if case.empty:
                 return []
@@ -493,20 +888,18 @@ class FileBasedDatabase:
             case_id = case.iloc[0].get('id')
             
             # Get all images for this case
-            images = self.get_table('case_images')
-            property_images = images[images['case_id'] == case_id]
+            property_images = self._lookup('case_images', 'case_id', case_id)
             
             if property_images.empty:
                 return []
             
-            # Format images
-            result = []
-            for _, img_row in property_images.iterrows():
-                result.append({
-                    'url': img_row.get('image_url'),
-                    'width': int(img_row.get('width', 0)) if pd.notna(img_row.get('width')) else 0,
-                    'height': int(img_row.get('height', 0)) if pd.notna(img_row.get('height')) else 0,
-                })
+            # Format images straight from the column arrays (no per-row Series)
+            widths = property_images['width'].fillna(0).astype(np.int64).tolist()
+            heights = property_images['height'].fillna(0).astype(np.int64).tolist()
+            result = [
+                {'url': url, 'width': width, 'height': height}
+                for url, width, height in zip(property_images['image_url'].tolist(), widths, heights)
+            ]
             
             return sorted(result, key=lambda x: (x['width'], x['height']))
         except Exception as e:
@@ -516,42 +909,31 @@ class FileBasedDatabase:
     def text_search(self, query: str) -> pd.DataFrame:
         """
         Perform free-text search across address, city, municipality, and other relevant fields.
-        Uses vectorized pandas string operations for efficiency.
+        Uses the prebuilt search blob, trigram index and Arrow substring kernel.
         """
         if not query or len(query.strip()) < 2:
             return pd.DataFrame()
         
-        # Start with properties table
-        df = self.get_table('properties_new').copy()
-        
-        # Join with related tables for complete data
-        df = self._join_property_data(df)
-        
-        # Prepare search string - case insensitive
-        search_term = query.strip().lower()
-        
-        # Search across multiple columns - creates boolean masks efficiently
-        search_masks = []
-        
-        # Address components
-        if 'road_name' in df.columns:
-            search_masks.append(df['road_name'].fillna('').str.lower().str.contains(search_term, na=False))
-        if 'city_name' in df.columns:
-            search_masks.append(df['city_name'].fillna('').str.lower().str.contains(search_term, na=False))
-        if 'name_muni' in df.columns:
-            search_masks.append(df['name_muni'].fillna('').str.lower().str.contains(search_term, na=False))
-        if 'zip_code' in df.columns:
-            search_masks.append(df['zip_code'].fillna('').astype(str).str.lower().str.contains(search_term, na=False))
-        
-        # Combine masks with OR operation
-        if search_masks:
-            combined_mask = search_masks[0]
-            for mask in search_masks[1:]:
-                combined_mask = combined_mask | mask
-            df = df[combined_mask]
-        else:
+        if self.search_blob is None:
             return pd.DataFrame()
         
+        # Prepare search terms - case insensitive, matched literally (not as a regex);
+        # multi-word queries ("Roskilde 4000") match rows containing every word
+        search_terms = query.strip().lower().split()
+        
+        # Narrow to blobs containing every trigram of the terms, then confirm each exact
+        # substring on those candidates only; two-character terms check every distinct blob
+        candidates = self._trigram_candidates(search_terms)
+        if candidates is None:
+            candidates = np.arange(len(self.search_blob_uniques), dtype=np.int32)
+        candidate_blobs = self.search_blob_uniques.take(candidates)
+        matches = np.ones(len(candidates), dtype=bool)
+        for term in search_terms:
+            matches &= pc.match_substring(candidate_blobs, term).to_numpy(zero_copy_only=False)
+        matched = candidates[matches]
+        mask = np.isin(self.search_blob_codes, matched)
+        df = self.properties_full[mask]
+        
         # Filter out properties with no price (N/A)
         price_column = 'current_price_case' if 'current_price_case' in df.columns else 'latest_valuation'
         df = df[df[price_column].notna()]
@@ -5,13 +5,30 @@ Handles all API fields and nested structures
 
 import sys
 import os
+import io
+import glob
+import queue
+import time
 import json
+import re
 import requests
-from datetime import datetime
-from sqlalchemy import create_engine
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from itertools import islice
+from pathlib import Path
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # falls back to streaming with the stdlib parser
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -33,9 +50,23 @@ DB_PASSWORD = os.getenv('DB_PASSWORD')
 if not DB_PASSWORD:
     raise ValueError("DB_PASSWORD environment variable not set")
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
+DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# values_plus_batch: INSERTs use multi-row VALUES and other executemany
+# statements (UPDATE/DELETE) are sent in pages via psycopg2 execute_batch.
+# Large pages mean one statement for the server to parse per 1000 rows
+EXECUTEMANY_PAGE_SIZE = 1000
+engine = create_engine(
+    DATABASE_URL,
+    executemany_mode='values_plus_batch',
+    insertmanyvalues_page_size=EXECUTEMANY_PAGE_SIZE,
+    executemany_batch_page_size=EXECUTEMANY_PAGE_SIZE
+)
+# Imports only write (Core INSERTs, no ORM objects are read back), so skip the
+# flush-before-query and expire-everything-on-commit bookkeeping
+Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+DATE_FORMAT = "%Y-%m-%d"
 
 
 def parse_date(date_str):
@@ -43,9 +74,36 @@ def parse_date(date_str):
     if not date_str:
         return None
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d")
-    except:
+        # API dates are always YYYY-MM-DD: slicing skips strptime's format parsing
+        if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+            return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+        return datetime.strptime(date_str, DATE_FORMAT)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_iso_datetime(value):
+    """Parse an API ISO-8601 timestamp; a trailing 'Z' means UTC"""
+    if not value:
         return None
+    try:
+        # Python 3.11+ parses the 'Z' suffix itself, in C: no slicing or replace()
+        return datetime.fromisoformat(value)
+    except ValueError:
+        if not value.endswith('Z'):
+            raise
+        return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+
+
+def to_naive_utc(value):
+    """Aware datetime as naive UTC, for timestamp without time zone columns
+    
+    COPY drops the offset of an aware value while a bound parameter is
+    converted to the session TimeZone; naive UTC is stored the same by both.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 def safe_get(data, key, default=None):
@@ -53,309 +111,394 @@ def safe_get(data, key, default=None):
     return data.get(key, default) if data else default
 
 
-def import_property(api_data):
-    """Import a single property with all nested data"""
+def compile_field_extractor(field_paths, name):
+    """Generate a function data -> {column: value at key path}
     
-    # Main property
-    property_obj = Property(
-        id=safe_get(api_data, 'addressID'),
-        address_type=safe_get(api_data, 'addressType'),
-        road_name=safe_get(api_data, 'roadName'),
-        house_number=safe_get(api_data, 'houseNumber'),
-        city_name=safe_get(api_data, 'cityName'),
-        zip_code=safe_get(api_data, 'zipCode'),
-        place_name=safe_get(api_data, 'placeName'),
-        
-        # Coordinates
-        latitude=safe_get(safe_get(api_data, 'coordinates'), 'lat'),
-        longitude=safe_get(safe_get(api_data, 'coordinates'), 'lon'),
-        coordinate_type=safe_get(safe_get(api_data, 'coordinates'), 'type'),
-        
-        # Areas and valuation
-        living_area=safe_get(api_data, 'livingArea'),
-        weighted_area=safe_get(api_data, 'weightedArea'),
-        latest_valuation=safe_get(api_data, 'latestValuation'),
-        property_number=safe_get(api_data, 'propertyNumber'),
-        
-        # Status
-        is_on_market=safe_get(api_data, 'isOnMarket'),
-        is_public=safe_get(api_data, 'isPublic'),
-        allow_new_valuation_info=safe_get(api_data, 'allowNewValuationInfo'),
-        
-        # Energy
-        energy_label=safe_get(api_data, 'energyLabel'),
-        
-        # IDs
-        entry_address_id=safe_get(api_data, 'entryAddressID'),
-        gstkvhx=safe_get(api_data, 'gstkvhx'),
-        
-        # Slugs
-        slug=safe_get(api_data, 'slug'),
-        slug_address=safe_get(api_data, 'slugAddress'),
-        api_href=safe_get(safe_get(safe_get(api_data, '_links'), 'self'), 'href'),
-        
-        # Arrays
-        bfe_numbers=safe_get(api_data, 'bfeNumbers'),
-        
-        # Latest sold case
-        latest_sold_case_title=safe_get(safe_get(api_data, 'latestSoldCaseDescription'), 'title'),
-        latest_sold_case_body=safe_get(safe_get(api_data, 'latestSoldCaseDescription'), 'body'),
-        latest_sold_case_date=parse_date(safe_get(safe_get(api_data, 'latestSoldCaseDescription'), 'date')),
-        
-        # Boligsiden info
-        boligsiden_latest_sold_area=safe_get(safe_get(api_data, 'boligsidenInfo'), 'latestSoldArea')
+    Emits straight-line code: each nested dict is fetched once into a local and
+    every column is a single .get(), instead of a chain of safe_get calls per
+    column. Missing or empty levels give None, as safe_get does.
+    """
+    lines = [f"def {name}(data):", "    data = data or {}"]
+    parents = {(): 'data'}
+    for path in field_paths.values():
+        for depth in range(1, len(path)):
+            prefix = path[:depth]
+            if prefix not in parents:
+                parents[prefix] = f"level_{len(parents)}"
+                lines.append(f"    {parents[prefix]} = {parents[prefix[:-1]]}.get({prefix[-1]!r}) or {{}}")
+    columns = ", ".join(
+        f"{column!r}: {parents[path[:-1]]}.get({path[-1]!r})" for column, path in field_paths.items()
     )
+    lines.append(f"    return {{{columns}}}")
+    
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace[name]
+
+
+# properties_new column -> key path in the address payload
+PROPERTY_FIELD_PATHS = {
+    'id': ('addressID',),
+    'address_type': ('addressType',),
+    'road_name': ('roadName',),
+    'house_number': ('houseNumber',),
+    'city_name': ('cityName',),
+    'zip_code': ('zipCode',),
+    'place_name': ('placeName',),
+    
+    # Coordinates
+    'latitude': ('coordinates', 'lat'),
+    'longitude': ('coordinates', 'lon'),
+    'coordinate_type': ('coordinates', 'type'),
+    
+    # Areas and valuation
+    'living_area': ('livingArea',),
+    'weighted_area': ('weightedArea',),
+    'latest_valuation': ('latestValuation',),
+    'property_number': ('propertyNumber',),
+    
+    # Status
+    'is_on_market': ('isOnMarket',),
+    'is_public': ('isPublic',),
+    'allow_new_valuation_info': ('allowNewValuationInfo',),
     
-    # Full address construction
-    address_parts = [property_obj.road_name, property_obj.house_number]
-    if property_obj.city_name and property_obj.zip_code:
-        address_parts.append(f"{property_obj.zip_code} {property_obj.city_name}")
-    property_obj.address = " ".join([p for p in address_parts if p])
+    # Energy
+    'energy_label': ('energyLabel',),
     
-    return property_obj
+    # IDs
+    'entry_address_id': ('entryAddressID',),
+    'gstkvhx': ('gstkvhx',),
+    
+    # Slugs
+    'slug': ('slug',),
+    'slug_address': ('slugAddress',),
+    'api_href': ('_links', 'self', 'href'),
+    
+    # Arrays
+    'bfe_numbers': ('bfeNumbers',),
+    
+    # Latest sold case
+    'latest_sold_case_title': ('latestSoldCaseDescription', 'title'),
+    'latest_sold_case_body': ('latestSoldCaseDescription', 'body'),
+    'latest_sold_case_date': ('latestSoldCaseDescription', 'date'),
+    
+    # Boligsiden info
+    'boligsiden_latest_sold_area': ('boligsidenInfo', 'latestSoldArea'),
+}
+extract_property_fields = compile_field_extractor(PROPERTY_FIELD_PATHS, 'extract_property_fields')
 
 
-def import_main_building(property_id, buildings_data):
-    """Import main building (first building in array)"""
+def property_row(api_data):
+    """Column dict for a property (the properties_new row)"""
+    
+    # Main property
+    row = extract_property_fields(api_data)
+    row['latest_sold_case_date'] = parse_date(row['latest_sold_case_date'])
+    
+    # The full address is a generated column (Property.address) built by the database
+    return row
+
+
+def import_property(api_data):
+    """Import a single property with all nested data"""
+    return Property(**property_row(api_data))
+
+
+def main_building_row(property_id, buildings_data):
+    """Column dict for the main building (first building in array)"""
     if not buildings_data or len(buildings_data) == 0:
         return None
     
     # First building is always the main building
-    bldg = buildings_data[0]
+    bldg = buildings_data[0] or {}
     
-    main_building = MainBuilding(
+    return dict(
         property_id=property_id,
-        building_name=safe_get(bldg, 'buildingName'),
-        building_number=safe_get(bldg, 'buildingNumber'),
+        building_name=bldg.get('buildingName'),
+        building_number=bldg.get('buildingNumber'),
         
         # Areas
-        housing_area=safe_get(bldg, 'housingArea'),
-        total_area=safe_get(bldg, 'totalArea'),
-        basement_area=safe_get(bldg, 'basementArea'),
-        business_area=safe_get(bldg, 'businessArea'),
-        other_area=safe_get(bldg, 'otherArea'),
+        housing_area=bldg.get('housingArea'),
+        total_area=bldg.get('totalArea'),
+        basement_area=bldg.get('basementArea'),
+        business_area=bldg.get('businessArea'),
+        other_area=bldg.get('otherArea'),
         
         # Rooms (only main building has these)
-        number_of_rooms=safe_get(bldg, 'numberOfRooms'),
-        number_of_floors=safe_get(bldg, 'numberOfFloors'),
-        number_of_bathrooms=safe_get(bldg, 'numberOfBathrooms'),
-        number_of_kitchens=safe_get(bldg, 'numberOfKitchens'),
-        number_of_toilets=safe_get(bldg, 'numberOfToilets'),
+        number_of_rooms=bldg.get('numberOfRooms'),
+        number_of_floors=bldg.get('numberOfFloors'),
+        number_of_bathrooms=bldg.get('numberOfBathrooms'),
+        number_of_kitchens=bldg.get('numberOfKitchens'),
+        number_of_toilets=bldg.get('numberOfToilets'),
         
         # Conditions (only main building has these)
-        bathroom_condition=safe_get(bldg, 'bathroomCondition'),
-        kitchen_condition=safe_get(bldg, 'kitchenCondition'),
-        toilet_condition=safe_get(bldg, 'toiletCondition'),
+        bathroom_condition=bldg.get('bathroomCondition'),
+        kitchen_condition=bldg.get('kitchenCondition'),
+        toilet_condition=bldg.get('toiletCondition'),
         
         # Materials
-        external_wall_material=safe_get(bldg, 'externalWallMaterial'),
-        supplementary_external_wall_material=safe_get(bldg, 'supplementaryExternalWallMaterial'),
-        roofing_material=safe_get(bldg, 'roofingMaterial'),
-        supplementary_roofing_material=safe_get(bldg, 'supplementaryRoofingMaterial'),
+        external_wall_material=bldg.get('externalWallMaterial'),
+        supplementary_external_wall_material=bldg.get('supplementaryExternalWallMaterial'),
+        roofing_material=bldg.get('roofingMaterial'),
+        supplementary_roofing_material=bldg.get('supplementaryRoofingMaterial'),
         
         # Heating
-        heating_installation=safe_get(bldg, 'heatingInstallation'),
-        supplementary_heating=safe_get(bldg, 'supplementaryHeating'),
+        heating_installation=bldg.get('heatingInstallation'),
+        supplementary_heating=bldg.get('supplementaryHeating'),
         
         # Years
-        year_built=safe_get(bldg, 'yearBuilt'),
-        year_renovated=safe_get(bldg, 'yearRenovated'),
+        year_built=bldg.get('yearBuilt'),
+        year_renovated=bldg.get('yearRenovated'),
         
         # Asbestos
-        asbestos_containing_material=safe_get(bldg, 'asbestosContainingMaterial')
+        asbestos_containing_material=bldg.get('asbestosContainingMaterial')
     )
-    
-    return main_building
 
 
-def import_additional_buildings(property_id, buildings_data):
-    """Import additional buildings (garages, carports, sheds, etc.)"""
+def import_main_building(property_id, buildings_data):
+    """Import main building (first building in array)"""
+    row = main_building_row(property_id, buildings_data)
+    return MainBuilding(**row) if row else None
+
+
+def additional_building_rows(property_id, buildings_data):
+    """Column dicts for additional buildings (garages, carports, sheds, etc.)"""
     if not buildings_data or len(buildings_data) <= 1:
         return []
     
-    additional_building_objs = []
+    rows = []
     
     # Skip first building (main building), process the rest
     for bldg in buildings_data[1:]:
-        additional_building = AdditionalBuilding(
+        bldg = bldg or {}
+        rows.append(dict(
             property_id=property_id,
-            building_name=safe_get(bldg, 'buildingName'),
-            building_number=safe_get(bldg, 'buildingNumber'),
+            building_name=bldg.get('buildingName'),
+            building_number=bldg.get('buildingNumber'),
             
             # Basic info
-            total_area=safe_get(bldg, 'totalArea'),
-            year_built=safe_get(bldg, 'yearBuilt'),
+            total_area=bldg.get('totalArea'),
+            year_built=bldg.get('yearBuilt'),
             
             # Materials
-            external_wall_material=safe_get(bldg, 'externalWallMaterial'),
-            supplementary_external_wall_material=safe_get(bldg, 'supplementaryExternalWallMaterial'),
-            roofing_material=safe_get(bldg, 'roofingMaterial'),
-            supplementary_roofing_material=safe_get(bldg, 'supplementaryRoofingMaterial'),
+            external_wall_material=bldg.get('externalWallMaterial'),
+            supplementary_external_wall_material=bldg.get('supplementaryExternalWallMaterial'),
+            roofing_material=bldg.get('roofingMaterial'),
+            supplementary_roofing_material=bldg.get('supplementaryRoofingMaterial'),
             
             # Heating (rarely present)
-            heating_installation=safe_get(bldg, 'heatingInstallation')
-        )
-        additional_building_objs.append(additional_building)
+            heating_installation=bldg.get('heatingInstallation')
+        ))
     
-    return additional_building_objs
+    return rows
 
 
-def import_registrations(property_id, registrations_data):
-    """Import all sale registrations for a property"""
+def import_additional_buildings(property_id, buildings_data):
+    """Import additional buildings (garages, carports, sheds, etc.)"""
+    return [AdditionalBuilding(**row) for row in additional_building_rows(property_id, buildings_data)]
+
+
+def registration_rows(property_id, registrations_data):
+    """Column dicts for all sale registrations of a property"""
     if not registrations_data:
         return []
     
-    registration_objs = []
+    rows = []
     for reg in registrations_data:
-        registration = Registration(
+        reg = reg or {}
+        rows.append(dict(
             property_id=property_id,
-            registration_id=safe_get(reg, 'registrationID'),
-            amount=safe_get(reg, 'amount'),
-            date=parse_date(safe_get(reg, 'date')),
-            type=safe_get(reg, 'type'),
-            area=safe_get(reg, 'area'),
-            living_area=safe_get(reg, 'livingArea'),
-            per_area_price=safe_get(reg, 'perAreaPrice'),
-            municipality_code=safe_get(reg, 'municipalityCode'),
-            property_number=safe_get(reg, 'propertyNumber')
-        )
-        registration_objs.append(registration)
+            registration_id=reg.get('registrationID'),
+            amount=reg.get('amount'),
+            date=parse_date(reg.get('date')),
+            type=reg.get('type'),
+            area=reg.get('area'),
+            living_area=reg.get('livingArea'),
+            per_area_price=reg.get('perAreaPrice'),
+            municipality_code=reg.get('municipalityCode'),
+            property_number=reg.get('propertyNumber')
+        ))
+    
+    return rows
+
+
+def import_registrations(property_id, registrations_data):
+    """Import all sale registrations for a property"""
+    return [Registration(**row) for row in registration_rows(property_id, registrations_data)]
+
+
+def municipality_row(property_id, municipality_data):
+    """Column dict for municipality information"""
+    if not municipality_data:
+        return None
     
-    return registration_objs
+    return dict(
+        property_id=property_id,
+        municipality_code=municipality_data.get('municipalityCode'),
+        name=municipality_data.get('name'),
+        slug=municipality_data.get('slug'),
+        church_tax_percentage=municipality_data.get('churchTaxPercentage'),
+        council_tax_percentage=municipality_data.get('councilTaxPercentage'),
+        land_value_tax_level_per_thousand=municipality_data.get('landValueTaxLevelPerThousand'),
+        number_of_schools=municipality_data.get('numberOfSchools'),
+        population=municipality_data.get('population')
+    )
 
 
 def import_municipality(property_id, municipality_data):
     """Import municipality information"""
-    if not municipality_data:
+    row = municipality_row(property_id, municipality_data)
+    return Municipality(**row) if row else None
+
+
+def province_row(property_id, province_data):
+    """Column dict for province information"""
+    if not province_data:
         return None
     
-    return Municipality(
+    return dict(
         property_id=property_id,
-        municipality_code=safe_get(municipality_data, 'municipalityCode'),
-        name=safe_get(municipality_data, 'name'),
-        slug=safe_get(municipality_data, 'slug'),
-        church_tax_percentage=safe_get(municipality_data, 'churchTaxPercentage'),
-        council_tax_percentage=safe_get(municipality_data, 'councilTaxPercentage'),
-        land_value_tax_level_per_thousand=safe_get(municipality_data, 'landValueTaxLevelPerThousand'),
-        number_of_schools=safe_get(municipality_data, 'numberOfSchools'),
-        population=safe_get(municipality_data, 'population')
+        name=province_data.get('name'),
+        province_code=province_data.get('provinceCode'),
+        region_code=province_data.get('regionCode'),
+        slug=province_data.get('slug')
     )
 
 
 def import_province(property_id, province_data):
     """Import province information"""
-    if not province_data:
+    row = province_row(property_id, province_data)
+    return Province(**row) if row else None
+
+
+def road_row(property_id, road_data):
+    """Column dict for road information"""
+    if not road_data:
         return None
     
-    return Province(
+    return dict(
         property_id=property_id,
-        name=safe_get(province_data, 'name'),
-        province_code=safe_get(province_data, 'provinceCode'),
-        region_code=safe_get(province_data, 'regionCode'),
-        slug=safe_get(province_data, 'slug')
+        name=road_data.get('name'),
+        road_code=road_data.get('roadCode'),
+        road_id=road_data.get('roadID'),
+        slug=road_data.get('slug'),
+        municipality_code=road_data.get('municipalityCode')
     )
 
 
 def import_road(property_id, road_data):
     """Import road information"""
-    if not road_data:
+    row = road_row(property_id, road_data)
+    return Road(**row) if row else None
+
+
+def zip_row(property_id, zip_data):
+    """Column dict for zip code information"""
+    if not zip_data:
         return None
     
-    return Road(
+    return dict(
         property_id=property_id,
-        name=safe_get(road_data, 'name'),
-        road_code=safe_get(road_data, 'roadCode'),
-        road_id=safe_get(road_data, 'roadID'),
-        slug=safe_get(road_data, 'slug'),
-        municipality_code=safe_get(road_data, 'municipalityCode')
+        zip_code=zip_data.get('zipCode'),
+        name=zip_data.get('name'),
+        slug=zip_data.get('slug'),
+        group=zip_data.get('group')
     )
 
 
 def import_zip(property_id, zip_data):
     """Import zip code information"""
-    if not zip_data:
+    row = zip_row(property_id, zip_data)
+    return Zip(**row) if row else None
+
+
+def city_row(property_id, city_data):
+    """Column dict for city information"""
+    if not city_data:
         return None
     
-    return Zip(
+    return dict(
         property_id=property_id,
-        zip_code=safe_get(zip_data, 'zipCode'),
-        name=safe_get(zip_data, 'name'),
-        slug=safe_get(zip_data, 'slug'),
-        group=safe_get(zip_data, 'group')
+        name=city_data.get('name'),
+        slug=city_data.get('slug')
     )
 
 
 def import_city(property_id, city_data):
     """Import city information"""
-    if not city_data:
-        return None
-    
-    return City(
-        property_id=property_id,
-        name=safe_get(city_data, 'name'),
-        slug=safe_get(city_data, 'slug')
-    )
+    row = city_row(property_id, city_data)
+    return City(**row) if row else None
 
 
-def import_place(property_id, place_data):
-    """Import place information"""
+def place_row(property_id, place_data):
+    """Column dict for place information"""
     if not place_data:
         return None
     
-    bbox = safe_get(place_data, 'bbox', [])
-    coords = safe_get(place_data, 'coordinates', {})
+    bbox = place_data.get('bbox', [])
+    coords = place_data.get('coordinates') or {}
     
-    return Place(
+    return dict(
         property_id=property_id,
-        place_id=safe_get(place_data, 'id'),
-        name=safe_get(place_data, 'name'),
-        slug=safe_get(place_data, 'slug'),
+        place_id=place_data.get('id'),
+        name=place_data.get('name'),
+        slug=place_data.get('slug'),
         bbox_min_lon=bbox[0] if len(bbox) >= 4 else None,
         bbox_min_lat=bbox[1] if len(bbox) >= 4 else None,
         bbox_max_lon=bbox[2] if len(bbox) >= 4 else None,
         bbox_max_lat=bbox[3] if len(bbox) >= 4 else None,
-        latitude=safe_get(coords, 'lat'),
-        longitude=safe_get(coords, 'lon'),
-        coordinate_type=safe_get(coords, 'type')
+        latitude=coords.get('lat'),
+        longitude=coords.get('lon'),
+        coordinate_type=coords.get('type')
     )
 
 
-def import_days_on_market(property_id, days_on_market_data):
-    """Import days on market information"""
+def import_place(property_id, place_data):
+    """Import place information"""
+    row = place_row(property_id, place_data)
+    return Place(**row) if row else None
+
+
+def days_on_market_row(property_id, days_on_market_data):
+    """Column dict for days on market information"""
     if not days_on_market_data:
         return None
     
-    return DaysOnMarket(
+    return dict(
         property_id=property_id,
-        realtors=safe_get(days_on_market_data, 'realtors', [])
+        realtors=days_on_market_data.get('realtors', [])
     )
 
 
-def import_cases(property_id, cases_data):
-    """Import cases (listing history) for a property"""
+def import_days_on_market(property_id, days_on_market_data):
+    """Import days on market information"""
+    row = days_on_market_row(property_id, days_on_market_data)
+    return DaysOnMarket(**row) if row else None
+
+
+# Image sizes stored per case image:
+# 1. 600x400 for property cards/thumbnails
+# 2. 1440x960 for detail view/gallery
+IMAGE_SIZES = ((600, 400), (1440, 960))
+
+
+def case_rows(property_id, cases_data):
+    """Column dicts for a property's cases (listing history)
+    
+    Returns one (case_row, price_change_rows, image_rows) tuple per case; the
+    child rows get their case_id once the case row has been inserted.
+    """
     if not cases_data:
         return []
     
     cases = []
     for case_data in cases_data:
-        # Parse dates
-        created = case_data.get('created')
-        modified = case_data.get('modified')
-        sold = case_data.get('sold')
-        
-        if created:
-            created = datetime.fromisoformat(created.replace('Z', '+00:00'))
-        if modified:
-            modified = datetime.fromisoformat(modified.replace('Z', '+00:00'))
-        if sold:
-            sold = datetime.fromisoformat(sold.replace('Z', '+00:00'))
-        
         # Get time on market
         time_on_market = case_data.get('timeOnMarket', {})
         current_tom = time_on_market.get('current', {})
         total_tom = time_on_market.get('total', {})
         
-        case = Case(
+        case = dict(
             property_id=property_id,
             case_id=case_data.get('caseID'),
             status=case_data.get('status'),
@@ -364,9 +507,9 @@ def import_cases(property_id, cases_data):
             price_change_percentage=case_data.get('priceChangePercentage'),
             per_area_price=case_data.get('perAreaPrice'),
             monthly_expense=case_data.get('monthlyExpense'),
-            created_date=created,
-            modified_date=modified,
-            sold_date=sold,
+            created_date=parse_iso_datetime(case_data.get('created')),
+            modified_date=parse_iso_datetime(case_data.get('modified')),
+            sold_date=parse_iso_datetime(case_data.get('sold')),
             days_on_market_current=current_tom.get('days'),
             days_on_market_total=total_tom.get('days'),
             lot_area=case_data.get('lotArea'),
@@ -384,168 +527,366 @@ def import_cases(property_id, cases_data):
             realtors_info=total_tom.get('realtors', [])
         )
         
-        # Import price changes for this case
-        price_changes_data = case_data.get('priceChanges', [])
-        for pc_data in price_changes_data:
-            change_date = pc_data.get('created')
-            if change_date:
-                change_date = datetime.fromisoformat(change_date.replace('Z', '+00:00'))
-            
-            price_change = PriceChange(
-                change_date=change_date,
+        # Price changes for this case
+        price_changes = [
+            dict(
+                change_date=to_naive_utc(parse_iso_datetime(pc_data.get('created'))),
                 old_price=pc_data.get('oldPrice'),
                 new_price=pc_data.get('newPrice'),
                 price_change_amount=pc_data.get('priceChange')
             )
-            case.price_changes.append(price_change)
+            for pc_data in case_data.get('priceChanges', [])
+        ]
         
-        # Import images for this case
+        # Images for this case
+        images = []
         images_data = case_data.get('images', [])
         for idx, image_data in enumerate(images_data):
             # Get image sources (different sizes)
             image_sources = image_data.get('imageSources', [])
             
-            # We'll store two key sizes:
-            # 1. 600x400 for property cards/thumbnails
-            # 2. 1440x960 for detail view/gallery
-            
-            url_600x400 = None
-            url_1440x960 = None
-            alt_text = None
+            # Index sources by (width, height) - size is an object, not a string;
+            # as before, the last source of a given size wins
+            by_size = {
+                (source.get('size', {}).get('width'), source.get('size', {}).get('height')): source
+                for source in image_sources
+            }
             
-            for source in image_sources:
-                # Size is an object with width/height, not a string
-                size_obj = source.get('size', {})
-                width = size_obj.get('width')
-                height = size_obj.get('height')
-                
-                # Get alt text from first source
-                if not alt_text:
-                    alt_text = source.get('alt')
-                
-                # Check for our target sizes
-                if width == 600 and height == 400:
-                    url_600x400 = source.get('url')
-                elif width == 1440 and height == 960:
-                    url_1440x960 = source.get('url')
+            # Per-image values shared by both size records
+            is_default = (idx == 0)  # First image is default
+            alt_text = next((source['alt'] for source in image_sources if source.get('alt')), None)
             
             # Create image records for both sizes
-            if url_600x400:
-                case_image_thumb = CaseImage(
-                    image_url=url_600x400,
-                    width=600,
-                    height=400,
-                    is_default=(idx == 0),  # First image is default
-                    sort_order=idx,
-                    alt_text=alt_text
-                )
-                case.images.append(case_image_thumb)
-            
-            if url_1440x960:
-                case_image_full = CaseImage(
-                    image_url=url_1440x960,
-                    width=1440,
-                    height=960,
-                    is_default=(idx == 0),  # First image is default
-                    sort_order=idx,
-                    alt_text=alt_text
-                )
-                case.images.append(case_image_full)
+            for width, height in IMAGE_SIZES:
+                url = by_size.get((width, height), {}).get('url')
+                if url:
+                    images.append(dict(
+                        image_url=url,
+                        width=width,
+                        height=height,
+                        is_default=is_default,
+                        sort_order=idx,
+                        alt_text=alt_text
+                    ))
         
-        cases.append(case)
+        cases.append((case, price_changes, images))
     
     return cases
 
 
-def import_from_api(property_id):
-    """Fetch property data from API and import to database"""
+def import_cases(property_id, cases_data):
+    """Import cases (listing history) for a property
     
-    # Fetch from API
-    url = f"https://api.boligsiden.dk/addresses/{property_id}"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        api_data = response.json()
-    except Exception as e:
-        print(f"Error fetching {property_id}: {e}")
-        return False
+    Children are built as plain lists and handed to the Case constructor, so
+    each relationship collection is set once instead of appended to per row.
+    """
+    return [
+        Case(
+            **row,
+            price_changes=[PriceChange(**pc) for pc in price_changes],
+            images=[CaseImage(**image) for image in images]
+        )
+        for row, price_changes, images in case_rows(property_id, cases_data)
+    ]
+
+
+# Child-row batches at least this large are written with PostgreSQL COPY
+COPY_MIN_ROWS = 1000
+
+
+def _copy_value(value):
+    """Format one value for COPY ... FROM STDIN (text format)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def copy_rows(session, model, rows, conflict_key=None):
+    """Write row dicts with COPY on PostgreSQL, executemany elsewhere
     
-    # Import to database
-    session = Session()
+    COPY streams the rows in one command, without per-statement parameter
+    binding. Python-side column defaults (created_at, is_default, ...) are
+    applied here because COPY bypasses SQLAlchemy. With conflict_key, rows
+    whose key already exists in the table are skipped (ON CONFLICT DO NOTHING).
+    """
+    if not rows:
+        return
+    is_postgresql = session.get_bind().dialect.name == 'postgresql'
+    if not is_postgresql or len(rows) < COPY_MIN_ROWS:
+        if conflict_key and is_postgresql:
+            session.execute(pg_insert(model).on_conflict_do_nothing(index_elements=[conflict_key]), rows)
+        else:
+            session.execute(insert(model), rows)
+        return
+    
+    columns = [
+        column for column in model.__table__.columns
+        if column.name in rows[0] or (column.default is not None and not column.primary_key)
+    ]
+    defaults = {
+        column.name: column.default.arg(None) if column.default.is_callable else column.default.arg
+        for column in columns if column.default is not None
+    }
+    
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(
+            _copy_value(row.get(column.name, defaults.get(column.name))) for column in columns
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    
+    table = model.__tablename__
+    column_list = ', '.join(f'"{column.name}"' for column in columns)
+    cursor = session.connection().connection.cursor()
     try:
-        # Main property
-        property_obj = import_property(api_data)
-        session.add(property_obj)
-        
-        # Buildings
-        main_building = import_main_building(property_id, safe_get(api_data, 'buildings'))
-        if main_building:
-            session.add(main_building)
-        
-        for additional_building in import_additional_buildings(property_id, safe_get(api_data, 'buildings')):
-            session.add(additional_building)
-        
-        # Registrations
-        for registration in import_registrations(property_id, safe_get(api_data, 'registrations')):
-            session.add(registration)
-        
-        # Related entities
-        municipality = import_municipality(property_id, safe_get(api_data, 'municipality'))
-        if municipality:
-            session.add(municipality)
-        
-        province = import_province(property_id, safe_get(api_data, 'province'))
-        if province:
-            session.add(province)
-        
-        road = import_road(property_id, safe_get(api_data, 'road'))
-        if road:
-            session.add(road)
-        
-        zip_obj = import_zip(property_id, safe_get(api_data, 'zip'))
-        if zip_obj:
-            session.add(zip_obj)
+        if not conflict_key:
+            cursor.copy_expert(f'COPY {table} ({column_list}) FROM STDIN', buffer)
+            return
         
-        city = import_city(property_id, safe_get(api_data, 'city'))
-        if city:
-            session.add(city)
-        
-        place = import_place(property_id, safe_get(api_data, 'place'))
-        if place:
-            session.add(place)
-        
-        days_on_market = import_days_on_market(property_id, safe_get(api_data, 'daysOnMarket'))
-        if days_on_market:
-            session.add(days_on_market)
-        
-        # Cases and price changes
-        for case in import_cases(property_id, safe_get(api_data, 'cases')):
-            session.add(case)
-        
-        session.commit()
-        print(f"✓ Imported {property_id}")
-        return True
-        
-    except Exception as e:
-        session.rollback()
-        print(f"✗ Error importing {property_id}: {e}")
-        return False
+        # COPY cannot skip conflicting rows: stage them in a temp table first
+        # (qualified with pg_temp, so the DROP can never hit a permanent table)
+        staging = f'pg_temp.{table}_staging'
+        cursor.execute(f'DROP TABLE IF EXISTS {staging}')
+        cursor.execute(
+            f'CREATE TEMP TABLE {staging} ON COMMIT DROP AS '
+            f'SELECT {column_list} FROM {table} WITH NO DATA'
+        )
+        cursor.copy_expert(f'COPY {staging} ({column_list}) FROM STDIN', buffer)
+        cursor.execute(
+            f'INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} '
+            f'ON CONFLICT ({conflict_key}) DO NOTHING'
+        )
     finally:
-        session.close()
+        cursor.close()
+
+
+def dedupe_rows(rows, key):
+    """Drop rows repeating an earlier row's key; rows without a key are kept"""
+    seen = set()
+    unique_rows = []
+    for row in rows:
+        value = row[key]
+        if value is not None:
+            if value in seen:
+                continue
+            seen.add(value)
+        unique_rows.append(row)
+    return unique_rows
+
+
+def insert_cases(session, cases):
+    """Insert case_rows() output: one INSERT ... RETURNING for the cases, then
+    one executemany per child table with the generated case ids filled in"""
+    if not cases:
+        return []
+    
+    case_ids = session.scalars(
+        insert(Case).returning(Case.id, sort_by_parameter_order=True),
+        [row for row, _, _ in cases]
+    ).all()
+    
+    price_change_rows = [
+        {**pc, 'case_id': case_id}
+        for case_id, (_, price_changes, _) in zip(case_ids, cases) for pc in price_changes
+    ]
+    image_rows = [
+        {**image, 'case_id': case_id}
+        for case_id, (_, _, images) in zip(case_ids, cases) for image in images
+    ]
+    copy_rows(session, PriceChange, price_change_rows)
+    copy_rows(session, CaseImage, image_rows)
+    
+    return case_ids
+
+
+# Models in foreign-key order (properties_new first) for the bulk insert
+BULK_INSERT_MODELS = [
+    Property, MainBuilding, AdditionalBuilding, Registration, Municipality,
+    Province, Road, Zip, City, Place, DaysOnMarket
+]
+
+
+def build_property_rows(property_id, api_data):
+    """Column dicts for one property and its related tables, keyed by model"""
+    rows = {model: [] for model in BULK_INSERT_MODELS}
+    rows[Property].append(property_row(api_data))
+    
+    # Buildings
+    buildings = api_data.get('buildings')
+    main_building = main_building_row(property_id, buildings)
+    if main_building:
+        rows[MainBuilding].append(main_building)
+    rows[AdditionalBuilding].extend(additional_building_rows(property_id, buildings))
+    
+    # Registrations
+    rows[Registration].extend(registration_rows(property_id, api_data.get('registrations')))
+    
+    # Related entities
+    for model, build_row, key in [
+        (Municipality, municipality_row, 'municipality'),
+        (Province, province_row, 'province'),
+        (Road, road_row, 'road'),
+        (Zip, zip_row, 'zip'),
+        (City, city_row, 'city'),
+        (Place, place_row, 'place'),
+        (DaysOnMarket, days_on_market_row, 'daysOnMarket'),
+    ]:
+        row = build_row(property_id, api_data.get(key))
+        if row:
+            rows[model].append(row)
+    
+    return rows
+
+
+# Items per transform task and per committed insert batch for JSON file imports
+JSON_BATCH_SIZE = 500
+
+# Characters read from the JSON file per refill while streaming its items
+JSON_READ_SIZE = 1 << 16
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
 
+# Files up to this size are parsed in one orjson call (when installed); larger
+# ones are streamed so memory stays bounded. Parsed objects take several times
+# the file size, so this caps the one-shot parse at a few hundred MB
+ORJSON_MAX_BYTES = 32 * 1024 * 1024
 
-def import_from_json_file(json_path):
-    """Import properties from JSON file (like api_sample_data_20251004_211357.json)"""
+
+def iter_json_array(f):
+    """Yield the items of a top-level JSON array, reading the file incrementally
+    
+    Only the current item and one read buffer are held in memory, instead of
+    the whole parsed document. Input json.load would reject raises ValueError
+    here too, once the parser reaches it (earlier items are already yielded).
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    
+    # Read on while the buffer holds only leading whitespace
+    while not eof and pos == len(buffer):
+        chunk = f.read(JSON_READ_SIZE)
+        eof = not chunk
+        buffer += chunk
+        pos = _JSON_WHITESPACE.match(buffer).end()
+    if buffer[pos:pos + 1] != '[':
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    expect_item = True   # after '[' or ','; False after an item
+    first = True
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    while True:
+        pos = _JSON_WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer):
+            char = buffer[pos]
+            if char == ']' and (first or not expect_item):
+                pos += 1
+                break
+            if char == ',' and not expect_item:
+                expect_item = True
+                pos += 1
+                continue
+            if not expect_item or char in ',]':
+                raise ValueError(f"Unexpected {char!r} at position {pos} of JSON array")
+            
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # An item is complete only once ',' or ']' follows it: a number cut
+                # at the buffer end (e.g. "1.5e10" read as "1.") decodes as a prefix
+                end = _JSON_WHITESPACE.match(buffer, end).end()
+                if end < len(buffer) and buffer[end] in ',]':
+                    yield item
+                    pos = end
+                    expect_item = first = False
+                    continue
+                if eof and end < len(buffer):
+                    raise ValueError(f"Expected ',' or ']' at position {end}")
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        if eof:
+            raise ValueError("Unterminated JSON array")
+        
+        # Refill: keep the unparsed tail and append the next block
+        chunk = f.read(JSON_READ_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+    
+    # Only whitespace may follow the closing ']'
+    while True:
+        pos = _JSON_WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer):
+            raise ValueError(f"Extra data after JSON array at position {pos}")
+        buffer, pos = f.read(JSON_READ_SIZE), 0
+        if not buffer:
+            return
+
+
+def iter_json_file(json_path):
+    """Yield the items of the JSON array stored in json_path
+    
+    orjson parses the raw UTF-8 bytes directly (no decode step) and is several
+    times faster than the stdlib parser, so it is used whenever the file fits
+    under ORJSON_MAX_BYTES.
+    """
+    path = Path(json_path)
+    if orjson is not None and path.stat().st_size <= ORJSON_MAX_BYTES:
+        items = orjson.loads(path.read_bytes())
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON array")
+        yield from items
+        return
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_json_array(f)
+
+
+def iter_batches(items, size):
+    """Group an iterable into lists of at most size items"""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def transform_batches(batches, max_workers=None):
+    """(batch, build_rows(batch)) for each batch, in order; across worker processes
+    when there are several CPUs, with a bounded number of batches in flight"""
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        # Worker start-up and pickling only pay off with several cores
+        for batch in batches:
+            yield batch, build_rows(batch)
+        return
     
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append((batch, executor.submit(build_rows, batch)))
+            if len(pending) >= 2 * max_workers:
+                batch, future = pending.popleft()
+                yield batch, future.result()
+        while pending:
+            batch, future = pending.popleft()
+            yield batch, future.result()
+
+
+def build_rows(items):
+    """Transform a batch of JSON file items into row dicts per model
+    
+    Returns (table_rows, success_count, error_count). Module-level so it can run
+    in a worker process.
+    """
     success_count = 0
     error_count = 0
+    table_rows = {model: [] for model in BULK_INSERT_MODELS}
     
-    session = Session()
-    
-    for item in data:
+    for item in items:
         api_data = item.get('api')
         if not api_data:
             continue
@@ -553,63 +894,305 @@ def import_from_json_file(json_path):
         property_id = item.get('property_id')
         
         try:
-            # Main property
-            property_obj = import_property(api_data)
-            session.add(property_obj)
-            
-            # Buildings
-            main_building = import_main_building(property_id, safe_get(api_data, 'buildings'))
-            if main_building:
-                session.add(main_building)
-            
-            for additional_building in import_additional_buildings(property_id, safe_get(api_data, 'buildings')):
-                session.add(additional_building)
-            
-            # Registrations
-            for registration in import_registrations(property_id, safe_get(api_data, 'registrations')):
-                session.add(registration)
-            
-            # Related entities
-            municipality = import_municipality(property_id, safe_get(api_data, 'municipality'))
-            if municipality:
-                session.add(municipality)
-            
-            province = import_province(property_id, safe_get(api_data, 'province'))
-            if province:
-                session.add(province)
-            
-            road = import_road(property_id, safe_get(api_data, 'road'))
-            if road:
-                session.add(road)
-            
-            zip_obj = import_zip(property_id, safe_get(api_data, 'zip'))
-            if zip_obj:
-                session.add(zip_obj)
-            
-            city = import_city(property_id, safe_get(api_data, 'city'))
-            if city:
-                session.add(city)
-            
-            place = import_place(property_id, safe_get(api_data, 'place'))
-            if place:
-                session.add(place)
+            for model, rows in build_property_rows(property_id, api_data).items():
+                table_rows[model].extend(rows)
+            success_count += 1
+        except Exception as e:
+            print(f"✗ Error importing {property_id}: {e}")
+            error_count += 1
+    
+    return table_rows, success_count, error_count
+
+
+def write_rows(session, table_rows):
+    """One Core INSERT executemany per model's rows, in foreign-key order
+    
+    Core inserts skip the ORM mapping layer that bulk_insert_mappings still
+    runs per row. Registrations, the tallest of these tables, go through
+    copy_rows like the price changes and images.
+    """
+    for model in BULK_INSERT_MODELS:
+        if not table_rows[model]:
+            continue
+        if model is Registration:
+            # One sale registration can cover several addresses: write it once
+            # and skip it when an earlier batch or import already has it
+            rows = dedupe_rows(table_rows[model], 'registration_id')
+            copy_rows(session, model, rows, conflict_key='registration_id')
+        else:
+            session.execute(insert(model), table_rows[model])
+
+
+def import_from_json_file(json_path, max_workers=None):
+    """Import properties from JSON file (like api_sample_data_20251004_211357.json)
+    
+    The file is read in batches of JSON_BATCH_SIZE items; each batch is built
+    as plain dicts (in worker processes when there are several CPUs) and written
+    with one Core INSERT per table and one commit. No ORM objects, unit-of-work
+    tracking or per-property commits. Files over ORJSON_MAX_BYTES are streamed,
+    so memory stays bounded by that threshold and a few batches rather than the
+    file size. If a batch fails, its items are retried one by one so only the
+    bad rows are lost.
+    """
+    
+    success_count = 0
+    error_count = 0
+    
+    session = Session()
+    try:
+        batches = iter_batches(iter_json_file(json_path), JSON_BATCH_SIZE)
+        for batch, (table_rows, batch_success, batch_errors) in transform_batches(batches, max_workers):
+            error_count += batch_errors
+            try:
+                write_rows(session, table_rows)
+                session.commit()
+                success_count += batch_success
+                print(f"✓ Imported {success_count} properties")
+                continue
+            except Exception as e:
+                session.rollback()
+                print(f"✗ Error writing batch, retrying its items one by one: {e}")
             
-            days_on_market = import_days_on_market(property_id, safe_get(api_data, 'daysOnMarket'))
-            if days_on_market:
-                session.add(days_on_market)
+            for item in batch:
+                item_rows, item_success, _ = build_rows([item])
+                if not item_success:
+                    continue
+                try:
+                    write_rows(session, item_rows)
+                    session.commit()
+                    success_count += 1
+                except Exception as e:
+                    session.rollback()
+                    print(f"✗ Error importing {item.get('property_id')}: {e}")
+                    error_count += 1
+    finally:
+        session.close()
+    
+    print(f"\nImport complete: {success_count} succeeded, {error_count} failed")
+    return success_count, error_count
+
+
+def import_json_file_worker(json_path):
+    """Process-pool entry point: import one file using this process's own connections"""
+    # Never reuse pooled connections inherited from the parent over fork
+    engine.dispose(close=False)
+    return import_from_json_file(json_path, max_workers=1)
+
+
+def import_from_json_dir(glob_pattern, max_workers=None):
+    """Import every JSON file matching glob_pattern (e.g. 'dumps/*.json')
+    
+    Dump files are independent, so each one is imported by its own worker
+    process with its own session and lookup-row cache; throughput scales with
+    the cores until the database write bandwidth is saturated.
+    """
+    json_paths = sorted(glob.glob(glob_pattern))
+    if not json_paths:
+        print(f"✗ No files match {glob_pattern}")
+        return 0
+    max_workers = max_workers or min(os.cpu_count() or 1, len(json_paths))
+    
+    success_count = 0
+    error_count = 0
+    
+    if max_workers == 1:
+        for json_path in json_paths:
+            file_success, file_errors = import_from_json_file(json_path, max_workers=1)
+            success_count += file_success
+            error_count += file_errors
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(import_json_file_worker, path): path for path in json_paths}
+            for future in as_completed(futures):
+                try:
+                    file_success, file_errors = future.result()
+                except Exception as e:
+                    print(f"✗ Error importing {futures[future]}: {e}")
+                    continue
+                success_count += file_success
+                error_count += file_errors
+                print(f"✓ {futures[future]}: {file_success} imported, {file_errors} failed")
+    
+    print(f"\nImport complete: {len(json_paths)} files, {success_count} succeeded, {error_count} failed")
+    return success_count
+
+
+# Concurrent API requests for multi-property imports (fetching is network-bound)
+API_MAX_WORKERS = 16
+
+# Multi-property API imports write fetched payloads in batches of up to
+# API_WRITE_BATCH properties, or whatever has arrived after API_WRITE_WAIT
+# seconds - one transaction per batch
+API_WRITE_BATCH = 500
+API_WRITE_WAIT = 2.0
+
+# One HTTP session for all API requests: keep-alive connections (no TCP/TLS
+# handshake per property), a pool large enough for the fetch threads, and
+# retries with backoff for transient gateway errors
+HTTP_POOL_SIZE = 32
+_http = requests.Session()
+_http.mount('https://', HTTPAdapter(
+    pool_connections=HTTP_POOL_SIZE,
+    pool_maxsize=HTTP_POOL_SIZE,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+))
+
+
+def fetch_property(property_id):
+    """Fetch one property's payload from the API; returns None on failure"""
+    url = f"https://api.boligsiden.dk/addresses/{property_id}"
+    try:
+        response = _http.get(url, timeout=10)
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        print(f"Error fetching {property_id}: {e}")
+        return None
+
+
+def write_property(session, property_id, api_data, commit=True):
+    """Write one property with its related rows and cases
+    
+    The writes run in a savepoint, so a failing property is rolled back on its
+    own. With commit=False the caller commits, batching many properties into
+    one transaction.
+    """
+    try:
+        with session.begin_nested():
+            write_rows(session, build_property_rows(property_id, api_data))
             
+            # Cases with their price changes and images (property row must exist first)
+            insert_cases(session, case_rows(property_id, api_data.get('cases')))
+    except Exception as e:
+        # Only the savepoint is rolled back; the enclosing transaction goes on
+        print(f"✗ Error importing {property_id}: {e}")
+        return False
+    
+    if commit:
+        try:
             session.commit()
-            print(f"✓ Imported {property_id}")
-            success_count += 1
-            
         except Exception as e:
             session.rollback()
             print(f"✗ Error importing {property_id}: {e}")
-            error_count += 1
+            return False
+    
+    print(f"✓ Imported {property_id}")
+    return True
+
+
+def import_from_api(property_id):
+    """Fetch property data from API and import to database"""
+    api_data = fetch_property(property_id)
+    if api_data is None:
+        return False
     
-    session.close()
+    session = Session()
+    try:
+        return write_property(session, property_id, api_data)
+    finally:
+        session.close()
+
+
+def write_properties(session, payloads):
+    """Write a batch of (property_id, api_data) pairs in one transaction
+    
+    All rows are built first and written with one INSERT per table. If that
+    fails, the batch is rolled back and retried property by property, so only
+    the bad properties are lost. Returns the number of properties written.
+    """
+    try:
+        table_rows = {model: [] for model in BULK_INSERT_MODELS}
+        cases = []
+        for property_id, api_data in payloads:
+            for model, rows in build_property_rows(property_id, api_data).items():
+                table_rows[model].extend(rows)
+            cases.extend(case_rows(property_id, api_data.get('cases')))
+        write_rows(session, table_rows)
+        insert_cases(session, cases)
+        session.commit()
+        print(f"✓ Imported {len(payloads)} properties")
+        return len(payloads)
+    except Exception as e:
+        session.rollback()
+        print(f"✗ Error writing batch, retrying its properties one by one: {e}")
+    
+    written = sum(write_property(session, pid, api_data, commit=False) for pid, api_data in payloads)
+    try:
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"✗ Error committing {written} properties: {e}")
+        return 0
+    return written
+
+
+def fetch_into(results, property_id):
+    """Fetch one property and put (property_id, api_data or None) on the results queue"""
+    api_data = None
+    try:
+        api_data = fetch_property(property_id)
+    finally:
+        results.put((property_id, api_data))
+
+
+def import_many_from_api(property_ids, max_workers=API_MAX_WORKERS):
+    """Import several properties from the API
+    
+    Requests run concurrently in a thread pool and feed a bounded queue; this
+    thread drains it into batches (API_WRITE_BATCH payloads or API_WRITE_WAIT
+    seconds, whichever comes first) and writes each batch with
+    write_properties. Network waits overlap the database writes, one commit
+    covers many properties, and fetchers block rather than piling up payloads
+    when the database falls behind.
+    """
+    property_ids = list(property_ids)
+    results = queue.Queue(maxsize=API_WRITE_BATCH)
+    success_count = 0
+    error_count = 0
+    received = 0
+    batch = []
+    deadline = None
+    
+    def flush():
+        nonlocal success_count, error_count, batch, deadline
+        written = write_properties(session, batch)
+        success_count += written
+        error_count += len(batch) - written
+        batch = []
+        deadline = None
+    
+    session = Session()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for pid in property_ids:
+                executor.submit(fetch_into, results, pid)
+            
+            while received < len(property_ids):
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    pid, api_data = results.get(timeout=timeout)
+                except queue.Empty:
+                    # API_WRITE_WAIT has passed since the batch was started
+                    flush()
+                    continue
+                
+                received += 1
+                if api_data is None:
+                    error_count += 1
+                    continue
+                if not batch:
+                    deadline = time.monotonic() + API_WRITE_WAIT
+                batch.append((pid, api_data))
+                if len(batch) >= API_WRITE_BATCH:
+                    flush()
+        
+        if batch:
+            flush()
+    finally:
+        session.close()
     
     print(f"\nImport complete: {success_count} succeeded, {error_count} failed")
+    return success_count
 
 
 def create_tables():
@@ -625,7 +1208,8 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Import property data from API or JSON file')
     parser.add_argument('--create-tables', action='store_true', help='Create database tables')
     parser.add_argument('--from-json', type=str, help='Import from JSON file path')
-    parser.add_argument('--from-api', type=str, help='Import single property ID from API')
+    parser.add_argument('--from-json-dir', type=str, help="Import all JSON files matching a glob (e.g. 'dumps/*.json')")
+    parser.add_argument('--from-api', type=str, nargs='+', help='Import property ID(s) from API')
     parser.add_argument('--test', action='store_true', help='Test import on sample data')
     
     args = parser.parse_args()
@@ -636,8 +1220,14 @@ if __name__ == '__main__':
     if args.from_json:
         import_from_json_file(args.from_json)
     
+    if args.from_json_dir:
+        import_from_json_dir(args.from_json_dir)
+    
     if args.from_api:
-        import_from_api(args.from_api)
+        if len(args.from_api) == 1:
+            import_from_api(args.from_api[0])
+        else:
+            import_many_from_api(args.from_api)
     
     if args.test:
         print("Testing import on sample data...")
@@ -10,13 +10,23 @@ Framework adopted from Step_1_Scraping_boligsiden.ipynb:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import math
 import time
 import argparse
 import random
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from sqlalchemy import create_engine, select, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
+
+try:
+    import orjson
+except ImportError:  # falls back to requests' stdlib json decoding
+    orjson = None
 from sqlalchemy.orm import sessionmaker
 import sys
 import os
@@ -37,32 +47,63 @@ BASE_URL = "https://api.boligsiden.dk"
 SEARCH_ENDPOINT = f"{BASE_URL}/search/addresses"
 DETAIL_ENDPOINT = f"{BASE_URL}/addresses"
 
+# One HTTP session for every API call: all requests go to api.boligsiden.dk, so
+# keep-alive connections skip the TCP/TLS handshake after the first request.
+# The pool covers the parallel import's workers. There are no fixed sleeps between
+# requests: the API's own signals drive the pacing instead - 429/5xx responses are
+# retried with exponential backoff, honouring Retry-After when the API sends one
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 64
+HTTP_RETRIES = 5
+HTTP_BACKOFF_FACTOR = 0.5
+_http = requests.Session()
+_http.mount(BASE_URL, HTTPAdapter(
+    pool_connections=HTTP_POOL_CONNECTIONS,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    max_retries=Retry(
+        total=HTTP_RETRIES, backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504), respect_retry_after_header=True,
+        raise_on_status=False  # hand the last response to the existing status checks
+    )
+))
+
+def parse_response(response):
+    """Decode a JSON response body; orjson parses the raw bytes without a str decode"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 # Dynamic headers with user-agent rotation (from notebook)
+USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.82 Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 14_4_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1',
+)
+
+# Static headers are set once on the shared session; requests only add the user-agent
+BASE_HEADERS = {
+    'authority': 'api.boligsiden.dk',
+    'accept': 'application/json, text/plain, */*',
+    'accept-language': 'en-GB,en;q=0.9,en-US;q=0.8',
+    'origin': 'https://www.boligsiden.dk',
+    'referer': 'https://www.boligsiden.dk/',
+    'sec-ch-ua': '"Google Chrome";v="113", "Not-A.Brand";v="24"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'sec-fetch-dest': 'empty',
+    'sec-fetch-mode': 'cors',
+    'sec-fetch-site': 'same-site',
+}
+_http.headers.update(BASE_HEADERS)
+
 def get_user_agent():
     """Get random user agent to avoid rate limiting"""
-    user_agents = [
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36',
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.82 Safari/537.36',
-        'Mozilla/5.0 (iPhone; CPU iPhone OS 14_4_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1',
-    ]
-    return random.choice(user_agents)
+    return random.choice(USER_AGENTS)
 
 def get_headers():
-    """Get headers with random user agent"""
-    return {
-        'authority': 'api.boligsiden.dk',
-        'accept': 'application/json, text/plain, */*',
-        'accept-language': 'en-GB,en;q=0.9,en-US;q=0.8',
-        'origin': 'https://www.boligsiden.dk',
-        'referer': 'https://www.boligsiden.dk/',
-        'sec-ch-ua': '"Google Chrome";v="113", "Not-A.Brand";v="24"',
-        'sec-ch-ua-mobile': '?0',
-        'sec-ch-ua-platform': '"Windows"',
-        'sec-fetch-dest': 'empty',
-        'sec-fetch-mode': 'cors',
-        'sec-fetch-site': 'same-site',
-        'user-agent': get_user_agent(),
-    }
+    """Per-request headers: a random user agent (the rest are session defaults)"""
+    return {'user-agent': get_user_agent()}
 
 # Load municipalities within 60km
 def load_municipalities_within_60km():
@@ -128,14 +169,14 @@ def fetch_properties_from_search(municipalities: list, per_page: int = 50, max_p
                 
                 # Note: API may not support municipality filtering via parameter
                 # We'll filter in the results instead
-                response = requests.get(SEARCH_ENDPOINT, params=params, headers=get_headers(), timeout=10)
+                response = _http.get(SEARCH_ENDPOINT, params=params, headers=get_headers(), timeout=10)
                 
                 if response.status_code == 400:
                     print(f"   Page {page} returned 400 - end of results")
                     break
                 
                 response.raise_for_status()
-                data = response.json()
+                data = parse_response(response)
                 
                 if 'addresses' not in data or not data['addresses']:
                     print(f"   No more results at page {page}")
@@ -170,8 +211,6 @@ def fetch_properties_from_search(municipalities: list, per_page: int = 50, max_p
                     print(f"\n⚠️  Reached page limit (200) - stopping to avoid fetching entire API")
                     break
                 
-                time.sleep(0.2)  # Rate limiting
-                
             except Exception as e:
                 print(f"   ⚠️  Error on page {page}: {e}")
                 break
@@ -182,13 +221,48 @@ def fetch_properties_from_search(municipalities: list, per_page: int = 50, max_p
     return all_property_ids
 
 
+# Zip codes per municipality hardly ever change, so once discovered they are kept
+# in a static table and later runs skip the 20-page discovery crawl entirely
+ZIP_CODES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'municipality_zip_codes.json')
+_zip_codes_by_municipality = {}
+
+
+def load_zip_codes():
+    """Load the municipality -> zip codes table, if one has been saved"""
+    try:
+        with open(ZIP_CODES_PATH, 'r', encoding='utf-8') as f:
+            _zip_codes_by_municipality.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+
+def save_zip_codes():
+    """Write the municipality -> zip codes table (atomically)"""
+    tmp_path = f"{ZIP_CODES_PATH}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_zip_codes_by_municipality, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, ZIP_CODES_PATH)
+    except OSError as e:
+        print(f"   ⚠️  Could not save zip code table: {e}")
+
+
 def fetch_zip_codes_for_municipality(municipality: str):
     """
     Fetch all unique zip codes in a municipality by querying first 1000 results.
-    Returns list of zip codes found.
+    Uses the saved zip code table when the municipality is already in it.
+    Returns list of zip codes found. The list is saved only when the crawl ran
+    out of results; a 1000-result sample may miss zip codes, so otherwise
+    fetch_municipality_villas saves it once the zip codes cover every villa.
     """
+    if municipality in _zip_codes_by_municipality:
+        zip_codes = _zip_codes_by_municipality[municipality]
+        print(f"   📮 Using {len(zip_codes)} known zip codes: {zip_codes}")
+        return zip_codes
+    
     print(f"   🔍 Discovering zip codes in {municipality}...")
     zip_codes = set()
+    exhausted = False
     
     try:
         params = {
@@ -201,25 +275,28 @@ def fetch_zip_codes_for_municipality(municipality: str):
         # Fetch first few pages to discover zip codes
         for page in range(1, 21):  # First 1000 results (20 pages × 50)
             params['page'] = str(page)
-            response = requests.get(SEARCH_ENDPOINT, params=params, headers=get_headers(), timeout=10)
+            response = _http.get(SEARCH_ENDPOINT, params=params, headers=get_headers(), timeout=10)
             
             if response.status_code != 200:
+                # Retries exhausted: use what was found, but don't save a partial list
+                print(f"   ⚠️  HTTP {response.status_code} on page {page} - zip codes may be incomplete")
                 break
             
-            data = response.json()
+            data = parse_response(response)
             addresses = data.get('addresses', [])
             
             if not addresses:
+                exhausted = True
                 break
             
             for addr in addresses:
                 zip_code = addr.get('zipCode')
                 if zip_code:
                     zip_codes.add(zip_code)
-            
-            time.sleep(0.05)
         
         print(f"   ✅ Found {len(zip_codes)} zip codes: {sorted(zip_codes)}")
+        if zip_codes and exhausted:
+            _zip_codes_by_municipality[municipality] = sorted(zip_codes)
         return sorted(zip_codes)
         
     except Exception as e:
@@ -227,10 +304,77 @@ def fetch_zip_codes_for_municipality(municipality: str):
         return []
 
 
-def fetch_properties_by_municipality(municipalities: list, max_properties: int = None):
+# Municipalities searched at the same time during discovery
+DISCOVERY_WORKERS = 8
+
+
+def fetch_municipality_villas(municipality: str, muni_idx: int, muni_total: int):
+    """All villas in one municipality, subdivided by zip code when it exceeds the API's result limit"""
+    print(f"\n{'='*80}")
+    print(f"📍 Municipality {muni_idx}/{muni_total}: {municipality}")
+    print(f"{'='*80}")
+    
+    muni_property_ids = []
+    
+    # First, check total count for this municipality
+    params = {
+        'municipalities': municipality,
+        'addressTypes': 'villa',
+        'per_page': '50',
+        'page': '1'
+    }
+    
+    try:
+        response = _http.get(SEARCH_ENDPOINT, params=params, headers=get_headers(), timeout=10)
+        response.raise_for_status()
+        data = parse_response(response)
+        total_hits = data.get('totalHits', 0)
+        
+        print(f"   📊 Total hits for {municipality}: {total_hits:,}")
+        
+        # Check if we need to subdivide by zip code
+        if total_hits > 9500:  # Use 9500 instead of 10000 for safety margin
+            print(f"   ⚠️  Municipality has > 9,500 properties - subdividing by zip code")
+            zip_codes = fetch_zip_codes_for_municipality(municipality)
+            
+            if zip_codes:
+                # Fetch properties for each zip code separately
+                for zip_idx, zip_code in enumerate(zip_codes, 1):
+                    print(f"\n   📮 Zip Code {zip_idx}/{len(zip_codes)}: {zip_code}")
+                    zip_props = fetch_properties_by_filters(
+                        municipality=municipality,
+                        zip_code=zip_code
+                    )
+                    muni_property_ids.extend(zip_props)
+                    print(f"      ✅ Found {len(zip_props)} properties in zip {zip_code}")
+                
+                # Save the zip codes only once they account for every villa; a saved
+                # list that no longer does (new zip code) is dropped and rediscovered
+                if len(muni_property_ids) >= total_hits:
+                    _zip_codes_by_municipality[municipality] = zip_codes
+                else:
+                    print(f"   ⚠️  Zip codes cover {len(muni_property_ids):,} of {total_hits:,} villas - not saving them")
+                    _zip_codes_by_municipality.pop(municipality, None)
+            else:
+                print(f"   ⚠️  Could not discover zip codes - using standard method")
+                muni_property_ids = fetch_properties_by_filters(municipality=municipality)
+        else:
+            # Municipality is small enough - fetch normally
+            muni_property_ids = fetch_properties_by_filters(municipality=municipality)
+        
+    except Exception as e:
+        print(f"   ⚠️  Error checking total hits: {e}")
+        muni_property_ids = fetch_properties_by_filters(municipality=municipality)
+    
+    return muni_property_ids
+
+
+def iter_properties_by_municipality(municipalities: list, max_properties: int = None, refresh_zip_codes: bool = False):
     """
     Fetch ALL villas from Copenhagen area municipalities (no market status filter).
     Framework adopted from notebook: iterate municipality-by-municipality with addressType filtering.
+    Yields property info dicts as soon as each municipality's search is done, so an
+    import can start while later municipalities are still being searched.
     
     OPTIMIZATION: Filter for 'villa' only to reduce API calls by ~97%
     - København total: 441,795 properties
@@ -241,82 +385,98 @@ def fetch_properties_by_municipality(municipalities: list, max_properties: int =
     - Detects when totalHits > 10,000
     - Automatically subdivides by zip code to avoid API limit
     - Ensures ALL properties are captured
+    
+    With refresh_zip_codes, the saved zip codes of these municipalities are
+    discarded and discovered again.
     """
     print(f"🔍 Fetching ALL VILLAS from {len(municipalities)} municipalities...")
     print(f"   📋 Filter: addressTypes=villa (reduces results by ~97%)")
     print(f"   📊 Importing ALL villas (not just on-market)")
     print(f"   🆕 Auto-subdivides large municipalities by zip code\n")
     
-    all_property_ids = []
-    total_fetched = 0
     on_market_count = 0
-    
-    # Iterate through each municipality separately (from notebook framework)
-    for muni_idx, municipality in enumerate(municipalities, 1):
-        print(f"\n{'='*80}")
-        print(f"📍 Municipality {muni_idx}/{len(municipalities)}: {municipality}")
-        print(f"{'='*80}")
-        
-        muni_property_ids = []
-        
-        # First, check total count for this municipality
-        params = {
-            'municipalities': municipality,
-            'addressTypes': 'villa',
-            'per_page': '50',
-            'page': '1'
-        }
-        
-        try:
-            response = requests.get(SEARCH_ENDPOINT, params=params, headers=get_headers(), timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            total_hits = data.get('totalHits', 0)
-            
-            print(f"   📊 Total hits for {municipality}: {total_hits:,}")
-            
-            # Check if we need to subdivide by zip code
-            if total_hits > 9500:  # Use 9500 instead of 10000 for safety margin
-                print(f"   ⚠️  Municipality has > 9,500 properties - subdividing by zip code")
-                zip_codes = fetch_zip_codes_for_municipality(municipality)
-                
-                if zip_codes:
-                    # Fetch properties for each zip code separately
-                    for zip_idx, zip_code in enumerate(zip_codes, 1):
-                        print(f"\n   📮 Zip Code {zip_idx}/{len(zip_codes)}: {zip_code}")
-                        zip_props = fetch_properties_by_filters(
-                            municipality=municipality,
-                            zip_code=zip_code
-                        )
-                        muni_property_ids.extend(zip_props)
-                        print(f"      ✅ Found {len(zip_props)} properties in zip {zip_code}")
-                else:
-                    print(f"   ⚠️  Could not discover zip codes - using standard method")
-                    muni_property_ids = fetch_properties_by_filters(municipality=municipality)
-            else:
-                # Municipality is small enough - fetch normally
-                muni_property_ids = fetch_properties_by_filters(municipality=municipality)
-            
-        except Exception as e:
-            print(f"   ⚠️  Error checking total hits: {e}")
-            muni_property_ids = fetch_properties_by_filters(municipality=municipality)
-        
-        # Add to total
-        all_property_ids.extend(muni_property_ids)
-        on_market_count += len(muni_property_ids)
-        
-        print(f"   ✅ {municipality}: Total {len(muni_property_ids)} villas")
-        
-        if max_properties and on_market_count >= max_properties:
-            print(f"\n✅ Reached max properties limit ({max_properties})")
-            break
+    load_search_cache()
+    load_zip_codes()
+    if refresh_zip_codes:
+        for municipality in municipalities:
+            _zip_codes_by_municipality.pop(municipality, None)
+    
+    # Municipalities are independent, so they are searched concurrently; results
+    # are yielded in municipality order
+    try:
+        with ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS) as executor:
+            futures = [
+                executor.submit(fetch_municipality_villas, municipality, muni_idx, len(municipalities))
+                for muni_idx, municipality in enumerate(municipalities, 1)
+            ]
+            try:
+                for municipality, future in zip(municipalities, futures):
+                    muni_property_ids = future.result()
+                    on_market_count += len(muni_property_ids)
+                    
+                    print(f"   ✅ {municipality}: Total {len(muni_property_ids)} villas")
+                    yield from muni_property_ids
+                    
+                    if max_properties and on_market_count >= max_properties:
+                        print(f"\n✅ Reached max properties limit ({max_properties})")
+                        break
+            finally:
+                # Stopped early (limit, interrupt or the consumer gave up): skip the rest
+                for pending in futures:
+                    pending.cancel()
+    finally:
+        save_search_cache()
+        save_zip_codes()
     
     # Final summary
     print(f"\n{'='*80}")
     print(f"✅ TOTAL: Found {on_market_count:,} villas across {len(municipalities)} municipalities")
     print(f"   These will be checked for duplicates before importing")
     print(f"{'='*80}")
-    return all_property_ids
+
+
+def fetch_properties_by_municipality(municipalities: list, max_properties: int = None, refresh_zip_codes: bool = False):
+    """All villas from iter_properties_by_municipality as one list"""
+    return list(iter_properties_by_municipality(municipalities, max_properties, refresh_zip_codes))
+
+
+# Search pages are re-downloaded on every run. Their ETag/Last-Modified and the
+# property entries taken from them are kept on disk, so a re-run sends conditional
+# requests and an unchanged page comes back as a small 304 Not Modified
+SEARCH_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'search_page_cache.json')
+_search_cache = {}
+
+
+def load_search_cache():
+    """Load the search-page validators saved by the previous run, if any"""
+    try:
+        with open(SEARCH_CACHE_PATH, 'r', encoding='utf-8') as f:
+            _search_cache.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+
+def save_search_cache():
+    """Write the search-page validators for the next run (atomically)"""
+    tmp_path = f"{SEARCH_CACHE_PATH}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_search_cache, f)
+        os.replace(tmp_path, SEARCH_CACHE_PATH)
+    except OSError as e:
+        print(f"   ⚠️  Could not save search cache: {e}")
+
+
+def search_headers(cache_key):
+    """Request headers, with If-None-Match/If-Modified-Since for a page seen before"""
+    headers = get_headers()
+    cached = _search_cache.get(cache_key)
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    return headers
 
 
 def fetch_properties_by_filters(municipality: str, zip_code: int = None):
@@ -327,84 +487,156 @@ def fetch_properties_by_filters(municipality: str, zip_code: int = None):
     property_ids = []
     page = 1
     per_page = 50
-    consecutive_empty_pages = 0
-    max_empty_pages = 3
+    max_page = 200  # API serves at most 10,000 results per query
     
-    while True:
-        try:
-            params = {
-                'municipalities': municipality,
-                'addressTypes': 'villa',
-                'per_page': str(per_page),
-                'page': str(page),
-                'sortBy': 'address',
-                'sortAscending': 'true'
-            }
-            
-            # Add zip code filter if provided (CRITICAL: parameter is 'zipCodes' plural!)
-            if zip_code:
-                params['zipCodes'] = str(zip_code)
+    def request_page(page):
+        params = {
+            'municipalities': municipality,
+            'addressTypes': 'villa',
+            'per_page': str(per_page),
+            'page': str(page),
+            'sortBy': 'address',
+            'sortAscending': 'true'
+        }
         
-            response = requests.get(SEARCH_ENDPOINT, params=params, headers=get_headers(), timeout=10)
-            
-            if response.status_code == 400:
-                break
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'addresses' not in data or not data['addresses']:
-                consecutive_empty_pages += 1
-                if consecutive_empty_pages >= max_empty_pages:
+        # Add zip code filter if provided (CRITICAL: parameter is 'zipCodes' plural!)
+        if zip_code:
+            params['zipCodes'] = str(zip_code)
+        
+        cache_key = f"{municipality}|{zip_code or ''}|{page}"
+        return cache_key, _http.get(SEARCH_ENDPOINT, params=params, headers=search_headers(cache_key), timeout=10)
+    
+    # Two-slot pipeline: the next page is already being requested while the
+    # current one is parsed. Page 1's totalHits fixes the page count, so no
+    # request is made past the last page.
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        next_request = prefetcher.submit(request_page, page)
+        while next_request is not None:
+            try:
+                cache_key, response = next_request.result()
+                next_request = None
+                
+                if response.status_code == 400:
                     break
+                
+                if response.status_code == 304 and cache_key in _search_cache:
+                    # Unchanged since the last run: reuse the entries taken from it then
+                    cached = _search_cache[cache_key]
+                    page_properties = cached['properties']
+                    total_hits = cached.get('total_hits')
+                else:
+                    response.raise_for_status()
+                    data = parse_response(response)
+                    total_hits = data.get('totalHits')
+                    
+                    # Extract property IDs
+                    page_properties = []
+                    for item in data.get('addresses') or []:
+                        property_id = item.get('addressID')
+                        muni_dict = item.get('municipality', {})
+                        muni_name = muni_dict.get('name', municipality)
+                        is_on_market = item.get('isOnMarket', False)
+                        
+                        if property_id:
+                            page_properties.append({
+                                'id': property_id,
+                                'municipality': muni_name,
+                                'is_on_market': is_on_market
+                            })
+                    
+                    # Only pages the API sends validators for can be revalidated
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                    if etag or last_modified:
+                        _search_cache[cache_key] = {
+                            'etag': etag,
+                            'last_modified': last_modified,
+                            'total_hits': total_hits,
+                            'properties': page_properties
+                        }
+                
+                if page == 1 and total_hits is not None:
+                    max_page = min(max_page, math.ceil(total_hits / per_page))
+                
+                # An empty page means we are past the end (or totalHits was unknown)
+                if not page_properties:
+                    break
+                
+                if page < max_page:
+                    next_request = prefetcher.submit(request_page, page + 1)
+                
+                property_ids.extend(page_properties)
+                
+                # Progress update every 10 pages
+                if page % 10 == 0:
+                    zip_info = f" (zip: {zip_code})" if zip_code else ""
+                    print(f"      Page {page}: {len(property_ids)} properties{zip_info}")
+                
+                # Check if we're approaching the 10,000 limit
+                if page >= 200:
+                    print(f"      ⚠️  Reached page 200 limit (10,000 properties)")
+                    print(f"      Consider further subdivision if more properties exist")
+                    break
+                
                 page += 1
-                continue
-            
-            consecutive_empty_pages = 0
-            
-            # Extract property IDs
-            for item in data['addresses']:
-                property_id = item.get('addressID')
-                muni_dict = item.get('municipality', {})
-                muni_name = muni_dict.get('name', municipality)
-                is_on_market = item.get('isOnMarket', False)
                 
-                if property_id:
-                    property_ids.append({
-                        'id': property_id,
-                        'municipality': muni_name,
-                        'is_on_market': is_on_market
-                    })
-            
-            # Progress update every 10 pages
-            if page % 10 == 0:
-                zip_info = f" (zip: {zip_code})" if zip_code else ""
-                print(f"      Page {page}: {len(property_ids)} properties{zip_info}")
-            
-            # Check if we're approaching the 10,000 limit
-            if page >= 200:
-                print(f"      ⚠️  Reached page 200 limit (10,000 properties)")
-                print(f"      Consider further subdivision if more properties exist")
+            except KeyboardInterrupt:
+                print(f"\n⚠️  Interrupted by user")
                 break
-            
-            page += 1
-            time.sleep(0.1)  # Rate limiting
-            
-        except KeyboardInterrupt:
-            print(f"\n⚠️  Interrupted by user")
-            break
-        except Exception as e:
-            print(f"      ⚠️  Error on page {page}: {e}")
-            break
-    
+            except Exception as e:
+                print(f"      ⚠️  Error on page {page}: {e}")
+                break
+        
     return property_ids
 
 
+# Above this many candidate ids the existence check streams the whole id column
+# (one sequential scan) instead of shipping the ids to the database
+EXISTING_SCAN_THRESHOLD = 5000
+EXISTING_SCAN_BATCH = 10000
+
+# The parallel import checks streamed ids in chunks of this size. It stays at or
+# below EXISTING_SCAN_THRESHOLD, so it always uses the id = ANY(:ids) query on
+# PostgreSQL (the streamed scan is for large one-off lists)
+EXISTING_CHECK_CHUNK = 2000
+
+def find_existing_ids(session, property_ids):
+    """IDs from property_ids that are already in properties_new
+    
+    Large lists are matched against one streamed scan of the id column. Otherwise,
+    on PostgreSQL the whole list is sent as one array parameter (id = ANY(:ids)):
+    one round trip and one query plan instead of an IN (...) query per 1000 ids.
+    """
+    if len(property_ids) > EXISTING_SCAN_THRESHOLD:
+        wanted = set(property_ids)
+        result = session.scalars(select(Property.id).execution_options(yield_per=EXISTING_SCAN_BATCH))
+        return {property_id for property_id in result if property_id in wanted}
+    
+    if session.get_bind().dialect.name == 'postgresql':
+        query = select(Property.id).where(Property.id == any_(bindparam('ids', type_=ARRAY(String))))
+        return set(session.scalars(query, {'ids': list(property_ids)}))
+    
+    # Other databases: query in chunks to keep the IN lists bounded
+    existing_ids = set()
+    chunk_size = 1000
+    for i in range(0, len(property_ids), chunk_size):
+        chunk = property_ids[i:i+chunk_size]
+        existing_ids.update(session.scalars(select(Property.id).where(Property.id.in_(chunk))))
+    return existing_ids
+
+
+# Dry runs fetch details for this many properties (concurrently) as a preview;
+# the rest are only counted
+DRY_RUN_SAMPLE = 100
+DRY_RUN_WORKERS = 12
+
 def import_properties(property_list: list, session, dry_run: bool = False, batch_size: int = 100):
     """
     Import properties with optimized batch processing.
     - Bulk checks for existing properties
-    - Batched commits
+    - Fetched payloads written in batches: one INSERT per table and one commit
+      per batch_size properties (import_api_data.write_properties)
+    - Dry run previews DRY_RUN_SAMPLE properties, fetched concurrently
     - Progress tracking
     """
     print(f"\n{'🔍 DRY RUN - ' if dry_run else ''}📥 Importing {len(property_list)} properties...")
@@ -421,69 +653,70 @@ def import_properties(property_list: list, session, dry_run: bool = False, batch
         else:
             property_ids.append(prop_info)
     
+    if dry_run:
+        sample_ids = property_ids[:DRY_RUN_SAMPLE]
+        fetched = {pid: (data, error) for pid, data, error in fetch_properties_concurrently(sample_ids, DRY_RUN_WORKERS)}
+        for idx, prop_info in enumerate(property_list[:DRY_RUN_SAMPLE], 1):
+            property_id = sample_ids[idx - 1]
+            municipality = prop_info.get('municipality', 'Unknown') if isinstance(prop_info, dict) else 'Unknown'
+            property_data, error = fetched[property_id]
+            if error:
+                error_count += 1
+                print(f"   ⚠️  Error fetching {property_id}: {error[:80]}")
+                continue
+            print(f"   [{idx}] Would import: {property_data.get('roadName', 'N/A')} {property_data.get('houseNumber', '')}, {municipality}")
+            imported_count += 1
+        
+        remaining = len(property_list) - len(sample_ids)
+        if remaining > 0:
+            print(f"   ... and {remaining} more properties (details not fetched in dry run)")
+            imported_count += remaining
+        
+        print(f"\n✅ Dry run complete!")
+        print(f"   Would import: {imported_count}")
+        print(f"   Errors: {error_count}")
+        return imported_count, skipped_count, error_count
+    
     # Bulk check for existing properties (MUCH faster than one-by-one)
-    existing_ids = set()
-    if not dry_run:
-        print("   🔍 Checking for existing properties in database...")
-        # Query in chunks to avoid memory issues
-        chunk_size = 1000
-        for i in range(0, len(property_ids), chunk_size):
-            chunk = property_ids[i:i+chunk_size]
-            existing = session.query(Property.id).filter(Property.id.in_(chunk)).all()
-            existing_ids.update([e[0] for e in existing])
-        print(f"   ✅ Found {len(existing_ids)} existing properties (will skip)")
+    print("   🔍 Checking for existing properties in database...")
+    existing_ids = find_existing_ids(session, property_ids)
+    print(f"   ✅ Found {len(existing_ids)} existing properties (will skip)")
     
     # Process properties in batches
-    batch_objects = []
-    batch_start_idx = 0
+    batch_payloads = []
     
-    for idx, prop_info in enumerate(property_list, 1):
-        if isinstance(prop_info, dict):
-            property_id = prop_info['id']
-            municipality = prop_info.get('municipality', 'Unknown')
-        else:
-            property_id = prop_info
-            municipality = 'Unknown'
-        
+    def write_batch():
+        nonlocal imported_count, error_count, batch_payloads
+        written = import_api_data.write_properties(session, batch_payloads)
+        imported_count += written
+        error_count += len(batch_payloads) - written
+        print(f"   💾 Committed batch of {written} properties (total: {imported_count})")
+        batch_payloads = []
+    
+    for idx, property_id in enumerate(property_ids, 1):
         # Skip if already exists
         if property_id in existing_ids:
             skipped_count += 1
             continue
         
         try:
-            if not dry_run:
-                # Use the full import function that handles session management
-                success = import_api_data.import_from_api(property_id)
-                if success:
-                    imported_count += 1
-                else:
-                    error_count += 1
-            else:
-                # Fetch details for dry-run display
-                url = f"{DETAIL_ENDPOINT}/{property_id}"
-                response = requests.get(url, headers=get_headers(), timeout=10)
-                response.raise_for_status()
-                property_data = response.json()
-                print(f"   [{idx}] Would import: {property_data.get('roadName', 'N/A')} {property_data.get('houseNumber', '')}, {municipality}")
-                imported_count += 1
+            # Collect the payload; rows are written per batch, not per property
+            _, property_data, error = fetch_property_data(property_id)
+            if error:
+                error_count += 1
+                if error_count <= 10:
+                    print(f"   ⚠️  Error fetching {property_id}: {error[:80]}")
+                continue
+            batch_payloads.append((property_id, property_data))
+            if len(batch_payloads) >= batch_size:
+                write_batch()
             
             # Progress update every 50 properties
             if idx % 50 == 0:
                 print(f"   [{idx}/{len(property_list)}] Imported {imported_count}, Skipped {skipped_count}, Errors {error_count}")
             
-            # Commit in batches (flush to DB without closing transaction)
-            if not dry_run and (imported_count - batch_start_idx) >= batch_size:
-                session.flush()  # Flush writes the data but keeps transaction open
-                session.commit()  # Commit the transaction
-                print(f"   💾 Committed batch of {imported_count - batch_start_idx} properties (total: {imported_count})")
-                batch_start_idx = imported_count
-            
-            time.sleep(0.2)  # Rate limiting - reduced from 0.3 since we're more efficient now
-            
         except KeyboardInterrupt:
             print(f"\n⚠️  Interrupted by user at property {idx}")
-            if not dry_run:
-                session.commit()
             break
         except Exception as e:
             error_count += 1
@@ -493,10 +726,9 @@ def import_properties(property_list: list, session, dry_run: bool = False, batch
                 print(f"   ⚠️  Suppressing further error messages (total: {error_count})")
             continue
     
-    # Final commit for remaining properties
-    if not dry_run and (imported_count - batch_start_idx) > 0:
-        session.commit()
-        print(f"   💾 Final commit of {imported_count - batch_start_idx} properties")
+    # Final batch for remaining properties
+    if batch_payloads:
+        write_batch()
     
     print(f"\n✅ Import complete!")
     print(f"   Imported: {imported_count}")
@@ -511,30 +743,60 @@ def fetch_property_data(property_id):
     try:
         url = f"{DETAIL_ENDPOINT}/{property_id}"
         # Reduced timeout from 15s to 10s for faster failure recovery
-        response = requests.get(url, headers=get_headers(), timeout=10)
+        response = _http.get(url, headers=get_headers(), timeout=10)
         response.raise_for_status()
-        return property_id, response.json(), None
+        return property_id, parse_response(response), None
     except Exception as e:
         return property_id, None, str(e)
 
 
-def import_properties_parallel(property_list: list, session, dry_run: bool = False, batch_size: int = 50, max_workers: int = 12):
+# Detail requests in flight at once in the parallel import: enough to keep every
+# worker busy, while finished payloads never pile up ahead of the database writes
+FETCH_WINDOW = 200
+
+
+def fetch_properties_concurrently(property_ids, max_workers):
+    """Yield fetch_property_data results as they complete
+    
+    Requests run in a thread pool over the shared keep-alive session, with at
+    most FETCH_WINDOW of them submitted at a time (a new one for each result).
+    """
+    property_ids = iter(property_ids)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(fetch_property_data, pid) for pid in islice(property_ids, FETCH_WINDOW)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_id = next(property_ids, None)
+                if next_id is not None:
+                    pending.add(executor.submit(fetch_property_data, next_id))
+
+
+def import_properties_parallel(property_list, session, dry_run: bool = False, batch_size: int = 50, max_workers: int = 12):
     """
     Import properties with PARALLEL processing for maximum speed.
     
+    property_list may be any iterable (e.g. iter_properties_by_municipality): it
+    is consumed EXISTING_CHECK_CHUNK ids at a time, so discovery, fetching and
+    writing overlap and the full id list is never held at once.
+    
     OPTIMIZATIONS:
     - Parallel API fetching (5-10 threads)
-    - Bulk duplicate checking (1 query vs N)
-    - Batch commits every 100 properties
+    - Bulk duplicate checking (1 query per chunk of ids vs N)
+    - Batched writes: one INSERT per table and one commit per batch_size
+      properties (import_api_data.write_properties) - no per-entity merge()
     - Progress tracking with speed metrics
     
     Expected speed: 20-50 properties/second (vs 0.5-1 without parallelization)
     This means ~10-15 minutes for København's 14k villas instead of 6 hours!
     """
-    print(f"\n🚀 PARALLEL IMPORT: {len(property_list)} properties with {max_workers} workers")
+    total = len(property_list) if hasattr(property_list, '__len__') else None
+    print(f"\n🚀 PARALLEL IMPORT: {total if total is not None else 'streamed'} properties with {max_workers} workers")
     
     if dry_run:
         # In dry-run, just show what would be imported
+        property_list = list(property_list)
         print("   🔍 DRY RUN MODE - Showing first 20 properties:")
         for idx, prop_info in enumerate(property_list[:20], 1):
             if isinstance(prop_info, dict):
@@ -549,165 +811,88 @@ def import_properties_parallel(property_list: list, session, dry_run: bool = Fal
     imported_count = 0
     skipped_count = 0
     error_count = 0
+    seen_ids = set()
     
-    # Extract property IDs
-    property_ids = []
-    for prop_info in property_list:
-        if isinstance(prop_info, dict):
-            property_ids.append(prop_info['id'])
-        else:
-            property_ids.append(prop_info)
-    
-    # 🚀 OPTIMIZATION 1: Bulk check for existing properties (1 query vs N queries)
-    print("   🔍 Checking for existing properties in database...")
-    existing_ids = set()
-    chunk_size = 1000
-    for i in range(0, len(property_ids), chunk_size):
-        chunk = property_ids[i:i+chunk_size]
-        existing = session.query(Property.id).filter(Property.id.in_(chunk)).all()
-        existing_ids.update([e[0] for e in existing])
-    
-    skipped_count = len(existing_ids)
-    properties_to_import = [pid for pid in property_ids if pid not in existing_ids]
-    
-    print(f"   ✅ Found {skipped_count} existing properties (will skip)")
-    print(f"   📥 Importing {len(properties_to_import)} new properties...")
-    print()
-    
-    if len(properties_to_import) == 0:
-        print("   ✅ All properties already exist in database!")
-        return 0, skipped_count, 0
+    # 🚀 OPTIMIZATION 1: Bulk check for existing properties, one query per chunk of
+    # ids pulled from property_list (runs lazily, as the fetcher asks for more ids)
+    def new_property_ids():
+        nonlocal skipped_count
+        items = iter(property_list)
+        while True:
+            chunk = [p['id'] if isinstance(p, dict) else p for p in islice(items, EXISTING_CHECK_CHUNK)]
+            if not chunk:
+                return
+            # Zip-code subdivision can list a property twice: import it once
+            chunk = [pid for pid in dict.fromkeys(chunk) if pid not in seen_ids]
+            seen_ids.update(chunk)
+            existing_ids = find_existing_ids(session, chunk)
+            skipped_count += len(existing_ids)
+            if existing_ids:
+                print(f"   ✅ Found {len(existing_ids)} existing properties (will skip)")
+            yield from (pid for pid in chunk if pid not in existing_ids)
+    
+    def eta_text(rate):
+        """ETA against the known total; unknown while the input is still streaming"""
+        if total is None or rate <= 0:
+            return ""
+        remaining = total - skipped_count - imported_count - error_count
+        return f" | ETA: {max(remaining, 0) / rate / 60:.1f} min"
     
     # 🚀 OPTIMIZATION 2: Parallel API fetching with ThreadPoolExecutor
     start_time = time.time()
     batch_start_time = start_time
-    batch_count = 0
-    
-    # Disable auto-flush to prevent premature constraint checks
-    session.autoflush = False
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all fetch tasks
-        future_to_id = {
-            executor.submit(fetch_property_data, prop_id): prop_id 
-            for prop_id in properties_to_import
-        }
+    batch_payloads = []
+    
+    # 🚀 OPTIMIZATION 3: Buffer fetched payloads and write them per batch - one
+    # INSERT per table instead of a merge() (SELECT + write) per entity
+    def write_batch():
+        nonlocal imported_count, error_count, batch_payloads, batch_start_time
+        written = import_api_data.write_properties(session, batch_payloads)
+        imported_count += written
+        error_count += len(batch_payloads) - written
         
-        # Process completed tasks as they finish
-        for idx, future in enumerate(as_completed(future_to_id), 1):
-            property_id = future_to_id[future]
-            
-            try:
-                prop_id, property_data, error = future.result()
-                
-                if error:
-                    error_count += 1
-                    if error_count <= 10:
-                        print(f"   ⚠️  Error fetching {prop_id}: {error[:80]}")
-                    continue
-                
-                if not property_data:
-                    error_count += 1
-                    continue
-                
-                # Use no_autoflush block to prevent premature constraint checks
-                with session.no_autoflush:
-                    # Import property with all related data (use merge to handle duplicates)
-                    property_obj = import_api_data.import_property(property_data)
-                    session.merge(property_obj)
-                    
-                    # Import main building
-                    main_building = import_api_data.import_main_building(prop_id, property_data.get('buildings', []))
-                    if main_building:
-                        session.merge(main_building)
-                    
-                    # Import additional buildings
-                    additional_buildings = import_api_data.import_additional_buildings(prop_id, property_data.get('buildings', []))
-                    for bldg in additional_buildings:
-                        session.merge(bldg)
-                    
-                    # Import registrations
-                    registrations = import_api_data.import_registrations(prop_id, property_data.get('registrations', []))
-                    for reg in registrations:
-                        session.merge(reg)
-                    
-                    # Import related entities (municipality, province, etc.) - use merge for duplicates
-                    for field, import_func in [
-                        ('municipality', import_api_data.import_municipality),
-                        ('province', import_api_data.import_province),
-                        ('road', import_api_data.import_road),
-                        ('zip', import_api_data.import_zip),
-                        ('city', import_api_data.import_city),
-                        ('place', import_api_data.import_place),
-                        ('daysOnMarket', import_api_data.import_days_on_market)
-                    ]:
-                        entity = import_func(prop_id, property_data.get(field, {}))
-                        if entity:
-                            session.merge(entity)
-                    
-                    # Import cases and price changes
-                    for case in import_api_data.import_cases(prop_id, property_data.get('cases', [])):
-                        session.add(case)
-                
-                imported_count += 1
-                batch_count += 1
-                
-                # 🚀 OPTIMIZATION 3: Batch commits every N properties
-                if batch_count >= batch_size:
-                    try:
-                        session.commit()
-                        elapsed = time.time() - batch_start_time
-                        rate = batch_count / elapsed
-                        total_elapsed = time.time() - start_time
-                        overall_rate = imported_count / total_elapsed
-                        eta_seconds = (len(properties_to_import) - imported_count) / overall_rate if overall_rate > 0 else 0
-                        eta_mins = eta_seconds / 60
-                        
-                        print(f"   💾 Batch {imported_count}/{len(properties_to_import)} | "
-                              f"Speed: {rate:.1f} props/sec | "
-                              f"Overall: {overall_rate:.1f} props/sec | "
-                              f"ETA: {eta_mins:.1f} min")
-                        
-                        batch_count = 0
-                        batch_start_time = time.time()
-                    except Exception as commit_error:
-                        session.rollback()
-                        print(f"   ⚠️  Batch commit failed: {str(commit_error)[:100]}")
-                        print(f"   🔄 Rolled back batch - will retry individual commits")
-                        batch_count = 0
-                        batch_start_time = time.time()
-                
-                # Progress update every 25 properties (if not in a batch commit) - more frequent updates
-                elif idx % 25 == 0:
-                    elapsed = time.time() - start_time
-                    rate = imported_count / elapsed if elapsed > 0 else 0
-                    eta_seconds = (len(properties_to_import) - imported_count) / rate if rate > 0 else 0
-                    eta_mins = eta_seconds / 60
-                    print(f"   [{idx}/{len(properties_to_import)}] Imported: {imported_count}, Errors: {error_count} | Speed: {rate:.1f} props/sec | ETA: {eta_mins:.1f} min")
-                
-            except KeyboardInterrupt:
-                print(f"\n⚠️  Interrupted by user")
-                session.commit()
-                break
-            except Exception as e:
+        elapsed = time.time() - batch_start_time
+        rate = len(batch_payloads) / elapsed if elapsed > 0 else 0
+        total_elapsed = time.time() - start_time
+        overall_rate = imported_count / total_elapsed if total_elapsed > 0 else 0
+        
+        print(f"   💾 Batch {imported_count} imported | "
+              f"Speed: {rate:.1f} props/sec | "
+              f"Overall: {overall_rate:.1f} props/sec"
+              f"{eta_text(overall_rate)}")
+        
+        batch_payloads = []
+        batch_start_time = time.time()
+    
+    # Process fetched properties as they complete
+    fetched = fetch_properties_concurrently(new_property_ids(), max_workers)
+    try:
+        for idx, (prop_id, property_data, error) in enumerate(fetched, 1):
+            if error:
                 error_count += 1
-                # Rollback the session to recover from error state
-                session.rollback()
                 if error_count <= 10:
-                    print(f"   ⚠️  Error importing {property_id}: {str(e)[:100]}")
+                    print(f"   ⚠️  Error fetching {prop_id}: {error[:80]}")
                 continue
-    
-    # Re-enable autoflush
-    session.autoflush = True
-    
-    # Final commit for remaining properties
-    if batch_count > 0:
-        try:
-            session.commit()
-            print(f"   💾 Final commit of {batch_count} properties")
-        except Exception as commit_error:
-            session.rollback()
-            print(f"   ⚠️  Final commit failed: {str(commit_error)[:100]}")
+            
+            if not property_data:
+                error_count += 1
+                continue
+            
+            batch_payloads.append((prop_id, property_data))
+            if len(batch_payloads) >= batch_size:
+                write_batch()
+            
+            # Progress update every 25 properties (if not in a batch commit) - more frequent updates
+            elif idx % 25 == 0:
+                elapsed = time.time() - start_time
+                rate = imported_count / elapsed if elapsed > 0 else 0
+                print(f"   [{idx}] Imported: {imported_count}, Errors: {error_count} | Speed: {rate:.1f} props/sec{eta_text(rate)}")
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Interrupted by user")
+    
+    # Final batch for remaining properties
+    if batch_payloads:
+        write_batch()
     
     # Summary with timing stats
     total_time = time.time() - start_time
@@ -731,6 +916,7 @@ def main():
     parser.add_argument('--max-pages', type=int, help='Maximum number of pages to fetch from search API')
     parser.add_argument('--parallel', action='store_true', help='Use parallel processing (20-50x faster!)')
     parser.add_argument('--workers', type=int, default=12, help='Number of parallel workers (default: 12)')
+    parser.add_argument('--refresh-zip-codes', action='store_true', help='Re-discover zip codes instead of using the saved table')
     
     args = parser.parse_args()
     
@@ -750,21 +936,30 @@ def main():
     
     # Create database session
     if not args.dry_run:
-        session = db.get_session()
+        # Write-only batch session: no autoflush, no expiring on every batch commit
+        session = db.Session(autoflush=False, expire_on_commit=False)
         print("\n✅ Database connection established")
     else:
         session = None
         print("\n🔍 DRY RUN - No database connection")
     
     try:
-        # Fetch properties currently on market using API filtering
-        property_list = fetch_properties_by_municipality(municipalities, max_properties=args.limit)
-        
-        if not property_list:
-            print("\n⚠️  No properties found!")
-            return
-        
-        print(f"\nFound {len(property_list)} properties to import")
+        # The parallel import consumes discovery as it goes: properties from the first
+        # municipalities are imported while later ones are still being searched
+        stream = args.parallel and not args.dry_run
+        if stream:
+            property_list = iter_properties_by_municipality(municipalities, max_properties=args.limit,
+                                                            refresh_zip_codes=args.refresh_zip_codes)
+        else:
+            # Fetch properties currently on market using API filtering
+            property_list = fetch_properties_by_municipality(municipalities, max_properties=args.limit,
+                                                             refresh_zip_codes=args.refresh_zip_codes)
+            
+            if not property_list:
+                print("\n⚠️  No properties found!")
+                return
+            
+            print(f"\nFound {len(property_list)} properties to import")
         
         # Import properties (parallel or sequential)
         if args.parallel:
@@ -788,7 +983,8 @@ def main():
         print(f"\n{'=' * 80}")
         print(f"📊 FINAL SUMMARY")
         print(f"{'=' * 80}")
-        print(f"Total properties found: {len(property_list)}")
+        if not stream:
+            print(f"Total properties found: {len(property_list)}")
         print(f"Imported: {imported}")
         print(f"Skipped: {skipped}")
         print(f"Errors: {errors}")
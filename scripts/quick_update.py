@@ -20,7 +20,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 sys.path.insert(0, os.path.dirname(__file__))
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, func, distinct
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
@@ -36,24 +36,28 @@ DB_PASSWORD = os.getenv('DB_PASSWORD', '')
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-def get_active_property_ids():
-    """Get list of properties with active (open) cases"""
+def count_active_properties():
+    """Count properties with active (open) cases
+    
+    Only the number is reported, so the database counts the distinct ids
+    instead of sending every one of them over.
+    """
     try:
         from db_models_new import Case
         engine = create_engine(DATABASE_URL)
         Session = sessionmaker(bind=engine)
         session = Session()
         
-        # Get properties with open cases
-        active_cases = session.query(Case.property_id).filter(
-            Case.status == 'open'
-        ).distinct().all()
+        # Count properties with open cases
+        active_count = session.scalar(
+            select(func.count(distinct(Case.property_id))).where(Case.status == 'open')
+        )
         
         session.close()
-        return [row[0] for row in active_cases]
+        return active_count
     except Exception as e:
         print(f"❌ Error connecting to database: {e}")
-        return []
+        return 0
 
 def update_cases_incremental():
     """Update only case data for active properties"""
@@ -65,13 +69,13 @@ def update_cases_incremental():
     
     # Get active properties
     print("📊 Fetching list of active properties...")
-    property_ids = get_active_property_ids()
+    active_count = count_active_properties()
     
-    if not property_ids:
+    if not active_count:
         print("❌ Could not fetch active properties")
         return False
     
-    print(f"✅ Found {len(property_ids):,} active properties")
+    print(f"✅ Found {active_count:,} active properties")
     print()
     print("📝 To update case data, run:")
     print("   python scripts/reimport_cases_test.py")
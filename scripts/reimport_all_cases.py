@@ -6,9 +6,10 @@ This will populate the new price data, fields, and images for all active listing
 import os
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from sqlalchemy import text, select, func, distinct
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,33 +20,48 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from db_models_new import Case
 
-# Database connection
-DB_HOST = os.getenv('DB_HOST', 'localhost')
-DB_PORT = os.getenv('DB_PORT', '5432')
-DB_NAME = os.getenv('DB_NAME', 'housing_db')
-DB_USER = os.getenv('DB_USER', 'postgres')
-DB_PASSWORD = os.getenv('DB_PASSWORD', '')
+# Import the reimport helpers (and the shared reimport engine/session factory)
+sys.path.insert(0, os.path.dirname(__file__))
+from reimport_cases_test import Session, fetch_property_cached, prune_api_cache, replace_cases_many
+from import_api_data import HTTP_POOL_SIZE
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
+# Fetching is I/O-bound, so many threads share the keep-alive HTTP pool while
+# this thread writes the results: REIMPORT_BATCH properties per transaction,
+# with a fixed number of statements per batch (replace_cases_many)
+REIMPORT_WORKERS = HTTP_POOL_SIZE
+REIMPORT_BATCH = 100
 
-# Import the reimport function
-sys.path.insert(0, os.path.dirname(__file__))
-from reimport_cases_test import reimport_cases_only
+# Property ids are streamed from a server-side cursor in pages of this size, and
+# at most REIMPORT_WINDOW fetches are queued at a time
+PROPERTY_ID_PAGE_SIZE = 1000
+REIMPORT_WINDOW = 200
 
-def get_properties_with_cases():
-    """Get list of property IDs that have cases"""
+def count_properties_with_cases():
+    """Number of distinct property IDs in the cases table"""
+    session = Session()
+    try:
+        return session.scalar(select(func.count(distinct(Case.property_id))))
+    finally:
+        session.close()
+
+def iter_properties_with_cases():
+    """Yield property IDs that have cases as the rows arrive (server-side cursor)"""
     session = Session()
     try:
         # Get distinct property IDs from cases table
-        result = session.query(Case.property_id).distinct().all()
-        return [row[0] for row in result]
+        yield from session.scalars(
+            select(Case.property_id).distinct().execution_options(yield_per=PROPERTY_ID_PAGE_SIZE)
+        )
     finally:
         session.close()
 
-def reimport_all_cases(max_workers=10):
-    """Re-import cases for all properties with parallel processing"""
+def reimport_all_cases(max_workers=REIMPORT_WORKERS, use_cache=True):
+    """Re-import cases for all properties with parallel processing
+    
+    With use_cache, payloads fetched earlier today are read from disk
+    (fetch_property_cached), so a re-run after a failure skips the HTTP work.
+    Cached payloads from earlier days are deleted first.
+    """
     
     print("=" * 80)
     print("BULK CASE RE-IMPORT")
@@ -54,8 +70,7 @@ def reimport_all_cases(max_workers=10):
     
     # Get properties with cases
     print("Fetching list of properties with cases...")
-    property_ids = get_properties_with_cases()
-    total = len(property_ids)
+    total = count_properties_with_cases()
     
     print(f"✅ Found {total:,} properties with cases")
     print()
@@ -65,6 +80,9 @@ def reimport_all_cases(max_workers=10):
         print("❌ Cancelled")
         return
     
+    if use_cache:
+        prune_api_cache()
+    
     print()
     print(f"Starting re-import with {max_workers} parallel workers...")
     print()
@@ -72,40 +90,68 @@ def reimport_all_cases(max_workers=10):
     # Track progress
     success_count = 0
     error_count = 0
+    batch_payloads = []
     start_time = time.time()
     
-    # Process in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_id = {
-            executor.submit(reimport_cases_only, prop_id): prop_id 
-            for prop_id in property_ids
-        }
-        
-        # Process completed tasks
-        for i, future in enumerate(as_completed(future_to_id), 1):
-            prop_id = future_to_id[future]
+    def write_batch():
+        nonlocal success_count, error_count, batch_payloads
+        written = replace_cases_many(session, batch_payloads)
+        success_count += written
+        error_count += len(batch_payloads) - written
+        batch_payloads = []
+    
+    # Fetch in parallel, write from this thread with one session
+    session = Session()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit a window of tasks as ids stream in; one more per completed task
+            property_ids = iter_properties_with_cases()
+            future_to_id = {
+                executor.submit(fetch_property_cached, prop_id, use_cache): prop_id
+                for prop_id in islice(property_ids, REIMPORT_WINDOW)
+            }
             
-            try:
-                success = future.result()
-                if success:
-                    success_count += 1
-                else:
+            # Process completed tasks
+            i = 0
+            while future_to_id:
+                done, _ = wait(future_to_id, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                prop_id = future_to_id.pop(future)
+                i += 1
+                
+                next_id = next(property_ids, None)
+                if next_id is not None:
+                    future_to_id[executor.submit(fetch_property_cached, next_id, use_cache)] = next_id
+                
+                try:
+                    api_data = future.result()
+                    if api_data is not None:
+                        batch_payloads.append((prop_id, api_data))
+                    else:
+                        error_count += 1
+                except Exception as e:
                     error_count += 1
-            except Exception as e:
-                error_count += 1
-                print(f"❌ Unexpected error for {prop_id}: {e}")
-            
-            # Progress update every 100 properties
-            if i % 100 == 0:
-                elapsed = time.time() - start_time
-                rate = i / elapsed
-                eta_seconds = (total - i) / rate if rate > 0 else 0
-                eta_minutes = eta_seconds / 60
+                    print(f"❌ Unexpected error for {prop_id}: {e}")
                 
-                print(f"Progress: {i}/{total} ({i/total*100:.1f}%) - "
-                      f"✅ {success_count} success, ❌ {error_count} errors - "
-                      f"Rate: {rate:.1f}/sec - ETA: {eta_minutes:.1f} min")
+                if len(batch_payloads) >= REIMPORT_BATCH:
+                    write_batch()
+                
+                # Progress update every 100 properties
+                if i % 100 == 0:
+                    elapsed = time.time() - start_time
+                    rate = i / elapsed
+                    eta_seconds = (total - i) / rate if rate > 0 else 0
+                    eta_minutes = eta_seconds / 60
+                    
+                    print(f"Progress: {i}/{total} ({i/total*100:.1f}%) - "
+                          f"✅ {success_count} success, ❌ {error_count} errors - "
+                          f"Rate: {rate:.1f}/sec - ETA: {eta_minutes:.1f} min")
+        
+        # Final batch for remaining properties
+        if batch_payloads:
+            write_batch()
+    finally:
+        session.close()
     
     # Final summary
     elapsed = time.time() - start_time
@@ -153,4 +199,9 @@ def reimport_all_cases(max_workers=10):
     print()
 
 if __name__ == "__main__":
-    reimport_all_cases(max_workers=10)
+    parser = argparse.ArgumentParser(description='Re-import cases for all properties that have cases')
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Always fetch from the API, ignoring today's cached responses")
+    args = parser.parse_args()
+    
+    reimport_all_cases(use_cache=not args.no_cache)
@@ -5,9 +5,10 @@ This updates case information without touching the property record itself
 
 import os
 import sys
-import requests
-from datetime import datetime
-from sqlalchemy import create_engine
+import json
+import shutil
+from datetime import datetime, date
+from sqlalchemy import create_engine, delete, select
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
@@ -17,7 +18,7 @@ load_dotenv()
 # Add src directory to path (go up one level from scripts/)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from db_models_new import Case, CaseImage
+from db_models_new import Case, CaseImage, PriceChange
 
 # Database connection
 DB_HOST = os.getenv('DB_HOST', 'localhost')
@@ -26,43 +27,164 @@ DB_NAME = os.getenv('DB_NAME', 'housing_db')
 DB_USER = os.getenv('DB_USER', 'postgres')
 DB_PASSWORD = os.getenv('DB_PASSWORD', '')
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
-
 # Import the function
 sys.path.insert(0, os.path.dirname(__file__))
-from import_api_data import import_cases, safe_get
+from import_api_data import EXECUTEMANY_PAGE_SIZE, case_rows, insert_cases, fetch_property, safe_get
 
-def reimport_cases_only(property_id):
-    """Fetch API data and update only case information (including images)"""
+DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# One engine for all case reimports (reimport_all_cases uses it too):
+# - same executemany setup as import_api_data: multi-row INSERT ... VALUES pages
+#   (psycopg2 execute_values style) instead of one statement per row
+# - a small pool: fetch threads never touch the database, and reimport_all_cases
+#   holds two connections (the property id cursor and the batch writer);
+#   dropped/stale connections are detected and replaced
+# - synchronous_commit=off: the data can be re-fetched, so commits don't wait for
+#   the WAL flush (a crash may lose the last moments of work, never consistency)
+DB_POOL_SIZE = 2
+DB_MAX_OVERFLOW = 2
+DB_POOL_RECYCLE = 1800
+engine = create_engine(
+    DATABASE_URL,
+    executemany_mode='values_plus_batch',
+    insertmanyvalues_page_size=EXECUTEMANY_PAGE_SIZE,
+    executemany_batch_page_size=EXECUTEMANY_PAGE_SIZE,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=DB_POOL_RECYCLE,
+    connect_args={'options': '-c synchronous_commit=off'}
+)
+Session = sessionmaker(bind=engine)
+
+# Fetched payloads are kept on disk for the day (one file per property), so a
+# reimport that stops partway (network, DB restart) only repeats the database
+# work when it is run again. Earlier days are removed by prune_api_cache()
+API_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'api_cache')
+
+
+def prune_api_cache():
+    """Delete cached payloads from days before today"""
+    today = date.today().isoformat()
+    try:
+        day_dirs = os.listdir(API_CACHE_DIR)
+    except OSError:
+        return
+    for day in day_dirs:
+        if day != today:
+            shutil.rmtree(os.path.join(API_CACHE_DIR, day), ignore_errors=True)
+
+
+def fetch_property_cached(property_id, use_cache=True):
+    """fetch_property, answered from today's on-disk cache when possible"""
+    if not use_cache:
+        return fetch_property(property_id)
     
-    # Fetch from API
-    url = f"https://api.boligsiden.dk/addresses/{property_id}"
+    cache_dir = os.path.join(API_CACHE_DIR, date.today().isoformat())
+    cache_path = os.path.join(cache_dir, f"{property_id}.json")
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        api_data = response.json()
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    api_data = fetch_property(property_id)
+    if api_data is not None:
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(api_data, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not cache {property_id}: {e}")
+    return api_data
+
+
+def delete_cases(session, property_ids):
+    """Delete the cases of property_ids with set-based DELETEs
+    
+    Images go with their case (ON DELETE CASCADE); price changes are deleted
+    explicitly. On PostgreSQL both happen in one statement (one round trip): a
+    data-modifying CTE deletes the cases and the outer DELETE their price changes.
+    """
+    if session.get_bind().dialect.name == 'postgresql':
+        deleted_cases = (
+            delete(Case).where(Case.property_id.in_(property_ids))
+            .returning(Case.id).cte('deleted_cases')
+        )
+        session.execute(delete(PriceChange).where(PriceChange.case_id.in_(select(deleted_cases.c.id))))
+        return
+    
+    property_case_ids = select(Case.id).where(Case.property_id.in_(property_ids))
+    session.execute(delete(PriceChange).where(PriceChange.case_id.in_(property_case_ids)))
+    session.execute(delete(Case).where(Case.property_id.in_(property_ids)))
+
+
+def replace_cases(session, property_id, api_data):
+    """Replace a property's cases with the ones in api_data (no commit)
+    
+    Runs in a savepoint, so a failing property is rolled back on its own and
+    the caller can commit many properties in one transaction.
+    """
+    try:
+        with session.begin_nested():
+            delete_cases(session, [property_id])
+            
+            # Import new cases with all fields: one INSERT ... RETURNING for the cases,
+            # then one multi-row INSERT (COPY for large batches) per child table
+            insert_cases(session, case_rows(property_id, safe_get(api_data, 'cases')))
+        return True
     except Exception as e:
-        print(f"❌ Error fetching {property_id}: {e}")
+        print(f"❌ Error re-importing cases for {property_id}: {e}")
+        return False
+
+
+def replace_cases_many(session, payloads):
+    """Replace the cases of a batch of (property_id, api_data) pairs and commit
+    
+    The whole batch is two DELETEs and one insert_cases() call, so the statement
+    count no longer grows with the number of properties. If that fails, the batch
+    is retried property by property (replace_cases) so only the bad ones are lost.
+    Returns the number of properties written.
+    """
+    try:
+        delete_cases(session, [property_id for property_id, _ in payloads])
+        insert_cases(session, [
+            case
+            for property_id, api_data in payloads
+            for case in case_rows(property_id, safe_get(api_data, 'cases'))
+        ])
+        session.commit()
+        return len(payloads)
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Error writing batch, retrying its properties one by one: {e}")
+    
+    written = sum(replace_cases(session, property_id, api_data) for property_id, api_data in payloads)
+    try:
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Error committing {written} properties: {e}")
+        return 0
+    return written
+
+
+def reimport_cases_only(property_id, use_cache=True):
+    """Fetch API data and update only case information (including images)"""
+    
+    # Fetch from API (shared keep-alive session with retries) or today's cache
+    api_data = fetch_property_cached(property_id, use_cache)
+    if api_data is None:
         return False
     
     session = Session()
     try:
-        # Delete existing cases for this property (cascade will delete images)
-        existing_cases = session.query(Case).filter(Case.property_id == property_id).all()
-        if existing_cases:
-            for case in existing_cases:
-                session.delete(case)
-            # Commit deletion before importing new ones
-            session.commit()
-        
-        # Import new cases with all fields
-        cases_data = safe_get(api_data, 'cases')
-        if cases_data:
-            for case in import_cases(property_id, cases_data):
-                session.add(case)
-        
+        # Delete and re-insert commit together, in one transaction. The session's
+        # own transaction already isolates this property, so no savepoint
+        # (SAVEPOINT/RELEASE round trips) as in replace_cases
+        delete_cases(session, [property_id])
+        insert_cases(session, case_rows(property_id, safe_get(api_data, 'cases')))
         session.commit()
         return True
         
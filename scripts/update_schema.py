@@ -14,7 +14,7 @@ load_dotenv()
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from db_models_new import Base, CaseImage
+from db_models_new import Base, CaseImage, ADDRESS_EXPRESSION
 
 # Database connection
 DB_HOST = os.getenv('DB_HOST', 'localhost')
@@ -27,7 +27,7 @@ DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NA
 engine = create_engine(DATABASE_URL)
 
 def update_schema():
-    """Add new columns to cases table and create case_images table"""
+    """Add new columns to cases table, create case_images table and filter indexes"""
     
     print("=" * 80)
     print("DATABASE SCHEMA UPDATE")
@@ -101,6 +101,42 @@ def update_schema():
             print("✅ Created indexes on case_images table")
             print()
             
+            print("Step 4: Creating indexes for hot filter columns...")
+            
+            # Partial indexes match the IS NOT NULL predicates used by the EDA/statistics queries
+            filter_indexes = [
+                "CREATE INDEX IF NOT EXISTS idx_properties_living_area ON properties_new(living_area) WHERE living_area IS NOT NULL",
+                "CREATE INDEX IF NOT EXISTS idx_properties_latest_valuation ON properties_new(latest_valuation) WHERE latest_valuation IS NOT NULL",
+                "CREATE INDEX IF NOT EXISTS idx_properties_is_on_market ON properties_new(is_on_market)",
+                "CREATE INDEX IF NOT EXISTS idx_main_buildings_year_built ON main_buildings(year_built)",
+                "CREATE INDEX IF NOT EXISTS idx_registrations_property_id ON registrations(property_id)",
+                "CREATE INDEX IF NOT EXISTS idx_registrations_amount ON registrations(amount) WHERE amount IS NOT NULL"
+            ]
+            
+            for sql in filter_indexes:
+                conn.execute(text(sql))
+            
+            print(f"✅ Created {len(filter_indexes)} filter indexes")
+            print()
+            
+            print("Step 5: Converting properties_new.address to a generated column...")
+            
+            # The importer no longer builds the address string; PostgreSQL derives it
+            is_generated = conn.execute(text("""
+                SELECT is_generated FROM information_schema.columns
+                WHERE table_name = 'properties_new' AND column_name = 'address'
+            """)).scalar()
+            if is_generated == 'ALWAYS':
+                print("✅ address is already a generated column")
+            else:
+                conn.execute(text("ALTER TABLE properties_new DROP COLUMN IF EXISTS address"))
+                conn.execute(text(
+                    f"ALTER TABLE properties_new ADD COLUMN address VARCHAR "
+                    f"GENERATED ALWAYS AS ({ADDRESS_EXPRESSION}) STORED"
+                ))
+                print("✅ address is now generated from road/house number/zip/city")
+            print()
+            
             # Commit transaction
             trans.commit()
             
@@ -112,6 +148,8 @@ def update_schema():
             print("  • Added 15 new fields to cases table")
             print("  • Created case_images table with 9 fields")
             print("  • Created 2 indexes for performance")
+            print("  • Created 6 filter indexes (verify with EXPLAIN: Index Only Scan)")
+            print("  • properties_new.address is a generated column")
             print()
             print("Next steps:")
             print("  1. Test import with single property")
@@ -3,21 +3,40 @@ Enhanced Database Models - Captures ALL fields from Boligsiden API
 Created: October 4, 2025
 """
 
-from sqlalchemy import Column, Integer, Float, String, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, Float, String, DateTime, Boolean, Text, ForeignKey, JSON, Index, Computed, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
 Base = declarative_base()
 
+# Property.address: road name, house number and "<zip> <city>" (only when both are
+# set), space-separated with empty parts skipped. Built from || and CASE because
+# generated columns only accept immutable expressions (concat_ws is not)
+ADDRESS_EXPRESSION = (
+    "ltrim("
+    "COALESCE(NULLIF(road_name, ''), '')"
+    " || COALESCE(' ' || NULLIF(house_number, ''), '')"
+    " || CASE WHEN zip_code IS NOT NULL AND zip_code <> 0 AND city_name <> ''"
+    " THEN ' ' || CAST(zip_code AS TEXT) || ' ' || city_name ELSE '' END"
+    ")"
+)
+
 
 class Property(Base):
     """Main property table - core information"""
     __tablename__ = 'properties_new'
+    __table_args__ = (
+        # Partial indexes matching the hot "IS NOT NULL" filters (enables index-only counts)
+        Index('idx_properties_living_area', 'living_area', postgresql_where=text('living_area IS NOT NULL')),
+        Index('idx_properties_latest_valuation', 'latest_valuation', postgresql_where=text('latest_valuation IS NOT NULL')),
+        Index('idx_properties_is_on_market', 'is_on_market'),
+    )
 
     # Primary identification
     id = Column(String, primary_key=True)  # addressID
-    address = Column(String)
+    # "<road> <house number> <zip> <city>", generated by PostgreSQL from the columns below
+    address = Column(String, Computed(ADDRESS_EXPRESSION, persisted=True))
     address_type = Column(String)  # villa, condo, etc.
     
     # Location
@@ -89,6 +108,9 @@ class Property(Base):
 class MainBuilding(Base):
     """Main building/house information - one per property"""
     __tablename__ = 'main_buildings'
+    __table_args__ = (
+        Index('idx_main_buildings_year_built', 'year_built'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     property_id = Column(String, ForeignKey('properties_new.id'), unique=True, nullable=False)
@@ -168,6 +190,10 @@ class AdditionalBuilding(Base):
 class Registration(Base):
     """Sale/transaction registrations - multiple per property"""
     __tablename__ = 'registrations'
+    __table_args__ = (
+        Index('idx_registrations_property_id', 'property_id'),
+        Index('idx_registrations_amount', 'amount', postgresql_where=text('amount IS NOT NULL')),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     property_id = Column(String, ForeignKey('properties_new.id'), nullable=False)
@@ -0,0 +1,72 @@
+"""
+Streaming JSON Array Parser Tests
+
+Round-trips JSON arrays through import_api_data.iter_json_array at tiny read
+sizes, so items and numbers are cut at every possible buffer boundary, and
+checks that malformed input is rejected like json.load rejects it.
+
+Run with: pytest tests/test_json_streaming.py -v
+"""
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+# Add scripts directory to path (go up one level from tests/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+# The module requires a password at import; the parser never connects
+os.environ.setdefault('DB_PASSWORD', 'unused')
+
+import import_api_data
+
+READ_SIZES = [1, 2, 3, 7, 64]
+
+VALID_ARRAYS = [
+    '[]',
+    '  [ ]  ',
+    '[1.5e10, 2]',
+    '[-0.25E-3,12345678901234,true,false,null]',
+    '["a,]b", "x\\u00e6\\"", ""]',
+    '[{"id": "p1", "cases": [{"price": 2950000.0, "images": []}]}, {"id": "p2"}]',
+    '\n\n   [[1, [2, []]], {"a": {"b": [3]}}]\n',
+]
+
+MALFORMED_ARRAYS = [
+    '',
+    '   ',
+    '{"a": 1}',
+    '[1,,2]',
+    '[,1]',
+    '[1,]',
+    '[1 2]',
+    '[1',
+    '[1,',
+    '[1]garbage',
+    '[1]]',
+]
+
+
+def parse(text, read_size, monkeypatch):
+    monkeypatch.setattr(import_api_data, 'JSON_READ_SIZE', read_size)
+    return list(import_api_data.iter_json_array(io.StringIO(text)))
+
+
+class TestIterJsonArray:
+    """iter_json_array must agree with json.loads"""
+
+    @pytest.mark.parametrize('read_size', READ_SIZES)
+    @pytest.mark.parametrize('text', VALID_ARRAYS)
+    def test_round_trip(self, text, read_size, monkeypatch):
+        """Every item comes back as json.loads parses it"""
+        assert parse(text, read_size, monkeypatch) == json.loads(text)
+
+    @pytest.mark.parametrize('read_size', READ_SIZES)
+    @pytest.mark.parametrize('text', MALFORMED_ARRAYS)
+    def test_rejects_malformed(self, text, read_size, monkeypatch):
+        """Input json.loads rejects (or that is not an array) raises ValueError"""
+        with pytest.raises(ValueError):
+            parse(text, read_size, monkeypatch)